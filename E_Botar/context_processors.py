@@ -1,22 +1,16 @@
 """
 Context processors for making data available to all templates
 """
-from django.utils import timezone
-from election_module.models import SchoolElection
+from E_Botar.services.election_calendar import applications_available as _applications_available
 
 
 def applications_status(request):
     """
     Check if candidate applications are currently available
-    Applications are available only if there are upcoming elections (not started yet)
+    Applications are available only if there are upcoming elections (not started yet).
+    The answer is cached until the next election save/delete or start date.
     """
-    now = timezone.now()
-    applications_available = SchoolElection.objects.filter(
-        is_active=True,
-        start_date__gt=now  # Only elections that haven't started yet
-    ).exists()
-    
     return {
-        'applications_available': applications_available,
+        'applications_available': _applications_available(),
     }
 
@@ -6,6 +6,7 @@ legacy imports like `from E_Botar.logging_utils import ...` continue to work.
 
 from E_Botar.utils.logging_utils import (  # noqa: F401
     log_activity,
+    flush_activity_logs,
     get_client_ip,
     log_user_login,
     log_user_logout,
@@ -5,6 +5,8 @@ from django.db import transaction
 import csv
 import io
 
+from E_Botar.services.user_export import FULL_COLUMNS, iter_user_csv
+
 
 class Command(BaseCommand):
     help = 'Bulk user operations - import/export users from CSV'
@@ -134,41 +136,13 @@ class Command(BaseCommand):
         """Export users to CSV file"""
         self.stdout.write(f'Exporting users to {filename}...')
         
-        users = User.objects.select_related('userprofile', 'userprofile__department', 'userprofile__course').all()
-        
+        # Same chunked, joined row stream as the admin "Export Users" download
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = [
-                'username', 'email', 'first_name', 'last_name', 'student_id',
-                'department_name', 'department_code', 'course_name', 'course_code',
-                'year_level', 'phone_number', 'is_verified', 'is_active', 'date_joined'
-            ]
-            
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
+            lines = iter_user_csv(FULL_COLUMNS)
+            csvfile.write(next(lines))  # Header
             exported_count = 0
-            
-            for user in users:
-                profile = getattr(user, 'userprofile', None)
-                
-                row = {
-                    'username': user.username,
-                    'email': user.email,
-                    'first_name': user.first_name,
-                    'last_name': user.last_name,
-                    'student_id': profile.student_id if profile else '',
-                    'department_name': profile.department.name if profile and profile.department else '',
-                    'department_code': profile.department.code if profile and profile.department else '',
-                    'course_name': profile.course.name if profile and profile.course else '',
-                    'course_code': profile.course.code if profile and profile.course else '',
-                    'year_level': profile.year_level if profile else '',
-                    'phone_number': profile.phone_number if profile else '',
-                    'is_verified': profile.is_verified if profile else False,
-                    'is_active': user.is_active,
-                    'date_joined': user.date_joined.strftime('%Y-%m-%d %H:%M:%S')
-                }
-                
-                writer.writerow(row)
+            for line in lines:
+                csvfile.write(line)
                 exported_count += 1
         
         self.stdout.write(
@@ -5,6 +5,7 @@ from auth_module.models import UserProfile, Department, Course
 from election_module.models import SchoolElection, ElectionPosition, SchoolPosition, Party
 from candidate_module.models import Candidate, CandidateApplication
 from voting_module.models import SchoolVote, VoteReceipt, AnonVote, EncryptedBallot
+from E_Botar.utils.logging_utils import bulk_operation
 
 
 class Command(BaseCommand):
@@ -27,7 +28,8 @@ class Command(BaseCommand):
 
         self.stdout.write('Clearing demo data...')
         
-        with transaction.atomic():
+        # One summary audit entry instead of one per deleted row
+        with bulk_operation('Cleared demo data', additional_data={'command': 'clear_demo_data'}), transaction.atomic():
             # Clear votes and related data
             self.stdout.write('Clearing votes and receipts...')
             SchoolVote.objects.all().delete()
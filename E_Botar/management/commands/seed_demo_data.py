@@ -7,6 +7,7 @@ from candidate_module.models import Candidate, CandidateApplication
 from voting_module.models import SchoolVote, VoteReceipt, AnonVote, EncryptedBallot
 from django.utils import timezone
 from datetime import timedelta
+from E_Botar.utils.logging_utils import bulk_operation
 import random
 
 
@@ -19,14 +20,16 @@ class Command(BaseCommand):
         parser.add_argument('--elections', type=int, default=2, help='Number of sample elections to create')
 
     def handle(self, *args, **options):
-        if options['clear']:
-            self.clear_data()
-        
-        self.create_departments_and_courses()
-        self.create_sample_users(options['users'])
-        self.create_sample_elections(options['elections'])
-        self.create_sample_candidates()
-        self.create_sample_votes()
+        # One summary audit entry instead of one per seeded row
+        with bulk_operation('Seeded demo data', additional_data={'command': 'seed_demo_data'}):
+            if options['clear']:
+                self.clear_data()
+            
+            self.create_departments_and_courses()
+            self.create_sample_users(options['users'])
+            self.create_sample_elections(options['elections'])
+            self.create_sample_candidates()
+            self.create_sample_votes()
         
         self.stdout.write(
             self.style.SUCCESS('Sample data populated successfully!')
@@ -1,9 +1,16 @@
 """
 Custom middleware for E-Botar system
 """
+import logging
+
+from django.http import HttpResponseForbidden
+from django.utils.functional import SimpleLazyObject
 from django.utils.deprecation import MiddlewareMixin
+from E_Botar.services.ip_blocklist import blocklist
 from E_Botar.utils.logging_utils import log_activity, get_client_ip
 
+logger = logging.getLogger(__name__)
+
 
 class ActivityLoggingMiddleware(MiddlewareMixin):
     """
@@ -19,3 +26,40 @@ class ActivityLoggingMiddleware(MiddlewareMixin):
 
 import time
 
+
+class BlockedIPMiddleware:
+    """
+    Refuse requests from blocked IP addresses and networks.
+
+    Sits at the top of MIDDLEWARE so blocked clients cost no session, auth or
+    view work. Lookups go to the process-local radix tree in
+    E_Botar.services.ip_blocklist, not the database.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        network = blocklist.match(get_client_ip(request))
+        if network is not None:
+            logger.info(f"Refused request from blocked network {network}: {request.path}")
+            return HttpResponseForbidden('Access denied.')
+        return self.get_response(request)
+
+
+class VoterContextMiddleware:
+    """
+    Attach a lazy ``request.voter`` (E_Botar.services.voter_context.VoterContext).
+
+    Must come after AuthenticationMiddleware. Nothing is queried unless a view
+    or template uses ``request.voter``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from E_Botar.services.voter_context import VoterContext
+
+        request.voter = SimpleLazyObject(lambda: VoterContext.for_user(request.user))
+        return self.get_response(request)
@@ -9,7 +9,7 @@ from datetime import timedelta
 # Import models from consolidated modules
 from election_module.models import SchoolElection, SchoolPosition, ElectionPosition
 from candidate_module.models import Candidate
-from voting_module.models import AnonVote, SchoolVote
+from voting_module.models import SchoolVote
 from auth_module.models import UserProfile
 
 
@@ -22,31 +22,22 @@ def tally_election(election: SchoolElection) -> Dict[Any, dict]:
     positions = SchoolPosition.objects.filter(
         elections__election=election, 
         is_active=True
-    ).prefetch_related('candidates')
+    )
+    
+    # Every candidate's count in one query (see CandidateQuerySet.with_tallies)
+    candidates_by_position: Dict[int, List[Candidate]] = defaultdict(list)
+    for candidate in Candidate.objects.with_tallies(election).filter(is_active=True, position__in=positions):
+        candidates_by_position[candidate.position_id].append(candidate)
     
     results: Dict[Any, dict] = {}
     
     for position in positions:
-        candidates = Candidate.objects.filter(
-            election=election,
-            position=position,
-            is_active=True
-        )
-        
-        total_votes = 0
-        counts: Dict[int, int] = defaultdict(int)
-        
-        for candidate in candidates:
-            cnt = AnonVote.objects.filter(
-                candidate=candidate, 
-                election=election
-            ).count()
-            counts[candidate.id] = cnt
-            total_votes += cnt
+        candidates = candidates_by_position.get(position.id, [])
+        total_votes = sum(candidate.vote_count() for candidate in candidates)
         
         rows = []
         for candidate in candidates:
-            cnt = counts[candidate.id]
+            cnt = candidate.vote_count()
             pct = round((cnt / total_votes * 100), 1) if total_votes > 0 else 0
             rows.append({
                 'candidate': candidate, 
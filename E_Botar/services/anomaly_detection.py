@@ -0,0 +1,297 @@
+"""
+Incremental security anomaly detector.
+
+Each run reads only the events added since the previous run, tracked per
+source as a high-water mark (primary key) plus the ids already read above it:
+
+* ``AccessAttempt`` -> failed-login bursts per IP and per username,
+* ``ActivityLog`` entries with ``action='vote'`` -> many distinct accounts
+  voting from one IP within a few minutes,
+* ``VoteReceipt`` -> vote velocity: votes per minute compared with an
+  exponentially weighted moving average and variance of earlier minutes.
+
+The windowed statistics are bounded: per key only the last ``threshold``
+timestamps (or voters) are kept, and each map tracks at most
+``MAX_TRACKED_KEYS`` keys, evicting the least recently seen. They are stored
+as JSON on ``AnomalyDetectorState`` together with the high-water marks, so
+any process can run the detector and a run costs O(new events). A run that
+starts without a high-water mark only looks back ``COLD_START_LOOKBACK``
+seconds.
+
+Rows are written by buffered writers in several processes, so a lower id
+can commit after a higher one was read. The mark therefore only advances
+past rows older than the log flush interval plus ``SETTLE_MARGIN`` seconds;
+rows above it are re-read on the next run and the ids already processed
+are skipped.
+
+Crossing a threshold creates a ``SecurityAlert`` (``anomaly_detected`` or
+``threat_detected``); the same key does not alert again until its window has
+passed.
+"""
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = 'default'
+BATCH_SIZE = 5000
+MAX_TRACKED_KEYS = 5000
+COLD_START_LOOKBACK = 60 * 60
+# Seconds after which an uncommitted row with a lower id is no longer expected
+SETTLE_MARGIN = 60
+
+DEFAULT_THRESHOLDS = {
+    # Failed logins from one IP / against one username within the window
+    'failed_login_ip_count': 10,
+    'failed_login_user_count': 5,
+    'failed_login_window': 300,
+    # Distinct accounts voting from one IP within the window
+    'shared_ip_voters': 5,
+    'shared_ip_window': 600,
+    # Votes in a minute above mean + factor * stddev (and at least min_votes)
+    'vote_velocity_factor': 4.0,
+    'vote_velocity_min_votes': 30,
+    'vote_velocity_min_samples': 10,
+    'vote_velocity_alpha': 0.1,
+}
+
+
+def thresholds() -> Dict:
+    return {**DEFAULT_THRESHOLDS, **getattr(settings, 'SECURITY_ANOMALY_THRESHOLDS', {})}
+
+
+def _touch(mapping: Dict, key: str, default):
+    """Move ``key`` to the most-recent end of ``mapping`` and evict the oldest keys"""
+    value = mapping.pop(key, default)
+    mapping[key] = value
+    while len(mapping) > MAX_TRACKED_KEYS:
+        mapping.pop(next(iter(mapping)))
+    return value
+
+
+class AnomalyDetector:
+    """Windowed statistics over a stream of events; collects alerts to raise"""
+
+    def __init__(self, state: Optional[Dict] = None, limits: Optional[Dict] = None):
+        state = state or {}
+        self.limits = limits or thresholds()
+        self.failures_by_ip: Dict[str, List[float]] = state.get('failures_by_ip', {})
+        self.failures_by_user: Dict[str, List[float]] = state.get('failures_by_user', {})
+        self.voters_by_ip: Dict[str, Dict[str, float]] = state.get('voters_by_ip', {})
+        self.velocity: Dict = state.get('velocity', {'minute': None, 'count': 0, 'mean': 0.0, 'var': 0.0, 'samples': 0})
+        self.cooldowns: Dict[str, float] = state.get('cooldowns', {})
+        self.alerts: List[Dict] = []
+
+    def state(self) -> Dict:
+        return {
+            'failures_by_ip': self.failures_by_ip,
+            'failures_by_user': self.failures_by_user,
+            'voters_by_ip': self.voters_by_ip,
+            'velocity': self.velocity,
+            'cooldowns': self.cooldowns,
+        }
+
+    def _alert(self, key: str, ts: float, cooldown: float, **alert):
+        last = self.cooldowns.get(key)
+        if last is not None and ts - last < cooldown:
+            return
+        _touch(self.cooldowns, key, ts)
+        self.cooldowns[key] = ts
+        self.alerts.append(alert)
+
+    def _burst(self, mapping, key, ts, limit, window) -> bool:
+        """Record ``ts`` for ``key``; True when ``limit`` events fall inside ``window``"""
+        stamps = _touch(mapping, key, [])
+        stamps.append(ts)
+        del stamps[:-limit]
+        return len(stamps) >= limit and stamps[-1] - stamps[0] <= window
+
+    # --- observers ---
+
+    def observe_attempt(self, ts: float, ip: Optional[str], username: str, success: bool):
+        if success:
+            return
+        limits = self.limits
+        window = limits['failed_login_window']
+        if ip and self._burst(self.failures_by_ip, ip, ts, limits['failed_login_ip_count'], window):
+            self._alert(
+                f'failed_ip:{ip}', ts, window,
+                alert_type='threat_detected', severity='high',
+                title=f'Failed login burst from {ip}',
+                description=f'{limits["failed_login_ip_count"]} failed logins from {ip} within {window // 60} minutes.',
+            )
+        user_key = (username or '').strip().lower()
+        if user_key and self._burst(self.failures_by_user, user_key, ts, limits['failed_login_user_count'], window):
+            self._alert(
+                f'failed_user:{user_key}', ts, window,
+                alert_type='threat_detected', severity='medium',
+                title=f'Repeated failed logins for "{username}"',
+                description=f'{limits["failed_login_user_count"]} failed logins for "{username}" within {window // 60} minutes.',
+            )
+
+    def observe_vote(self, ts: float, ip: Optional[str], user_id: Optional[int]):
+        if not ip or user_id is None:
+            return
+        limits = self.limits
+        window = limits['shared_ip_window']
+        voters = _touch(self.voters_by_ip, ip, {})
+        voters[str(user_id)] = ts
+        for voter, seen in list(voters.items()):
+            if ts - seen > window:
+                del voters[voter]
+        while len(voters) > limits['shared_ip_voters']:
+            voters.pop(min(voters, key=voters.get))
+        if len(voters) >= limits['shared_ip_voters']:
+            self._alert(
+                f'shared_ip:{ip}', ts, window,
+                alert_type='anomaly_detected', severity='high',
+                title=f'Multiple accounts voting from {ip}',
+                description=f'{len(voters)} different accounts voted from {ip} within {window // 60} minutes.',
+            )
+
+    def observe_receipt(self, ts: float):
+        minute = int(ts // 60)
+        velocity = self.velocity
+        if velocity['minute'] is None:
+            velocity['minute'] = minute
+        if minute > velocity['minute']:
+            self._close_minutes(minute)
+        if minute == velocity['minute']:
+            velocity['count'] += 1
+            self._check_velocity(ts)
+
+    def advance(self, ts: float):
+        """Close vote-velocity minutes that ended before ``ts``"""
+        if self.velocity['minute'] is not None and int(ts // 60) > self.velocity['minute']:
+            self._close_minutes(int(ts // 60))
+
+    # --- vote velocity ---
+
+    def _close_minutes(self, minute: int):
+        velocity = self.velocity
+        self._update_baseline(velocity['count'])
+        # Quiet minutes in between count as zero votes (bounded to one day)
+        for _ in range(min(minute - velocity['minute'] - 1, 24 * 60)):
+            self._update_baseline(0)
+        velocity['minute'] = minute
+        velocity['count'] = 0
+
+    def _update_baseline(self, count: int):
+        velocity = self.velocity
+        alpha = self.limits['vote_velocity_alpha']
+        delta = count - velocity['mean']
+        velocity['mean'] += alpha * delta
+        velocity['var'] = (1 - alpha) * (velocity['var'] + alpha * delta * delta)
+        velocity['samples'] += 1
+
+    def _check_velocity(self, ts: float):
+        velocity = self.velocity
+        limits = self.limits
+        if velocity['samples'] < limits['vote_velocity_min_samples'] or velocity['count'] < limits['vote_velocity_min_votes']:
+            return
+        ceiling = velocity['mean'] + limits['vote_velocity_factor'] * math.sqrt(velocity['var'])
+        if velocity['count'] > ceiling:
+            self._alert(
+                'vote_velocity', ts, 60,
+                alert_type='anomaly_detected', severity='medium',
+                title='Abnormal vote velocity',
+                description=(
+                    f'{velocity["count"]} votes in one minute; the recent average is '
+                    f'{velocity["mean"]:.1f} per minute.'
+                ),
+            )
+
+
+@dataclass
+class DetectionResult:
+    processed: Dict[str, int] = field(default_factory=dict)
+    alerts: List = field(default_factory=list)
+
+
+def _sources():
+    from auth_module.models import ActivityLog
+    from security_module.models import AccessAttempt
+    from voting_module.models import VoteReceipt
+
+    return {
+        'access_attempts': (AccessAttempt.objects.all(), 'timestamp', ('ip_address', 'username', 'success')),
+        'vote_logs': (ActivityLog.objects.filter(action='vote'), 'timestamp', ('ip_address', 'user_id')),
+        'vote_receipts': (VoteReceipt.objects.all(), 'created_at', ()),
+    }
+
+
+def _cold_start_mark(queryset, ts_field: str, now) -> int:
+    """The last id from before the look-back window"""
+    since = now - timedelta(seconds=COLD_START_LOOKBACK)
+    last = queryset.filter(**{f'{ts_field}__lt': since}).order_by('-id').values_list('id', flat=True).first()
+    return last or 0
+
+
+def _settle_seconds() -> float:
+    return getattr(settings, 'ACTIVITY_LOG_FLUSH_INTERVAL_MS', 500) / 1000 + SETTLE_MARGIN
+
+
+def _read_mark(value):
+    """(settled id, ids read above it); plain ints are marks saved before ids were tracked"""
+    if value is None or isinstance(value, int):
+        return value, set()
+    return value['settled'], set(value['seen'])
+
+
+def run_detector(batch_size: int = BATCH_SIZE) -> DetectionResult:
+    """Feed events added since the last run to the detector and save any alerts"""
+    from security_module.models import AnomalyDetectorState, SecurityAlert
+
+    result = DetectionResult()
+    now = timezone.now()
+    settled_before = now - timedelta(seconds=_settle_seconds())
+    with transaction.atomic():
+        row, _ = AnomalyDetectorState.objects.select_for_update().get_or_create(name=STATE_NAME)
+        detector = AnomalyDetector(row.state)
+        marks = dict(row.high_water_marks)
+
+        for source, (queryset, ts_field, fields) in _sources().items():
+            mark, seen = _read_mark(marks.get(source))
+            if mark is None:
+                mark = _cold_start_mark(queryset, ts_field, now)
+            # Every seen id is above the mark, so this still yields up to batch_size new rows
+            rows = list(
+                queryset.filter(id__gt=mark).order_by('id').values('id', ts_field, *fields)[:batch_size + len(seen)]
+            )
+            events = [event for event in rows if event['id'] not in seen]
+            for event in events:
+                ts = event[ts_field].timestamp()
+                if source == 'access_attempts':
+                    detector.observe_attempt(ts, event['ip_address'], event['username'], event['success'])
+                elif source == 'vote_logs':
+                    detector.observe_vote(ts, event['ip_address'], event['user_id'])
+                else:
+                    detector.observe_receipt(ts)
+            settled = [event['id'] for event in rows if event[ts_field] < settled_before]
+            if settled:
+                mark = max(mark, max(settled))
+            seen = sorted(i for i in seen.union(event['id'] for event in events) if i > mark)
+            marks[source] = {'settled': mark, 'seen': seen}
+            result.processed[source] = len(events)
+        detector.advance(now.timestamp())
+
+        for alert in detector.alerts:
+            result.alerts.append(SecurityAlert.objects.create(**alert))
+
+        row.high_water_marks = marks
+        row.state = detector.state()
+        row.last_run_at = now
+        row.save()
+
+    if result.alerts:
+        logger.warning(f"Anomaly detector raised {len(result.alerts)} security alerts")
+    return result
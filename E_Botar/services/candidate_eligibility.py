@@ -0,0 +1,135 @@
+"""
+Set-based index of the candidate application rules.
+
+``CandidateApplication.clean`` enforces two rules:
+
+* a party may field only one candidate per position in an election,
+* a user may not run for the same position in consecutive elections
+  (the previous election is the one that started last before this one).
+
+``EligibilityIndex.for_elections`` precomputes, for a set of target
+elections, the (user, position) pairs barred by the consecutive-term rule
+and the (party, position) slots already taken, each with one grouped query
+(plus one query for the election order). Checking an application is then
+set and dict membership, so validating every application costs a fixed
+number of queries however many there are.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.core.exceptions import ValidationError
+
+
+class EligibilityIndex:
+    """Barred (user, position) pairs and taken (party, position) slots per election"""
+
+    def __init__(
+        self,
+        previous: Dict[int, Tuple[int, str]],
+        barred: Dict[int, Set[Tuple[int, int]]],
+        taken: Dict[Tuple[int, int, int], List[Tuple[int, str]]],
+    ):
+        # election id -> (previous election id, previous election title)
+        self.previous = previous
+        # election id -> {(user id, position id)} that ran in the previous election
+        self.barred = barred
+        # (election id, party id, position id) -> [(user id, full name)] of active candidates
+        self.taken = taken
+
+    @classmethod
+    def for_elections(cls, elections: Iterable, users=None, positions=None, parties=None) -> 'EligibilityIndex':
+        """Index for ``elections`` (objects or ids)
+
+        ``users`` narrows the barred pairs, ``parties`` the taken slots and ``positions`` both.
+        """
+        from candidate_module.models import Candidate
+        from election_module.models import SchoolElection
+
+        targets = {getattr(election, 'pk', election) for election in elections} - {None}
+        if not targets:
+            return cls({}, {}, {})
+
+        ordered = sorted(SchoolElection.objects.values_list('id', 'start_date', 'title'), key=lambda row: row[1])
+        starts = [row[1] for row in ordered]
+        previous = {}
+        for election_id, start_date, _ in ordered:
+            if election_id in targets:
+                # Latest election that started strictly before this one
+                index = bisect_left(starts, start_date)
+                if index:
+                    previous[election_id] = (ordered[index - 1][0], ordered[index - 1][2])
+
+        candidates = Candidate.objects.filter(is_active=True)
+        if positions is not None:
+            candidates = candidates.filter(position__in=positions)
+
+        barred = defaultdict(set)
+        if previous:
+            targets_by_previous = defaultdict(list)
+            for election_id, (previous_id, _) in previous.items():
+                targets_by_previous[previous_id].append(election_id)
+            ran = candidates.filter(election__in=targets_by_previous)
+            if users is not None:
+                ran = ran.filter(user__in=users)
+            rows = ran.values_list('election_id', 'user_id', 'position_id').distinct()
+            for previous_id, user_id, position_id in rows:
+                for election_id in targets_by_previous[previous_id]:
+                    barred[election_id].add((user_id, position_id))
+
+        taken = defaultdict(list)
+        slots = candidates.filter(election__in=targets, party__isnull=False)
+        if parties is not None:
+            slots = slots.filter(party__in=parties)
+        rows = slots.values_list(
+            'election_id', 'party_id', 'position_id', 'user_id', 'user__first_name', 'user__last_name'
+        ).order_by('id')
+        for election_id, party_id, position_id, user_id, first_name, last_name in rows:
+            taken[(election_id, party_id, position_id)].append((user_id, f"{first_name} {last_name}".strip()))
+
+        return cls(previous, dict(barred), dict(taken))
+
+    @classmethod
+    def for_application(cls, application) -> 'EligibilityIndex':
+        """Index covering just ``application``'s user, position and party"""
+        return cls.for_elections(
+            [application.election_id],
+            users=[application.user_id],
+            positions=[application.position_id],
+            parties=[application.party_id] if application.party_id else [],
+        )
+
+    def previous_election(self, election_id: int) -> Optional[Tuple[int, str]]:
+        return self.previous.get(election_id)
+
+    def is_barred(self, user_id: int, position_id: int, election_id: int) -> bool:
+        return (user_id, position_id) in self.barred.get(election_id, ())
+
+    def slot_holder(self, party_id: int, position_id: int, election_id: int, user_id: int) -> Optional[str]:
+        """Name of another user already running for ``party_id`` in this slot, or None"""
+        for holder_id, name in self.taken.get((election_id, party_id, position_id), ()):
+            if holder_id != user_id:
+                return name
+        return None
+
+    def validate(self, application):
+        """Raise ``ValidationError`` if ``application`` breaks either rule"""
+        if application.party_id:
+            holder = self.slot_holder(
+                application.party_id, application.position_id, application.election_id, application.user_id
+            )
+            if holder is not None:
+                raise ValidationError(
+                    f"Party '{application.party.name}' already has a candidate ({holder}) "
+                    f"for the position '{application.position.name}' in this election."
+                )
+
+        if application.election_id and application.position_id:
+            previous = self.previous_election(application.election_id)
+            if previous and self.is_barred(application.user_id, application.position_id, application.election_id):
+                raise ValidationError(
+                    f"You cannot run for the same position '{application.position.name}' "
+                    f"in consecutive elections. You previously ran in {previous[1]}."
+                )
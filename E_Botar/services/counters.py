@@ -0,0 +1,261 @@
+"""
+Denormalised dashboard counters.
+
+Dashboards used to run a full-table ``COUNT(*)`` per statistic on every page
+load. Instead, each statistic is a named ``SystemCounter`` row:
+
+* **Increments.** ``post_save``/``post_delete`` receivers on the counted
+  models add +1/-1 to the transaction's pending deltas, which one
+  ``on_commit`` callback applies as one UPDATE per changed counter (so a bulk
+  delete of N rows costs one UPDATE, not N). For filtered counters on
+  mutable fields (``UserProfile.is_verified``, ``CandidateApplication.status``)
+  the instance's match state is captured at ``post_init`` so an update moves
+  it between counters. Bulk paths that bypass signals call ``increment``
+  themselves (``BulkUserGenerator``).
+* **Reconciliation.** ``reconcile_counters`` recomputes the true counts. The
+  job worker runs it every ``COUNTER_RECONCILE_SECONDS``, which also repairs
+  drift from queryset ``update``/``delete`` calls that fire no signals.
+  Counters that cannot be kept incrementally (distinct voters) are
+  reconcile-only.
+* **Reads.** ``get_counters`` serves all counters from a per-process snapshot
+  at most ``COUNTER_CACHE_TTL`` seconds old (one query per refresh). A counter
+  that has never been reconciled is computed on first read.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_delete, post_init, post_save
+from django.utils import timezone
+
+from admin_module.models import SystemCounter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CounterSpec:
+    name: str
+    model: str
+    # Reconciliation filter and the equivalent check on a single instance
+    q: Optional[Q] = None
+    matches: Optional[Callable] = None
+    fields: tuple = ()
+    # COUNT(DISTINCT field); cannot be maintained incrementally
+    distinct: Optional[str] = None
+
+    @property
+    def incremental(self):
+        return self.distinct is None
+
+    def queryset(self):
+        qs = apps.get_model(self.model).objects.all()
+        return qs.filter(self.q) if self.q is not None else qs
+
+    def count(self):
+        qs = self.queryset()
+        if self.distinct:
+            return qs.order_by().values(self.distinct).distinct().count()
+        return qs.count()
+
+    def instance_matches(self, instance):
+        return self.matches is None or bool(self.matches(instance))
+
+
+COUNTERS: Dict[str, CounterSpec] = {spec.name: spec for spec in (
+    CounterSpec('users.total', 'auth_module.UserProfile'),
+    CounterSpec('users.verified', 'auth_module.UserProfile', Q(is_verified=True), lambda p: p.is_verified, ('is_verified',)),
+    CounterSpec('elections.total', 'election_module.SchoolElection'),
+    CounterSpec('votes.total', 'voting_module.SchoolVote'),
+    CounterSpec('votes.unique_voters', 'voting_module.SchoolVote', distinct='voter'),
+    CounterSpec('candidates.total', 'candidate_module.Candidate'),
+    CounterSpec('applications.approved', 'candidate_module.CandidateApplication',
+                Q(status='approved'), lambda a: a.status == 'approved', ('status',)),
+    CounterSpec('applications.pending', 'candidate_module.CandidateApplication',
+                Q(status='pending'), lambda a: a.status == 'pending', ('status',)),
+    CounterSpec('security.events', 'security_module.SecurityEvent'),
+    CounterSpec('security.events.critical', 'security_module.SecurityEvent',
+                Q(severity='critical'), lambda e: e.severity == 'critical', ('severity',)),
+    CounterSpec('security.events.high_or_critical', 'security_module.SecurityEvent',
+                Q(severity__in=['high', 'critical']), lambda e: e.severity in ('high', 'critical'), ('severity',)),
+    CounterSpec('security.failed_logins', 'security_module.AccessAttempt',
+                Q(success=False), lambda a: not a.success, ('success',)),
+)}
+
+
+# --- writes -------------------------------------------------------------------
+
+def _apply(deltas: Dict[str, int]):
+    # A counter that was never reconciled has no row yet; its first read computes it
+    now = timezone.now()
+    for name, delta in deltas.items():
+        if delta:
+            SystemCounter.objects.filter(name=name).update(value=F('value') + delta, updated_at=now)
+    counter_cache.invalidate()
+
+
+class _PendingDeltas:
+    """Counter deltas of one transaction (savepoint level), applied by a single on_commit callback
+
+    Only the callback registered with Django holds a strong reference to the
+    batch. When a rollback discards the callback, the batch is freed and drops
+    out of ``_pending.batches``, so its deltas are never applied or reused.
+    """
+
+    def __init__(self):
+        self.deltas: Dict[str, int] = defaultdict(int)
+        self.flushed = False
+        transaction.on_commit(self.flush, robust=True)
+
+    def flush(self):
+        self.flushed = True
+        _apply(self.deltas)
+
+
+_pending = threading.local()
+
+
+def _pending_deltas(connection) -> _PendingDeltas:
+    batches = getattr(_pending, 'batches', None)
+    if batches is None:
+        batches = _pending.batches = weakref.WeakValueDictionary()
+    # Deltas are kept per savepoint so rolling one back drops exactly its own
+    key = connection.savepoint_ids[-1] if connection.savepoint_ids else None
+    batch = batches.get(key)
+    if batch is None or batch.flushed:
+        batch = batches[key] = _PendingDeltas()
+    return batch
+
+
+def increment(name: str, delta: int = 1):
+    """Add ``delta`` to counter ``name`` once the current transaction commits"""
+    if not delta:
+        return
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        _apply({name: delta})
+        return
+    _pending_deltas(connection).deltas[name] += delta
+
+
+def reconcile_counters(names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """Overwrite counters with their true counts; returns ``{name: value}``"""
+    specs = [COUNTERS[n] for n in names] if names is not None else list(COUNTERS.values())
+    now = timezone.now()
+    values = {spec.name: spec.count() for spec in specs}
+    SystemCounter.objects.bulk_create(
+        [SystemCounter(name=name, value=value, reconciled_at=now) for name, value in values.items()],
+        update_conflicts=True,
+        unique_fields=['name'],
+        update_fields=['value', 'reconciled_at', 'updated_at'],
+    )
+    counter_cache.invalidate()
+    return values
+
+
+# --- reads --------------------------------------------------------------------
+
+class CounterCache:
+    """Process-local snapshot of every counter, refreshed after ``ttl`` seconds"""
+
+    def __init__(self, ttl: Optional[float] = None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._values: Dict[str, int] = {}
+        self._expires = 0.0
+
+    @property
+    def ttl(self):
+        return self._ttl if self._ttl is not None else getattr(settings, 'COUNTER_CACHE_TTL', 5)
+
+    def invalidate(self):
+        self._expires = 0.0
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, int]:
+        names = list(names)
+        if time.monotonic() >= self._expires:
+            with self._lock:
+                if time.monotonic() >= self._expires:
+                    self._values = dict(SystemCounter.objects.values_list('name', 'value'))
+                    self._expires = time.monotonic() + self.ttl
+        values = self._values
+        missing = [n for n in names if n not in values]
+        if missing:
+            values = {**values, **reconcile_counters(missing)}
+        return {n: values[n] for n in names}
+
+
+counter_cache = CounterCache()
+
+
+def get_counters(*names: str) -> Dict[str, int]:
+    return counter_cache.get_many(names)
+
+
+def get_counter(name: str) -> int:
+    return counter_cache.get_many([name])[name]
+
+
+# --- signal maintenance -------------------------------------------------------
+
+_STATE_ATTR = '_counter_matches'
+
+
+def _specs_by_model():
+    by_model: Dict[type, list] = {}
+    for spec in COUNTERS.values():
+        if spec.incremental:
+            by_model.setdefault(apps.get_model(spec.model), []).append(spec)
+    return by_model
+
+
+def _matching(specs, instance):
+    return frozenset(spec.name for spec in specs if spec.instance_matches(instance))
+
+
+def connect_signals():
+    """Hook the counted models' signals; called from AdminModuleConfig.ready()"""
+    for model, specs in _specs_by_model().items():
+        mutable = any(spec.matches is not None for spec in specs)
+
+        def remember(sender, instance, specs=specs, **kwargs):
+            if instance.pk is None:
+                instance.__dict__[_STATE_ATTR] = frozenset()
+                return
+            deferred = instance.get_deferred_fields()
+            if any(f in deferred for spec in specs for f in spec.fields):
+                # Evaluating would load the field row by row; leave it to reconciliation
+                return
+            instance.__dict__[_STATE_ATTR] = _matching(specs, instance)
+
+        def saved(sender, instance, created, raw=False, specs=specs, **kwargs):
+            if raw:
+                return
+            now = _matching(specs, instance)
+            before = frozenset() if created else instance.__dict__.get(_STATE_ATTR, now)
+            for name in now - before:
+                increment(name, 1)
+            for name in before - now:
+                increment(name, -1)
+            instance.__dict__[_STATE_ATTR] = now
+
+        def deleted(sender, instance, specs=specs, **kwargs):
+            before = instance.__dict__.get(_STATE_ATTR)
+            for name in before if before is not None else _matching(specs, instance):
+                increment(name, -1)
+
+        uid = f'counters:{model._meta.label}'
+        if mutable:
+            post_init.connect(remember, sender=model, weak=False, dispatch_uid=f'{uid}:init')
+        post_save.connect(saved, sender=model, weak=False, dispatch_uid=f'{uid}:save')
+        post_delete.connect(deleted, sender=model, weak=False, dispatch_uid=f'{uid}:delete')
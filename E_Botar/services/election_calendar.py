@@ -0,0 +1,158 @@
+"""
+Election calendar: which elections are current, completed or upcoming.
+
+The elections table is small, so each process loads all of it once and
+classifies every election against the clock with one definition, used by
+every view and form:
+
+* **current**: ``is_active`` and ``start_date <= now <= end_date``
+* **completed**: ``end_date < now``, active or not ("End now" deactivates
+  the election it closes)
+* **upcoming**: ``is_active`` and ``start_date > now``
+
+A classification stays valid until the next start or end boundary, after
+which it is recomputed from the loaded rows with no query. The rows
+themselves are reloaded (one query) when a ``SchoolElection`` is saved or
+deleted, since ``invalidate_election_calendar`` bumps a version key in the
+cache on commit, or once they are ``ELECTION_CALENDAR_MAX_AGE`` seconds old,
+so workers that do not share a cache backend converge.
+
+Every call returns a calendar holding its own copies of the election
+instances, so a request can annotate or modify them without affecting other
+requests or threads. Views that write rows pointing at an election should
+still re-read it by pk, since the snapshot may be up to
+``ELECTION_CALENDAR_MAX_AGE`` seconds old.
+"""
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+VERSION_KEY = 'election_calendar:version'
+
+# current covers end_date itself, so it only flips just after it
+_AFTER = timedelta(microseconds=1)
+
+
+class ElectionCalendar:
+    """Elections classified at ``now``; valid until ``valid_until``"""
+
+    def __init__(self, elections: Iterable, now: datetime):
+        self.elections = tuple(elections)
+        self.now = now
+        active = [e for e in self.elections if e.is_active]
+        self.current: List = sorted(
+            (e for e in active if e.start_date <= now <= e.end_date), key=lambda e: e.start_date, reverse=True
+        )
+        self.completed: List = sorted(
+            (e for e in self.elections if e.end_date < now), key=lambda e: e.end_date, reverse=True
+        )
+        self.upcoming: List = sorted((e for e in active if e.start_date > now), key=lambda e: e.start_date)
+        boundaries = [e.start_date for e in self.upcoming] + [e.end_date + _AFTER for e in self.current]
+        self.valid_until: Optional[datetime] = min(boundaries, default=None)
+
+    def covers(self, now: datetime) -> bool:
+        return self.now <= now and (self.valid_until is None or now < self.valid_until)
+
+    def copy(self) -> 'ElectionCalendar':
+        """This calendar over copies of its election instances"""
+        return ElectionCalendar((copy.copy(e) for e in self.elections), self.now)
+
+    def at(self, now: datetime) -> 'ElectionCalendar':
+        """This calendar, or the same elections reclassified at ``now``"""
+        return self if self.covers(now) else ElectionCalendar(self.elections, now)
+
+    @property
+    def active(self) -> List:
+        return [e for e in self.elections if e.is_active]
+
+    @property
+    def current_election(self):
+        return self.current[0] if self.current else None
+
+    @property
+    def last_completed(self):
+        return self.completed[0] if self.completed else None
+
+    @property
+    def next_upcoming(self):
+        return self.upcoming[0] if self.upcoming else None
+
+    @property
+    def open_election(self):
+        """The election being run, else the next one being prepared"""
+        return self.current_election or self.next_upcoming
+
+    @property
+    def applications_available(self) -> bool:
+        """Candidate applications are open while an election has not started yet"""
+        return bool(self.upcoming)
+
+    def status(self, election) -> str:
+        if election.end_date < self.now:
+            return 'completed'
+        if not election.is_active:
+            return 'inactive'
+        if election.start_date > self.now:
+            return 'upcoming'
+        return 'current'
+
+
+def invalidate_election_calendar():
+    """Make every process reload the elections on its next calendar read"""
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+class _CalendarCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calendar: Optional[ElectionCalendar] = None
+        self._version = None
+        self._loaded_at = 0.0
+
+    @property
+    def max_age(self):
+        return getattr(settings, 'ELECTION_CALENDAR_MAX_AGE', 60)
+
+    def _stale(self, calendar, version) -> bool:
+        return calendar is None or version != self._version or time.monotonic() - self._loaded_at >= self.max_age
+
+    def get(self, now: datetime) -> ElectionCalendar:
+        version = cache.get(VERSION_KEY)
+        with self._lock:
+            # Read once: clear() may reset it from another thread
+            calendar = self._calendar
+            if self._stale(calendar, version):
+                from election_module.models import SchoolElection
+
+                calendar = ElectionCalendar(SchoolElection.objects.all(), now)
+                self._version = version
+                self._loaded_at = time.monotonic()
+                self._calendar = calendar
+            classified = calendar.at(now)
+            if classified is not calendar and now >= calendar.now:
+                self._calendar = classified
+        return classified.copy()
+
+    def clear(self):
+        with self._lock:
+            self._calendar = None
+
+
+_calendar_cache = _CalendarCache()
+
+
+def get_election_calendar(now: Optional[datetime] = None) -> ElectionCalendar:
+    return _calendar_cache.get(now or timezone.now())
+
+
+def applications_available(now: Optional[datetime] = None) -> bool:
+    """True while an active election has not started yet (candidate applications are open)"""
+    return get_election_calendar(now).applications_available
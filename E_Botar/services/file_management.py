@@ -103,16 +103,17 @@ class FileManagementService:
             return None
     
     @staticmethod
-    def cleanup_orphaned_files():
-        """Clean up orphaned files (files not referenced by any model)"""
+    def cleanup_orphaned_files(dry_run=True, quarantine=True):
+        """Clean up orphaned files (files not referenced by any model)
+        
+        Returns an ``orphaned_media.ReconcileResult`` summary, or None on failure.
+        """
+        from E_Botar.services.orphaned_media import reconcile_media
         try:
-            # This would need to be implemented based on your specific needs
-            # For now, just log that cleanup was attempted
-            logger.info("Orphaned file cleanup attempted")
-            return True
+            return reconcile_media(dry_run=dry_run, quarantine=quarantine)
         except Exception as e:
             logger.error(f"Error during file cleanup: {str(e)}")
-            return False
+            return None
 
 
 class DocumentService:
@@ -0,0 +1,214 @@
+"""
+Resized variants of candidate photos and party logos.
+
+After a ``Candidate.photo`` or ``Party.logo`` upload commits, an
+``image_variants`` background job (see ``E_Botar.services.jobs``) renders
+each size in ``VARIANTS`` as WebP plus a JPEG fallback, using a thread pool
+of ``IMAGE_VARIANT_WORKERS`` (Pillow releases the GIL while resizing and
+encoding). Nothing is re-encoded on the request path.
+
+Variant files are named after a hash of the source bytes, e.g.
+``variants/candidate_photos/3fa4c1d29b0e7a61-card.webp``, so a name never
+changes content: identical uploads share files, browsers can cache them
+forever (``serve_variant`` sends immutable cache headers when Django serves
+media) and a replaced photo simply gets new names.
+
+The generated names are stored in the model's ``<field>_variants`` JSON
+field together with the source name they were built from; the
+``image_variant`` and ``picture`` template tags fall back to the original
+file until the variants for the current upload exist.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = 'variants'
+
+# name -> longest side in pixels (images are never upscaled)
+VARIANTS: Dict[str, int] = {
+    'thumb': 96,
+    'card': 320,
+    'full': 1024,
+}
+
+# format -> (Pillow format, extension, save options)
+FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# model label -> image field that gets variants
+TRACKED_FIELDS = {
+    'candidate_module.Candidate': 'photo',
+    'election_module.Party': 'logo',
+}
+
+HASH_LENGTH = 16
+
+
+def variants_attr(field_name: str) -> str:
+    return f'{field_name}_variants'
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def variant_name(source_name: str, digest: str, variant: str, fmt: str) -> str:
+    """Storage name of one variant, e.g. ``variants/party_logos/<hash>-thumb.webp``"""
+    directory = posixpath.dirname(source_name)
+    return posixpath.join(VARIANTS_DIR, directory, f'{digest}-{variant}.{FORMATS[fmt][1]}')
+
+
+def _render(image: Image.Image, size: int, fmt: str) -> Tuple[bytes, Tuple[int, int]]:
+    pil_format, _, options = FORMATS[fmt]
+    resized = image.copy()
+    resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+    if fmt == 'jpeg' and resized.mode != 'RGB':
+        # JPEG has no alpha channel: flatten onto white
+        background = Image.new('RGB', resized.size, (255, 255, 255))
+        background.paste(resized, mask=resized.getchannel('A') if 'A' in resized.getbands() else None)
+        resized = background
+    output = io.BytesIO()
+    resized.save(output, format=pil_format, **options)
+    return output.getvalue(), resized.size
+
+
+def _save(name: str, data: bytes):
+    # Content-addressed: an existing file already holds these bytes
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(data))
+
+
+def build_variants(field_file) -> Dict:
+    """Render and store every variant of ``field_file``; returns the ``<field>_variants`` value"""
+    field_file.open('rb')
+    try:
+        data = field_file.read()
+    finally:
+        field_file.close()
+    digest = content_hash(data)
+
+    image = Image.open(io.BytesIO(data))
+    image = ImageOps.exif_transpose(image)
+    image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+    image.load()
+
+    def render(task):
+        variant, fmt = task
+        content, dimensions = _render(image, VARIANTS[variant], fmt)
+        name = variant_name(field_file.name, digest, variant, fmt)
+        _save(name, content)
+        return variant, fmt, name, dimensions
+
+    tasks = [(variant, fmt) for variant in VARIANTS for fmt in FORMATS]
+    workers = getattr(settings, 'IMAGE_VARIANT_WORKERS', 4)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image-variants') as pool:
+        rendered = list(pool.map(render, tasks))
+
+    variants: Dict = {'source': field_file.name, 'hash': digest}
+    for variant, fmt, name, (width, height) in rendered:
+        entry = variants.setdefault(variant, {'width': width, 'height': height})
+        entry[fmt] = name
+    return variants
+
+
+def current_variants(field_file) -> Optional[Dict]:
+    """The stored variants of ``field_file`` if they were built from its current upload"""
+    if not field_file:
+        return None
+    instance = getattr(field_file, 'instance', None)
+    variants = getattr(instance, variants_attr(field_file.field.name), None) or {}
+    if variants.get('source') != field_file.name:
+        return None
+    return variants
+
+
+def variant_url(field_file, variant: str = 'card', fmt: str = 'jpeg') -> str:
+    """URL of one variant of ``field_file``, or of the original until variants exist"""
+    if not field_file:
+        return ''
+    variants = current_variants(field_file)
+    name = ((variants or {}).get(variant) or {}).get(fmt)
+    if name:
+        return default_storage.url(name)
+    return field_file.url
+
+
+def needs_variants(instance, field_name: str) -> bool:
+    field_file = getattr(instance, field_name)
+    return bool(field_file) and current_variants(field_file) is None
+
+
+def queue_variants(instance, field_name: str, retry_failed: bool = False):
+    """Build the variants of ``instance.<field_name>`` in a background job once the save commits
+
+    Nothing is queued while a job for the same upload is queued or running,
+    or after one failed on it (an undecodable image would fail every time)
+    unless ``retry_failed`` is set, so repeated saves of a row whose variants
+    are not built yet do not pile up jobs.
+    """
+    payload = {
+        'model': instance._meta.label,
+        'pk': instance.pk,
+        'field': field_name,
+        'source': getattr(instance, field_name).name,
+    }
+    transaction.on_commit(lambda: _enqueue_unless_pending(payload, retry_failed))
+
+
+def _enqueue_unless_pending(payload: Dict, retry_failed: bool):
+    from admin_module.models import Job
+    from E_Botar.services.jobs import enqueue
+
+    statuses = ['queued', 'running'] if retry_failed else ['queued', 'running', 'failed']
+    earlier = Job.objects.filter(
+        job_type='image_variants',
+        status__in=statuses,
+        **{f'payload__{key}': value for key, value in payload.items()},
+    )
+    if earlier.exists():
+        return None
+    return enqueue('image_variants', payload)
+
+
+def generate_variants_for(label: str, pk, field_name: str, source: Optional[str] = None) -> Optional[Dict]:
+    """Build and store the variants of one row; None when the upload changed or is gone"""
+    model = apps.get_model(label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return None
+    field_file = getattr(instance, field_name)
+    if not field_file or (source is not None and field_file.name != source):
+        # Deleted or replaced since the job was queued; the newer save queued its own job
+        return None
+    variants = build_variants(field_file)
+    # A queryset update does not fire post_save, so this does not queue another job
+    updated = model.objects.filter(pk=pk, **{field_name: field_file.name}).update(
+        **{variants_attr(field_name): variants}
+    )
+    return variants if updated else None
+
+
+def serve_variant(request, path, document_root=None):
+    """``django.views.static.serve`` for variant files, with far-future cache headers"""
+    from django.views.static import serve
+
+    response = serve(request, path, document_root=document_root)
+    max_age = getattr(settings, 'IMAGE_VARIANT_CACHE_SECONDS', 60 * 60 * 24 * 365)
+    response['Cache-Control'] = f'public, max-age={max_age}, immutable'
+    return response
@@ -0,0 +1,139 @@
+"""
+In-memory blocklist of active ``BlockedIP`` rows.
+
+Each process keeps a binary radix tree (one per address family) whose paths
+are the leading bits of every blocked network, so a lookup walks at most 32
+(IPv4) or 128 (IPv6) bits and never touches the database. Single addresses
+are /32 or /128 networks; ``prefix_length`` blocks whole CIDR ranges.
+
+The tree is rebuilt from one query when the blocklist version stored in the
+cache changes (``bump_blocklist_version`` is called when a ``BlockedIP`` is
+saved or deleted) or, for workers that do not share a cache backend, once it
+is ``BLOCKED_IP_MAX_AGE`` seconds old.
+"""
+from __future__ import annotations
+
+import ipaddress
+import logging
+import threading
+import time
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'security:blocked_ip_version'
+
+
+class IPRadixTree:
+    """Binary trie of network prefixes; ``lookup`` returns the covering entry's value"""
+
+    def __init__(self):
+        # Node: [child for bit 0, child for bit 1, value or None]
+        self._roots = {4: [None, None, None], 6: [None, None, None]}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def insert(self, network, value=True):
+        network = ipaddress.ip_network(network, strict=False)
+        node = self._roots[network.version]
+        bits = int(network.network_address)
+        width = network.max_prefixlen
+        for depth in range(network.prefixlen):
+            if node[2] is not None:
+                # Already covered by a shorter prefix
+                return
+            bit = (bits >> (width - 1 - depth)) & 1
+            if node[bit] is None:
+                node[bit] = [None, None, None]
+            node = node[bit]
+        if node[2] is None:
+            self._size += 1
+        node[2] = value
+
+    def lookup(self, address) -> Optional[object]:
+        try:
+            address = ipaddress.ip_address(address)
+        except ValueError:
+            return None
+        if address.version == 6 and address.ipv4_mapped is not None:
+            address = address.ipv4_mapped
+        node = self._roots[address.version]
+        bits = int(address)
+        width = address.max_prefixlen
+        for depth in range(width):
+            if node[2] is not None:
+                return node[2]
+            node = node[(bits >> (width - 1 - depth)) & 1]
+            if node is None:
+                return None
+        return node[2]
+
+    @classmethod
+    def build(cls, entries: Iterable) -> 'IPRadixTree':
+        """Tree of ``(network, value)`` pairs"""
+        tree = cls()
+        for network, value in entries:
+            try:
+                tree.insert(network, value)
+            except ValueError:
+                logger.warning(f"Ignoring invalid blocked network {network}")
+        return tree
+
+
+def bump_blocklist_version():
+    """Make every process rebuild its tree on its next request"""
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+class Blocklist:
+    """Process-local ``IPRadixTree`` of active blocks, rebuilt when the version changes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tree = None
+        self._version = None
+        self._built_at = 0.0
+
+    @property
+    def max_age(self):
+        return getattr(settings, 'BLOCKED_IP_MAX_AGE', 60)
+
+    def _load(self) -> IPRadixTree:
+        from security_module.models import BlockedIP
+
+        rows = BlockedIP.objects.filter(is_active=True).values_list('ip_address', 'prefix_length')
+        cidrs = [address if prefix is None else f'{address}/{prefix}' for address, prefix in rows]
+        return IPRadixTree.build((cidr, cidr) for cidr in cidrs)
+
+    def tree(self) -> IPRadixTree:
+        version = cache.get(VERSION_KEY)
+        if self._tree is None or version != self._version or time.monotonic() - self._built_at >= self.max_age:
+            with self._lock:
+                if self._tree is None or version != self._version or time.monotonic() - self._built_at >= self.max_age:
+                    self._tree = self._load()
+                    self._version = version
+                    self._built_at = time.monotonic()
+        return self._tree
+
+    def invalidate(self):
+        self._tree = None
+
+    def match(self, *addresses) -> Optional[str]:
+        """The blocked network (as text) covering any of ``addresses``, or None"""
+        tree = self.tree()
+        if not len(tree):
+            return None
+        for address in addresses:
+            if address:
+                hit = tree.lookup(address.strip())
+                if hit is not None:
+                    return hit
+        return None
+
+
+blocklist = Blocklist()
@@ -0,0 +1,313 @@
+"""
+Database-backed background job queue.
+
+Long admin operations (bulk user generation, CSV imports, result generation,
+email blasts) are stored as ``admin_module.models.Job`` rows and executed by
+the ``run_jobs`` management command, so they are not bound by the web
+worker's request timeout. No external broker is required:
+
+* On PostgreSQL a worker claims the oldest queued job with
+  ``SELECT ... FOR UPDATE SKIP LOCKED``, so several workers never block
+  each other or pick the same job.
+* On other backends (SQLite in development) claims are serialised with a
+  lock file next to the database and a conditional status update.
+
+Handlers are plain functions registered with ``@job_handler('name')`` in an
+app's ``jobs.py`` module; they receive the Job and a ``progress`` callable
+and return a JSON-serialisable result dict.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from admin_module.models import Job, MaintenanceLease
+
+logger = logging.getLogger(__name__)
+
+_handlers: Dict[str, Callable] = {}
+
+# Minimum seconds between progress writes from a running job
+PROGRESS_WRITE_INTERVAL = 1.0
+# Seconds between heartbeats of a running job (see fail_stale_jobs)
+HEARTBEAT_INTERVAL = 30
+# A lock file older than this is considered abandoned by a crashed worker
+LOCK_STALE_SECONDS = 60
+
+
+def job_handler(name: str):
+    """Register ``func`` as the handler for jobs of type ``name``"""
+    def decorator(func):
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def get_handler(name: str) -> Optional[Callable]:
+    if name not in _handlers:
+        autodiscover_modules('jobs')
+    return _handlers.get(name)
+
+
+def enqueue(job_type: str, payload: Optional[dict] = None, user=None, total: int = 0) -> Job:
+    """Queue a job for the worker and return it.
+
+    With ``settings.JOBS_RUN_EAGERLY`` the job runs immediately in-process,
+    which keeps tests and single-process development setups working without
+    a worker.
+    """
+    if get_handler(job_type) is None:
+        raise ValueError(f'Unknown job type: {job_type}')
+    job = Job.objects.create(
+        job_type=job_type,
+        payload=payload or {},
+        progress_total=total,
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+    if getattr(settings, 'JOBS_RUN_EAGERLY', False):
+        _mark_running(job, 'eager')
+        run_job(job)
+    return job
+
+
+# --- claiming ----------------------------------------------------------------
+
+def _lock_path():
+    db_name = str(connection.settings_dict.get('NAME') or 'jobs')
+    return f"{db_name}.jobs.lock"
+
+
+@contextmanager
+def _file_lock(path, timeout=10.0):
+    """Cross-platform exclusive lock based on atomic lock-file creation"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > LOCK_STALE_SECONDS:
+                    os.remove(path)
+                    continue
+            except OSError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(f'Could not acquire job lock {path}')
+            time.sleep(0.05)
+    try:
+        os.write(fd, str(os.getpid()).encode('ascii'))
+        yield
+    finally:
+        os.close(fd)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _mark_running(job: Job, worker_id: str):
+    job.status = 'running'
+    job.started_at = job.heartbeat_at = timezone.now()
+    job.worker = worker_id
+    job.save(update_fields=['status', 'started_at', 'heartbeat_at', 'worker'])
+
+
+def claim_next_job(worker_id: str) -> Optional[Job]:
+    """Atomically take the oldest queued job, or return None if there is none"""
+    if connection.vendor == 'postgresql':
+        with transaction.atomic():
+            job = (
+                Job.objects
+                .select_for_update(skip_locked=True)
+                .filter(status='queued')
+                .order_by('created_at', 'id')
+                .first()
+            )
+            if job is None:
+                return None
+            _mark_running(job, worker_id)
+            return job
+
+    with _file_lock(_lock_path()):
+        job = Job.objects.filter(status='queued').order_by('created_at', 'id').first()
+        if job is None:
+            return None
+        # Conditional update guards against workers that bypass the lock file
+        now = timezone.now()
+        claimed = Job.objects.filter(pk=job.pk, status='queued').update(
+            status='running', started_at=now, heartbeat_at=now, worker=worker_id
+        )
+        if not claimed:
+            return None
+        job.refresh_from_db()
+        return job
+
+
+class _LeaseHandle:
+    def __init__(self, name: str, holder: str, ttl: int):
+        self.name = name
+        self.holder = holder
+        self.ttl = ttl
+        self.acquired = False
+
+    def acquire(self) -> bool:
+        now = timezone.now()
+        MaintenanceLease.objects.get_or_create(name=self.name)
+        # Conditional update: only one process can move an expired (or free) lease to itself
+        self.acquired = bool(
+            MaintenanceLease.objects.filter(name=self.name)
+            .filter(models.Q(expires_at__isnull=True) | models.Q(expires_at__lt=now))
+            .update(holder=self.holder, expires_at=now + timedelta(seconds=self.ttl))
+        )
+        return self.acquired
+
+    def renew(self):
+        """Push the expiry forward during long work; False if the lease was lost"""
+        return bool(MaintenanceLease.objects.filter(name=self.name, holder=self.holder).update(
+            expires_at=timezone.now() + timedelta(seconds=self.ttl)
+        ))
+
+    def release(self):
+        MaintenanceLease.objects.filter(name=self.name, holder=self.holder).update(holder='', expires_at=None)
+        self.acquired = False
+
+
+@contextmanager
+def maintenance_lease(name: str, ttl: int = 10 * 60):
+    """Hold the named lease across processes and hosts; yields a handle whose ``acquired`` says if we got it
+
+    A holder that dies without releasing loses the lease after ``ttl`` seconds.
+    """
+    handle = _LeaseHandle(name, f"{default_worker_id()}:{uuid.uuid4().hex[:8]}", ttl)
+    handle.acquire()
+    try:
+        yield handle
+    finally:
+        if handle.acquired:
+            handle.release()
+
+
+def fail_stale_jobs(max_age: Optional[int] = None) -> int:
+    """Mark jobs whose worker stopped sending heartbeats as failed; returns how many
+
+    A running job's heartbeat is refreshed at least every ``HEARTBEAT_INTERVAL``
+    seconds, so a long but healthy job is never judged stale.
+    """
+    max_age = max_age if max_age is not None else getattr(settings, 'JOB_STALE_SECONDS', 10 * 60)
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    stale = Job.objects.filter(status='running').filter(
+        models.Q(heartbeat_at__lt=cutoff) | models.Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+    )
+    # Failed rather than requeued: handlers such as notification blasts are not idempotent
+    count = stale.update(
+        status='failed',
+        finished_at=timezone.now(),
+        error=f'The worker running this job stopped before it finished (no heartbeat for {max_age} seconds).',
+    )
+    if count:
+        logger.warning(f"Marked {count} stale running jobs as failed")
+    return count
+
+
+# --- execution ---------------------------------------------------------------
+
+def _progress_reporter(job: Job) -> Callable:
+    last_write = [0.0]
+
+    def progress(done: int, total: Optional[int] = None, message: str = ''):
+        job.progress_done = done
+        if total is not None:
+            job.progress_total = total
+        if message:
+            job.progress_message = message[:255]
+        now = time.monotonic()
+        if now - last_write[0] >= PROGRESS_WRITE_INTERVAL or (total and done >= total):
+            last_write[0] = now
+            Job.objects.filter(pk=job.pk, status='running').update(
+                progress_done=job.progress_done,
+                progress_total=job.progress_total,
+                progress_message=job.progress_message,
+                heartbeat_at=timezone.now(),
+            )
+
+    return progress
+
+
+class _Heartbeat(threading.Thread):
+    """Refreshes ``heartbeat_at`` every ``HEARTBEAT_INTERVAL`` seconds for handlers that report no progress"""
+
+    def __init__(self, job: Job):
+        super().__init__(name=f'job-heartbeat-{job.pk}', daemon=True)
+        self.job_pk = job.pk
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(HEARTBEAT_INTERVAL):
+                try:
+                    Job.objects.filter(pk=self.job_pk, status='running').update(heartbeat_at=timezone.now())
+                except Exception as e:
+                    logger.warning(f"Heartbeat for job {self.job_pk} failed: {str(e)}")
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_job(job: Job) -> Job:
+    """Execute a claimed job and record its result or error
+
+    The result is only saved while the job is still 'running'; a job that
+    ``fail_stale_jobs`` already failed stays failed.
+    """
+    handler = get_handler(job.job_type)
+    heartbeat = _Heartbeat(job)
+    heartbeat.start()
+    try:
+        if handler is None:
+            raise ValueError(f'No handler registered for job type {job.job_type}')
+        result = handler(job, _progress_reporter(job)) or {}
+        job.status = 'completed'
+        job.result = result
+        if job.progress_total:
+            job.progress_done = job.progress_total
+    except Exception as e:
+        logger.error(f"Job {job.pk} ({job.job_type}) failed: {str(e)}", exc_info=True)
+        job.status = 'failed'
+        job.error = f"{str(e)}\n\n{traceback.format_exc()}"[:10000]
+    finally:
+        heartbeat.stop()
+    job.finished_at = timezone.now()
+    saved = Job.objects.filter(pk=job.pk, status='running').update(
+        status=job.status,
+        result=job.result,
+        error=job.error,
+        progress_done=job.progress_done,
+        progress_total=job.progress_total,
+        progress_message=job.progress_message,
+        finished_at=job.finished_at,
+    )
+    if not saved:
+        logger.warning(f"Job {job.pk} ({job.job_type}) was no longer running when it finished; keeping its recorded status")
+        job.refresh_from_db()
+    return job
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
@@ -0,0 +1,204 @@
+"""
+ActivityLog retention with compressed monthly archive segments.
+
+Expired rows (older than ``ACTIVITY_LOG_RETENTION_DAYS``) are moved out of the
+hot table in bounded primary-key chunks:
+
+1. read the next ``chunk_size`` expired rows after the last primary key seen,
+2. append them as JSON lines to ``activitylog-YYYY-MM.jsonl.gz`` in
+   ``ACTIVITY_LOG_ARCHIVE_DIR`` (one segment per local calendar month; each
+   append adds a gzip member, which ``gzip`` reads back as one stream),
+3. flush and fsync the segment, then delete exactly those primary keys.
+
+Each chunk commits on its own, so no long-running transaction or single huge
+``DELETE`` holds locks on the table. A crash between steps 2 and 3 can only
+duplicate rows in the archive, never lose them; readers skip duplicate ids.
+
+Every worker runs retention, so a run first takes the ``activity_log_retention``
+maintenance lease; a run that finds it held by another process returns at once
+(``skipped``) instead of appending to the same segments concurrently.
+
+``iter_archived_logs`` streams segments back with a generator so archived
+audit data stays searchable without being loaded into memory.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from auth_module.models import ActivityLog
+from E_Botar.services.jobs import maintenance_lease
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PATTERN = re.compile(r'^activitylog-(\d{4})-(\d{2})\.jsonl\.gz$')
+LEASE_NAME = 'activity_log_retention'
+ARCHIVE_FIELDS = (
+    'id', 'timestamp', 'user_id', 'user__username', 'action', 'description',
+    'ip_address', 'user_agent', 'additional_data',
+)
+
+
+def archive_dir() -> Path:
+    return Path(getattr(settings, 'ACTIVITY_LOG_ARCHIVE_DIR', Path(settings.BASE_DIR) / 'log_archive'))
+
+
+def segment_name(month: str) -> str:
+    return f'activitylog-{month}.jsonl.gz'
+
+
+def _month_of(timestamp) -> str:
+    return timezone.localtime(timestamp).strftime('%Y-%m')
+
+
+def _serialize(row: Dict) -> str:
+    record = dict(row)
+    record['username'] = record.pop('user__username')
+    return json.dumps(record, cls=DjangoJSONEncoder, separators=(',', ':'))
+
+
+@dataclass
+class RetentionResult:
+    cutoff: object
+    archived: int = 0
+    deleted: int = 0
+    chunks: int = 0
+    segments: tuple = ()
+    skipped: bool = False
+
+
+def _append_segments(directory: Path, rows: List[Dict]) -> List[str]:
+    by_month: Dict[str, List[str]] = {}
+    for row in rows:
+        by_month.setdefault(_month_of(row['timestamp']), []).append(_serialize(row))
+    for month, lines in by_month.items():
+        path = directory / segment_name(month)
+        with open(path, 'ab') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='ab') as segment:
+                segment.write(('\n'.join(lines) + '\n').encode('utf-8'))
+            raw.flush()
+            os.fsync(raw.fileno())
+    return list(by_month)
+
+
+def purge_expired_logs(days: Optional[int] = None, chunk_size: int = 1000, dry_run: bool = False,
+                       pause: float = 0.0, archive: bool = True) -> RetentionResult:
+    """Archive and delete ActivityLog rows older than ``days`` in primary-key chunks"""
+    if days is None:
+        days = getattr(settings, 'ACTIVITY_LOG_RETENTION_DAYS', 90)
+    cutoff = timezone.now() - timedelta(days=days)
+    result = RetentionResult(cutoff=cutoff)
+    expired = ActivityLog.objects.filter(timestamp__lt=cutoff)
+
+    if dry_run:
+        result.archived = expired.count()
+        result.segments = tuple(sorted({
+            _month_of(ts) for ts in expired.values_list('timestamp', flat=True).iterator(chunk_size=chunk_size)
+        }))
+        return result
+
+    with maintenance_lease(LEASE_NAME) as lease:
+        if not lease.acquired:
+            logger.info("Activity log retention is already running in another process; skipping")
+            result.skipped = True
+            return result
+
+        directory = archive_dir()
+        if archive:
+            directory.mkdir(parents=True, exist_ok=True)
+        segments = set()
+        last_pk = 0
+        while True:
+            rows = list(
+                expired.filter(pk__gt=last_pk).order_by('pk').values(*ARCHIVE_FIELDS)[:chunk_size]
+            )
+            if not rows:
+                break
+            if archive:
+                segments.update(_append_segments(directory, rows))
+                result.archived += len(rows)
+            pks = [row['id'] for row in rows]
+            deleted, _ = ActivityLog.objects.filter(pk__in=pks).delete()
+            result.deleted += deleted
+            result.chunks += 1
+            last_pk = pks[-1]
+            if not lease.renew():
+                # Another process took the lease over after ours expired; leave the rest to it
+                logger.warning(f"Lost the activity log retention lease after {result.chunks} chunks; stopping")
+                break
+            if pause:
+                time.sleep(pause)
+
+    result.segments = tuple(sorted(segments))
+    if result.deleted:
+        logger.info(f"Archived {result.archived} and deleted {result.deleted} activity logs older than {cutoff:%Y-%m-%d}")
+    return result
+
+
+# --- archive browser ----------------------------------------------------------
+
+def list_segments() -> List[Dict]:
+    """Archive segments, newest month first"""
+    directory = archive_dir()
+    if not directory.is_dir():
+        return []
+    segments = []
+    for entry in os.scandir(directory):
+        match = SEGMENT_PATTERN.match(entry.name)
+        if match and entry.is_file():
+            segments.append({
+                'month': f'{match.group(1)}-{match.group(2)}',
+                'path': entry.path,
+                'size': entry.stat().st_size,
+            })
+    return sorted(segments, key=lambda s: s['month'], reverse=True)
+
+
+def iter_archived_logs(month_from: Optional[str] = None, month_to: Optional[str] = None,
+                       action: Optional[str] = None, username: Optional[str] = None,
+                       search: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Yield archived entries newest segment first, filtered on the fly
+
+    ``month_from``/``month_to`` are inclusive ``YYYY-MM`` bounds and only
+    decide which segment files are opened. Within a segment entries come
+    back in archive (primary key) order.
+    """
+    search = search.lower() if search else None
+    for segment in list_segments():
+        if month_from and segment['month'] < month_from:
+            continue
+        if month_to and segment['month'] > month_to:
+            continue
+        seen = set()
+        try:
+            with gzip.open(segment['path'], 'rt', encoding='utf-8') as lines:
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if record['id'] in seen:
+                        continue
+                    seen.add(record['id'])
+                    if action and record['action'] != action:
+                        continue
+                    if username and record.get('username') != username:
+                        continue
+                    if search and search not in record['description'].lower():
+                        continue
+                    yield record
+        except (OSError, EOFError, ValueError) as e:
+            # A truncated segment (e.g. disk full during an append) still yields what precedes the damage
+            logger.error(f"Error reading activity log archive {segment['path']}: {str(e)}")
@@ -0,0 +1,165 @@
+"""
+Login throttling.
+
+``login_view`` asks ``check_login`` before calling ``authenticate`` so a
+brute-force or credential-stuffing burst is turned away without paying for a
+password hash. Two sliding windows are kept in the Django cache as
+per-second buckets (``login:<scope>:<key>:<epoch second>``, each expiring
+with its window):
+
+* **per IP** counts every login POST, rejected ones included, so a client
+  that keeps hammering stays blocked;
+* **per username** counts failed logins only, and is cleared by a
+  successful login.
+
+A window's total is one ``get_many`` over its buckets. When a window is full,
+the ``Retry-After`` delay is the time until enough of its oldest buckets
+expire.
+
+Every attempt is still recorded as an ``AccessAttempt``, but through a
+buffered writer that inserts them in batches (see ``BufferedActivityLogWriter``);
+failed attempts are added to the ``security.failed_logins`` counter per
+batch. Deployed environments configure a shared ``CACHES`` backend (see
+settings), so the limits hold across all workers.
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import transaction
+
+from E_Botar.services.counters import increment
+from E_Botar.services.security_settings import security_settings
+from E_Botar.utils.logging_utils import BufferedActivityLogWriter, get_client_ip
+from security_module.models import AccessAttempt
+
+
+@dataclass(frozen=True)
+class SlidingWindow:
+    """At most ``limit`` hits per ``window`` seconds for each key of ``scope``"""
+    scope: str
+    limit: int
+    window: int
+
+    def _bucket_key(self, key: str, second: int) -> str:
+        return f'login:{self.scope}:{key}:{second}'
+
+    def buckets(self, key: str, now: Optional[int] = None) -> List[Tuple[int, int]]:
+        """``(second, hits)`` of the non-empty buckets in the window, oldest first"""
+        now = int(time.time()) if now is None else now
+        seconds = range(now - self.window + 1, now + 1)
+        keys = {self._bucket_key(key, second): second for second in seconds}
+        found = cache.get_many(list(keys))
+        return sorted((keys[k], v) for k, v in found.items() if v)
+
+    def retry_after(self, key: str, now: Optional[int] = None) -> Optional[int]:
+        """Seconds until ``key`` may try again, or None if it is under the limit"""
+        now = int(time.time()) if now is None else now
+        buckets = self.buckets(key, now)
+        total = sum(hits for _, hits in buckets)
+        if total < self.limit:
+            return None
+        for second, hits in buckets:
+            total -= hits
+            if total < self.limit:
+                return max(1, second + self.window - now)
+        return self.window
+
+    def hit(self, key: str, now: Optional[int] = None):
+        now = int(time.time()) if now is None else now
+        bucket = self._bucket_key(key, now)
+        # add() is a no-op if the bucket exists, so concurrent hits are not lost
+        cache.add(bucket, 0, self.window + 1)
+        try:
+            cache.incr(bucket)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(bucket, 1, self.window + 1)
+
+    def reset(self, key: str, now: Optional[int] = None):
+        now = int(time.time()) if now is None else now
+        cache.delete_many([self._bucket_key(key, s) for s in range(now - self.window + 1, now + 1)])
+
+
+def ip_window() -> SlidingWindow:
+    return SlidingWindow('ip', settings.LOGIN_RATE_LIMIT_PER_IP, settings.LOGIN_RATE_WINDOW_PER_IP)
+
+
+def username_window() -> SlidingWindow:
+    # The "max login attempts" security setting overrides the deployment default
+    limit = security_settings.get_int('max_login_attempts', settings.LOGIN_RATE_LIMIT_PER_USERNAME)
+    return SlidingWindow('user', limit, settings.LOGIN_RATE_WINDOW_PER_USERNAME)
+
+
+def _username_key(username: str) -> str:
+    # Usernames (or emails) may contain characters some cache backends reject in keys
+    return hashlib.sha1(username.strip().lower().encode('utf-8')).hexdigest()
+
+
+def check_login(ip: Optional[str], username: str) -> Optional[int]:
+    """Count this attempt against ``ip`` and return a Retry-After delay if it must be rejected"""
+    retry = None
+    if ip:
+        window = ip_window()
+        retry = window.retry_after(ip)
+        window.hit(ip)
+    if username:
+        user_retry = username_window().retry_after(_username_key(username))
+        if user_retry is not None:
+            retry = max(retry or 0, user_retry)
+    return retry
+
+
+def login_result(username: str, success: bool):
+    """Update the username window after ``authenticate`` has run"""
+    if not username:
+        return
+    if success:
+        username_window().reset(_username_key(username))
+    else:
+        username_window().hit(_username_key(username))
+
+
+# --- AccessAttempt recording ---------------------------------------------------
+
+class AccessAttemptWriter(BufferedActivityLogWriter):
+    model = AccessAttempt
+    thread_name = 'access-attempt-writer'
+
+    def _written(self, batch):
+        # bulk_create skips post_save, which would otherwise keep this counter
+        increment('security.failed_logins', sum(1 for attempt in batch if not attempt.success))
+
+
+access_attempt_writer = AccessAttemptWriter(
+    max_size=getattr(settings, 'ACTIVITY_LOG_QUEUE_SIZE', 10000),
+    batch_size=getattr(settings, 'ACTIVITY_LOG_BATCH_SIZE', 200),
+    flush_interval=getattr(settings, 'ACTIVITY_LOG_FLUSH_INTERVAL_MS', 500) / 1000,
+)
+request_finished.connect(access_attempt_writer.request_finished, dispatch_uid='access_attempt_writer_drain')
+atexit.register(access_attempt_writer.flush)
+
+
+def record_attempt(request, username: str, user=None, success: bool = False):
+    """Queue an ``AccessAttempt`` for the batched writer"""
+    ip = get_client_ip(request)
+    if not ip or (not success and not security_settings.get_bool('log_failed_attempts')):
+        return
+    attempt = AccessAttempt(
+        user=user,
+        username=username[:150],
+        success=success,
+        ip_address=ip,
+        user_agent=request.META.get('HTTP_USER_AGENT', ''),
+    )
+    if getattr(settings, 'ACTIVITY_LOG_BUFFERED', True):
+        transaction.on_commit(lambda: access_attempt_writer.enqueue(attempt))
+    else:
+        access_attempt_writer._write([attempt])
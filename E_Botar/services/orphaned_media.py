@@ -0,0 +1,237 @@
+"""
+Reconcile ``MEDIA_ROOT`` against the files the database still references.
+
+Uploads outlive their rows: deleted candidates, rejected applications and
+replaced avatars leave files in ``candidate_photos/``, ``party_logos/`` and
+``profile_photos/``, and replaced uploads leave resized copies under
+``variants/``. ``reconcile_media``:
+
+1. streams every referenced name from each model ``FileField``/``ImageField``
+   (and the ``<field>_variants`` JSON of ``image_variants``) with
+   ``values_list(...).iterator()`` into one set,
+2. walks those upload directories with ``os.scandir``, one directory per
+   task in a thread pool (directory listing and ``stat`` are I/O bound),
+3. reports, quarantines or deletes unreferenced files in batches, checking
+   each batch against the database again first.
+
+Files modified within ``min_age`` seconds are left alone, since an upload
+may already be on disk before the row that references it commits.
+Quarantine moves files to ``ORPHANED_MEDIA_QUARANTINE_DIR/<timestamp>/``
+with their relative paths kept, outside the publicly served media tree, so
+they can be restored by moving them back. The walk needs local filesystem
+media storage.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import posixpath
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Set, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from E_Botar.services.image_variants import FORMATS, TRACKED_FIELDS, VARIANTS_DIR, variants_attr
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+DEFAULT_MIN_AGE = 60 * 60
+SAMPLE_SIZE = 20
+
+
+@dataclass
+class ReconcileResult:
+    dry_run: bool
+    action: str
+    referenced: int = 0
+    scanned: int = 0
+    orphaned: int = 0
+    orphaned_bytes: int = 0
+    reclaimed: int = 0
+    reclaimed_bytes: int = 0
+    skipped_recent: int = 0
+    batches: int = 0
+    errors: List[str] = field(default_factory=list)
+    sample: List[str] = field(default_factory=list)
+    quarantine_dir: Optional[str] = None
+
+
+def quarantine_root() -> Path:
+    return Path(getattr(settings, 'ORPHANED_MEDIA_QUARANTINE_DIR', Path(settings.BASE_DIR) / 'orphaned_media'))
+
+
+def _file_fields():
+    for model in apps.get_models():
+        for model_field in model._meta.get_fields():
+            if isinstance(model_field, models.FileField):
+                yield model, model_field
+
+
+def upload_dirs() -> Set[str]:
+    """Top-level media directories that hold model uploads, plus the variants tree"""
+    dirs = {VARIANTS_DIR}
+    for _, model_field in _file_fields():
+        upload_to = model_field.upload_to
+        if isinstance(upload_to, str) and upload_to.strip('/'):
+            dirs.add(upload_to.strip('/').split('/')[0])
+    return dirs
+
+
+def referenced_names() -> Set[str]:
+    """Every media name stored in a file field or an image variants map"""
+    names: Set[str] = set()
+    for model, model_field in _file_fields():
+        queryset = model._default_manager.exclude(**{model_field.name: ''}).exclude(**{f'{model_field.name}__isnull': True})
+        names.update(queryset.values_list(model_field.name, flat=True).iterator())
+    for label, field_name in TRACKED_FIELDS.items():
+        model = apps.get_model(label)
+        for variants in model._default_manager.values_list(variants_attr(field_name), flat=True).iterator():
+            names.update(_variant_names(variants))
+    return {name.replace(os.sep, '/') for name in names}
+
+
+def _variant_names(variants) -> Iterator[str]:
+    for entry in (variants or {}).values():
+        if isinstance(entry, dict):
+            yield from (entry[fmt] for fmt in FORMATS if entry.get(fmt))
+
+
+def still_referenced(names: Set[str]) -> Set[str]:
+    """The subset of ``names`` some row references right now
+
+    Variant files are named after the hash of their source, so a name that
+    was unreferenced when the scan started is referenced again as soon as an
+    identical image is uploaded; this re-reads just the rows that could hold
+    ``names``.
+    """
+    found: Set[str] = set()
+    for model, model_field in _file_fields():
+        found.update(
+            model._default_manager.filter(**{f'{model_field.name}__in': names})
+            .values_list(model_field.name, flat=True)
+        )
+    digests = {
+        posixpath.basename(name).split('-', 1)[0]
+        for name in names if name.startswith(f'{VARIANTS_DIR}/')
+    }
+    if digests:
+        for label, field_name in TRACKED_FIELDS.items():
+            model = apps.get_model(label)
+            attr = variants_attr(field_name)
+            for variants in model._default_manager.filter(**{f'{attr}__hash__in': digests}).values_list(attr, flat=True):
+                found.update(_variant_names(variants))
+    return {name.replace(os.sep, '/') for name in found} & names
+
+
+def _scan_dir(path: str) -> Tuple[List[Tuple[str, int, float]], List[str], List[str]]:
+    """(files as (path, size, mtime), subdirectories, errors) of one directory"""
+    files, subdirs, errors = [], [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        files.append((entry.path, stat.st_size, stat.st_mtime))
+                except OSError as e:
+                    errors.append(f'{entry.path}: {e}')
+    except OSError as e:
+        errors.append(f'{path}: {e}')
+    return files, subdirs, errors
+
+
+def walk_media(roots, workers: int, errors: List[str]) -> Iterator[Tuple[str, int, float]]:
+    """Yield every file under ``roots``, listing directories concurrently"""
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='media-scan') as pool:
+        pending = {pool.submit(_scan_dir, str(root)) for root in roots if os.path.isdir(root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs, scan_errors = future.result()
+                errors.extend(scan_errors)
+                pending.update(pool.submit(_scan_dir, subdir) for subdir in subdirs)
+                yield from files
+
+
+def _apply(batch, media_root: Path, target: Optional[Path], result: ReconcileResult):
+    # The referenced set was read before the walk; rows saved since may point at these files again
+    names = {Path(path).relative_to(media_root).as_posix(): (path, size) for path, size in batch}
+    for name in still_referenced(set(names)):
+        path, size = names.pop(name)
+        result.orphaned -= 1
+        result.orphaned_bytes -= size
+        if name in result.sample:
+            result.sample.remove(name)
+    for path, size in names.values():
+        try:
+            if target is None:
+                os.remove(path)
+            else:
+                destination = target / Path(path).relative_to(media_root)
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, destination)
+        except OSError as e:
+            result.errors.append(f'{path}: {e}')
+            continue
+        result.reclaimed += 1
+        result.reclaimed_bytes += size
+    result.batches += 1
+
+
+def reconcile_media(
+    dry_run: bool = True,
+    quarantine: bool = True,
+    min_age: int = DEFAULT_MIN_AGE,
+    batch_size: int = BATCH_SIZE,
+    workers: Optional[int] = None,
+) -> ReconcileResult:
+    """Find media files no row references; quarantine (default) or delete them unless ``dry_run``"""
+    media_root = Path(settings.MEDIA_ROOT)
+    result = ReconcileResult(dry_run=dry_run, action='quarantine' if quarantine else 'delete')
+    referenced = referenced_names()
+    result.referenced = len(referenced)
+
+    target = None
+    if quarantine and not dry_run:
+        target = quarantine_root() / timezone.now().strftime('%Y%m%d-%H%M%S')
+        result.quarantine_dir = str(target)
+
+    workers = workers or getattr(settings, 'ORPHANED_MEDIA_SCAN_WORKERS', 8)
+    cutoff = time.time() - min_age
+    batch = []
+    roots = [media_root / name for name in sorted(upload_dirs())]
+    for path, size, mtime in walk_media(roots, workers, result.errors):
+        result.scanned += 1
+        name = Path(path).relative_to(media_root).as_posix()
+        if name in referenced:
+            continue
+        if mtime > cutoff:
+            result.skipped_recent += 1
+            continue
+        result.orphaned += 1
+        result.orphaned_bytes += size
+        if len(result.sample) < SAMPLE_SIZE:
+            result.sample.append(name)
+        if not dry_run:
+            batch.append((path, size))
+            if len(batch) >= batch_size:
+                _apply(batch, media_root, target, result)
+                batch = []
+    if batch:
+        _apply(batch, media_root, target, result)
+
+    if not dry_run:
+        logger.info(
+            f"Orphaned media: {result.action}d {result.reclaimed} of {result.orphaned} files "
+            f"({result.reclaimed_bytes} bytes)"
+        )
+    return result
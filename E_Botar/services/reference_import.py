@@ -0,0 +1,174 @@
+"""
+Bulk upsert engine for reference data (departments and courses) CSV imports.
+
+An import is planned before anything is written:
+
+1. the whole file is parsed and every row validated in memory against one
+   prefetch of the existing rows (required fields, unknown departments,
+   duplicate keys within the file, names already used by another row),
+2. each valid row is classified as *created*, *updated* (with the changed
+   fields) or *unchanged*; the resulting ``ImportPlan`` is the diff preview
+   shown to the admin,
+3. ``apply_plan`` writes all creates and updates with a single
+   ``bulk_create(update_conflicts=True)`` inside one transaction.
+
+Rows with errors are reported and skipped; the rest of the file is applied.
+"""
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from django.db import transaction
+
+from auth_module.models import Course, Department
+
+DEPARTMENT_FIELDS = ('name', 'description')
+COURSE_FIELDS = ('name', 'description')
+
+
+@dataclass
+class RowChange:
+    row: int
+    key: str
+    values: Dict[str, str]
+    # field -> (old, new), only for updates
+    changes: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+
+@dataclass
+class ImportPlan:
+    kind: str
+    created: List[RowChange] = field(default_factory=list)
+    updated: List[RowChange] = field(default_factory=list)
+    unchanged: List[RowChange] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    # Unsaved model instances for bulk_create, creates and updates alike
+    objects: List = field(default_factory=list)
+
+    @property
+    def has_changes(self):
+        return bool(self.created or self.updated)
+
+    def summary(self):
+        return {
+            'created': len(self.created),
+            'updated': len(self.updated),
+            'unchanged': len(self.unchanged),
+            'errors': len(self.errors),
+        }
+
+
+def _read_rows(text: str) -> List[List[str]]:
+    rows = csv.reader(text.splitlines(), delimiter=',')
+    next(rows, None)  # Skip header row
+    return [[cell.strip() for cell in row] for row in rows]
+
+
+def _classify(plan: ImportPlan, row_num: int, key: str, values: Dict[str, str], existing, fields):
+    if existing is None:
+        plan.created.append(RowChange(row_num, key, values))
+        return True
+    changes = {f: (getattr(existing, f), values[f]) for f in fields if getattr(existing, f) != values[f]}
+    if changes:
+        plan.updated.append(RowChange(row_num, key, values, changes))
+        return True
+    plan.unchanged.append(RowChange(row_num, key, values))
+    return False
+
+
+def plan_department_import(text: str) -> ImportPlan:
+    """Rows of ``name, code, description``; departments are matched by code"""
+    plan = ImportPlan(kind='department')
+    existing = list(Department.objects.all())
+    by_code = {d.code: d for d in existing}
+    code_by_name = {d.name.lower(): d.code for d in existing}
+    seen_codes = {}
+    seen_names = {}
+
+    for index, row in enumerate(_read_rows(text), start=1):
+        row_num = index + 1
+        if len(row) < 3:
+            plan.errors.append(f'Row {row_num}: Insufficient columns')
+            continue
+        name, code, description = row[0], row[1].upper(), row[2]
+        if not name or not code:
+            plan.errors.append(f'Row {row_num}: Missing name or code')
+            continue
+        if code in seen_codes:
+            plan.errors.append(f'Row {row_num}: Duplicate code "{code}" (first seen on row {seen_codes[code]})')
+            continue
+        if name.lower() in seen_names:
+            plan.errors.append(f'Row {row_num}: Duplicate name "{name}" (first seen on row {seen_names[name.lower()]})')
+            continue
+        owner = code_by_name.get(name.lower())
+        if owner is not None and owner != code:
+            plan.errors.append(f'Row {row_num}: Name "{name}" is already used by department {owner}')
+            continue
+        seen_codes[code] = row_num
+        seen_names[name.lower()] = row_num
+
+        values = {'name': name, 'description': description}
+        if _classify(plan, row_num, code, values, by_code.get(code), DEPARTMENT_FIELDS):
+            plan.objects.append(Department(code=code, **values))
+    return plan
+
+
+def plan_course_import(text: str) -> ImportPlan:
+    """Rows of ``name, code, department_code, description``; courses are matched by (department, code)"""
+    plan = ImportPlan(kind='course')
+    departments = {d.code: d for d in Department.objects.all()}
+    by_key = {(c.department_id, c.code): c for c in Course.objects.all()}
+    seen = {}
+
+    for index, row in enumerate(_read_rows(text), start=1):
+        row_num = index + 1
+        if len(row) < 4:
+            plan.errors.append(f'Row {row_num}: Insufficient columns')
+            continue
+        name, code, dept_code, description = row[0], row[1].upper(), row[2].upper(), row[3]
+        if not name or not code or not dept_code:
+            plan.errors.append(f'Row {row_num}: Missing name, code, or department code')
+            continue
+        department = departments.get(dept_code)
+        if department is None:
+            plan.errors.append(f'Row {row_num}: Department with code "{dept_code}" not found')
+            continue
+        if (dept_code, code) in seen:
+            plan.errors.append(f'Row {row_num}: Duplicate course "{code}" in {dept_code} (first seen on row {seen[(dept_code, code)]})')
+            continue
+        seen[(dept_code, code)] = row_num
+
+        values = {'name': name, 'description': description}
+        if _classify(plan, row_num, f'{dept_code}/{code}', values, by_key.get((department.pk, code)), COURSE_FIELDS):
+            plan.objects.append(Course(department=department, code=code, **values))
+    return plan
+
+
+PLANNERS = {
+    'department': plan_department_import,
+    'course': plan_course_import,
+}
+
+
+def plan_import(kind: str, text: str) -> ImportPlan:
+    return PLANNERS[kind](text)
+
+
+def apply_plan(plan: ImportPlan) -> ImportPlan:
+    """Write every create and update of ``plan`` in one upsert statement and transaction"""
+    if not plan.objects:
+        return plan
+    if plan.kind == 'department':
+        model, unique_fields, update_fields = Department, ['code'], list(DEPARTMENT_FIELDS)
+    else:
+        model, unique_fields, update_fields = Course, ['department', 'code'], list(COURSE_FIELDS)
+    with transaction.atomic():
+        model.objects.bulk_create(
+            plan.objects,
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=update_fields + ['updated_at'],
+        )
+    return plan
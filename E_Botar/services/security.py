@@ -89,31 +89,168 @@ def validate_vote_integrity(vote_data: dict) -> bool:
 
 
 # --- Security module helpers (used by security_module) ---
-def check_security_threats() -> list[dict]:
-    """Lightweight placeholder threat checks.
-    Returns a list of detected threat summaries. Replace with real logic as needed.
+def check_security_threats(hours: int = 24) -> list[dict]:
+    """Unresolved alerts raised in the last ``hours`` hours, newest first.
+    
+    Read-only: the anomaly detector that raises the alerts runs in the
+    ``run_jobs`` worker every ``SECURITY_DETECTOR_INTERVAL`` seconds, not in
+    the request.
     """
-    return []
+    from datetime import timedelta
+    from django.utils import timezone
+    from security_module.models import SecurityAlert
+    
+    alerts = SecurityAlert.objects.filter(
+        is_resolved=False,
+        alert_type__in=['threat_detected', 'anomaly_detected'],
+        created_at__gte=timezone.now() - timedelta(hours=hours),
+    ).order_by('-created_at')[:50]
+    return [
+        {
+            'id': alert.id,
+            'type': alert.alert_type,
+            'title': alert.title,
+            'description': alert.description,
+            'severity': alert.severity,
+            'created_at': alert.created_at,
+        }
+        for alert in alerts
+    ]
+
+
+REPORT_TOP_N = 10
 
 
 def generate_security_report(events, attempts) -> dict:
-    """Generate a simple security report structure for rendering."""
-    try:
-        total_events = events.count() if hasattr(events, 'count') else len(events)
-        total_attempts = attempts.count() if hasattr(attempts, 'count') else len(attempts)
-    except Exception:
-        total_events = 0
-        total_attempts = 0
+    """Aggregate a security report from ``SecurityEvent`` and ``AccessAttempt`` querysets.
+
+    Each table is read with a single grouped query (events by severity, type,
+    IP and user; attempts by hour, outcome, IP and username) and every
+    breakdown is folded from those rows in Python.
+    """
+    from collections import Counter, defaultdict
+    from django.db.models import Count
+    from django.db.models.functions import TruncHour
+    from security_module.models import SecurityEvent
+    
+    event_rows = (
+        events.order_by()
+        .values('severity', 'event_type', 'ip_address', 'user__username')
+        .annotate(n=Count('id'))
+    )
+    attempt_rows = (
+        attempts.order_by()
+        .annotate(hour=TruncHour('timestamp'))
+        .values('hour', 'success', 'ip_address', 'username')
+        .annotate(n=Count('id'))
+    )
+    
+    by_severity = Counter()
+    by_event_type = Counter()
+    ip_stats = defaultdict(Counter)
+    user_stats = defaultdict(Counter)
+    for row in event_rows:
+        n = row['n']
+        by_severity[row['severity']] += n
+        by_event_type[row['event_type']] += n
+        if row['ip_address']:
+            ip_stats[row['ip_address']]['events'] += n
+        if row['user__username']:
+            user_stats[row['user__username']]['events'] += n
+            if row['severity'] in ('high', 'critical'):
+                user_stats[row['user__username']]['high_severity'] += n
+    
+    hourly = defaultdict(Counter)
+    failed = successful = 0
+    for row in attempt_rows:
+        n = row['n']
+        outcome = 'successful' if row['success'] else 'failed'
+        if row['success']:
+            successful += n
+        else:
+            failed += n
+        hourly[row['hour']][outcome] += n
+        ip_stats[row['ip_address']][f'{outcome}_attempts'] += n
+        if row['username']:
+            user_stats[row['username']][f'{outcome}_attempts'] += n
+    
+    def _rank(stats):
+        return stats['failed_attempts'] * 2 + stats['events'] + stats['successful_attempts']
+    
+    top_ips = sorted(ip_stats.items(), key=lambda item: _rank(item[1]), reverse=True)[:REPORT_TOP_N]
+    top_users = sorted(user_stats.items(), key=lambda item: _rank(item[1]), reverse=True)[:REPORT_TOP_N * 2]
     return {
         'summary': {
-            'total_events': total_events,
-            'total_access_attempts': total_attempts,
+            'total_events': sum(by_severity.values()),
+            'total_access_attempts': failed + successful,
+            'failed_attempts': failed,
+            'successful_attempts': successful,
+            'unique_ips': len(ip_stats),
         },
-        'by_severity': {},
-        'top_ip_addresses': [],
+        'by_severity': {key: by_severity[key] for key, _ in SecurityEvent.SEVERITY_CHOICES},
+        'by_event_type': dict(by_event_type.most_common()),
+        'top_ip_addresses': [
+            {
+                'ip_address': ip,
+                'events': stats['events'],
+                'failed_attempts': stats['failed_attempts'],
+                'successful_attempts': stats['successful_attempts'],
+            }
+            for ip, stats in top_ips
+        ],
+        'hourly_failures': [
+            {'hour': hour, 'failed': hourly[hour]['failed'], 'successful': hourly[hour]['successful']}
+            for hour in sorted(hourly)
+        ],
+        'users': [
+            {
+                'username': username,
+                'events': stats['events'],
+                'high_severity_events': stats['high_severity'],
+                'failed_attempts': stats['failed_attempts'],
+                'successful_attempts': stats['successful_attempts'],
+            }
+            for username, stats in top_users
+        ],
     }
 
 
+def security_report_for_range(date_from=None, date_to=None) -> dict:
+    """``generate_security_report`` over local calendar dates ``date_from``..``date_to``.
+
+    A range that ended long enough ago can no longer change, so its report is
+    cached without expiry. Access attempts are timestamped when queued and
+    written by ``AccessAttemptWriter`` up to one flush interval later, so a
+    range only counts as closed once that interval plus
+    ``SECURITY_REPORT_CACHE_MARGIN`` seconds have passed since its end.
+    Open-ended or recent ranges are always computed.
+    """
+    from datetime import timedelta
+    from django.core.cache import cache
+    from django.utils import timezone
+    from E_Botar.services.login_throttle import access_attempt_writer
+    from E_Botar.utils.helpers import date_range_filter, local_date_bounds
+    from security_module.models import AccessAttempt, SecurityEvent
+    
+    start, end = local_date_bounds(date_from, date_to)
+    margin = getattr(settings, 'SECURITY_REPORT_CACHE_MARGIN', 60)
+    settle = timedelta(seconds=access_attempt_writer.flush_interval + margin)
+    cache_key = None
+    if start and end and end < timezone.now() - settle:
+        cache_key = f'security_report:{start.isoformat()}:{end.isoformat()}'
+        report = cache.get(cache_key)
+        if report is not None:
+            return report
+    
+    report = generate_security_report(
+        SecurityEvent.objects.filter(date_range_filter('created_at', date_from, date_to)),
+        AccessAttempt.objects.filter(date_range_filter('timestamp', date_from, date_to)),
+    )
+    if cache_key:
+        cache.set(cache_key, report, None)
+    return report
+
+
 def secure_file_upload(file, allowed_extensions=None, max_size=None):
     """Secure file upload validation"""
     if allowed_extensions is None:
@@ -0,0 +1,129 @@
+"""
+Typed, process-local registry of ``SecuritySettings`` rows.
+
+``SecuritySettings`` is a name/value text table. Code on the request path
+(login throttling, session expiry) reads it through ``security_settings``,
+which holds every row parsed into its declared type in a read-only mapping.
+The mapping is reloaded with one query only when the version stored in the
+cache changes (``bump_security_settings_version`` runs after a row is saved
+or deleted) or, for workers that do not share a cache backend, once it is
+``SECURITY_SETTINGS_MAX_AGE`` seconds old. Reads otherwise never touch the
+database.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'security:settings_version'
+
+_MISSING = object()
+
+
+def _parse_bool(value: str) -> bool:
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+# name -> (type, default, description); defaults of None fall back to the caller's default
+DEFINITIONS: Dict[str, tuple] = {
+    'max_login_attempts': (int, None, 'Maximum failed logins per username before it is throttled'),
+    'session_timeout': (int, None, 'Session timeout in minutes'),
+    'require_strong_password': (bool, True, 'Require strong passwords'),
+    'enable_two_factor': (bool, False, 'Enable two-factor authentication'),
+    'log_failed_attempts': (bool, True, 'Log failed login attempts'),
+    'block_suspicious_ips': (bool, False, 'Automatically block suspicious IP addresses'),
+}
+
+PARSERS = {int: int, bool: _parse_bool, str: str}
+
+
+def parse_settings(rows) -> Mapping[str, Any]:
+    """Read-only mapping of ``(name, value)`` rows, typed per ``DEFINITIONS``"""
+    values = {}
+    for name, raw in rows:
+        kind = DEFINITIONS.get(name, (str,))[0]
+        try:
+            values[name] = PARSERS[kind](raw)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring invalid security setting {name}={raw!r}")
+    return MappingProxyType(values)
+
+
+def bump_security_settings_version():
+    """Make every process reload the registry on its next read"""
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+class SecuritySettingsRegistry:
+    """Snapshot of all ``SecuritySettings`` rows, reloaded when the version changes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = None
+        self._version = None
+        self._loaded_at = 0.0
+
+    @property
+    def max_age(self):
+        return getattr(settings, 'SECURITY_SETTINGS_MAX_AGE', 60)
+
+    def _stale(self, version) -> bool:
+        return self._values is None or version != self._version or time.monotonic() - self._loaded_at >= self.max_age
+
+    def snapshot(self) -> Mapping[str, Any]:
+        version = cache.get(VERSION_KEY)
+        if self._stale(version):
+            with self._lock:
+                if self._stale(version):
+                    from security_module.models import SecuritySettings
+
+                    self._values = parse_settings(SecuritySettings.objects.values_list('name', 'value'))
+                    self._version = version
+                    self._loaded_at = time.monotonic()
+        return self._values
+
+    def invalidate(self):
+        self._values = None
+
+    def get(self, name: str, default: Any = _MISSING) -> Any:
+        """Stored value, else ``default``, else the declared default"""
+        values = self.snapshot()
+        if name in values:
+            return values[name]
+        if default is not _MISSING:
+            return default
+        return DEFINITIONS.get(name, (None, None))[1]
+
+    def get_int(self, name: str, default: Any = _MISSING) -> int:
+        value = self.get(name, default)
+        return int(value) if value is not None else None
+
+    def get_bool(self, name: str, default: Any = _MISSING) -> bool:
+        return bool(self.get(name, default))
+
+    def get_str(self, name: str, default: Any = _MISSING) -> str:
+        value = self.get(name, default)
+        return '' if value is None else str(value)
+
+
+security_settings = SecuritySettingsRegistry()
+
+
+def save_security_settings(values: Dict[str, Any]):
+    """Store ``values`` (name -> typed value); the post_save signal bumps the version"""
+    from security_module.models import SecuritySettings
+
+    for name, value in values.items():
+        stored = ('true' if value else 'false') if isinstance(value, bool) else str(value)
+        description = DEFINITIONS.get(name, (None, None, ''))[2]
+        SecuritySettings.objects.update_or_create(
+            name=name, defaults={'value': stored, 'description': description}
+        )
@@ -0,0 +1,104 @@
+"""
+Block-allocated student ID sequence.
+
+Each year has a StudentIdSequence row. A reservation atomically advances the
+row's counter by a whole block, so concurrent processes never receive the
+same suffix. Reserved suffixes are kept in a process-local buffer and handed
+out without touching the database until the block runs out. Suffixes left in
+a buffer when a process exits are simply skipped (gaps are harmless).
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from auth_module.models import StudentIdSequence, UserProfile
+
+# Suffixes reserved per round trip for single registrations
+DEFAULT_BLOCK_SIZE = 20
+
+
+def format_student_id(year: int, suffix: int) -> str:
+    return f"{str(year).zfill(4)}-{suffix}"
+
+
+def reserve_block(year: int, size: int) -> List[str]:
+    """Advance the year's counter by ``size`` and return the free IDs in that block.
+
+    IDs inside the block that already exist (legacy random IDs, manual entries)
+    are dropped with a single lookup, so the result may be shorter than ``size``.
+    """
+    with transaction.atomic():
+        sequence, _ = (
+            StudentIdSequence.objects
+            .select_for_update()
+            .get_or_create(year=year)
+        )
+        start = sequence.next_value
+        if start > StudentIdSequence.LAST_VALUE:
+            raise ValidationError(f'Student ID space for {year} is exhausted.')
+        end = min(start + size, StudentIdSequence.LAST_VALUE + 1)
+        sequence.next_value = end
+        sequence.save(update_fields=['next_value', 'updated_at'])
+
+    block = [format_student_id(year, n) for n in range(start, end)]
+    taken = set(
+        UserProfile.objects
+        .filter(student_id__in=block)
+        .values_list('student_id', flat=True)
+    )
+    return [sid for sid in block if sid not in taken]
+
+
+class StudentIdAllocator:
+    """Process-local buffer of reserved student IDs, one queue per year"""
+
+    def __init__(self, block_size=DEFAULT_BLOCK_SIZE):
+        self.block_size = block_size
+        self._buffers: Dict[int, Deque[str]] = {}
+        self._lock = threading.Lock()
+
+    def allocate(self, count: int, year=None) -> List[str]:
+        """Return ``count`` unique student IDs for ``year`` (defaults to this year)"""
+        if year is None:
+            year = datetime.now().year
+        with self._lock:
+            buffer = self._buffers.setdefault(year, deque())
+            ids = [buffer.popleft() for _ in range(min(count, len(buffer)))]
+
+        fresh: List[str] = []
+        while len(ids) + len(fresh) < count:
+            # Reserve everything still needed in one go (bulk imports), or a
+            # regular block for single registrations
+            needed = count - len(ids) - len(fresh)
+            fresh.extend(reserve_block(year, max(needed, self.block_size)))
+        needed = count - len(ids)
+        ids.extend(fresh[:needed])
+
+        leftover = fresh[needed:]
+        if leftover:
+            # Only buffer the remainder once the reservation is durable; if an
+            # enclosing transaction rolls back, the counter rewinds and these
+            # IDs may be handed out again elsewhere.
+            transaction.on_commit(lambda: self._release(year, leftover))
+        return ids
+
+    def _release(self, year, ids):
+        with self._lock:
+            self._buffers.setdefault(year, deque()).extend(ids)
+
+    def next_id(self, year=None) -> str:
+        return self.allocate(1, year)[0]
+
+    def reset(self):
+        """Drop all buffered IDs (used by tests and after database resets)"""
+        with self._lock:
+            self._buffers.clear()
+
+
+student_id_allocator = StudentIdAllocator()
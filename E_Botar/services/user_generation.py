@@ -0,0 +1,221 @@
+"""
+Bulk user generation service.
+
+Generates large cohorts of demo/test accounts without per-user queries:
+existing usernames are prefetched into a set and new ones are made unique in
+memory, student IDs come from the block allocator, and users/profiles are
+written with ``bulk_create`` in fixed-size batches, each inside its own
+transaction.
+"""
+from __future__ import annotations
+
+import logging
+import random
+from typing import Callable, Dict, List, Optional
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+
+from auth_module.models import UserProfile
+from E_Botar.services.counters import increment
+from E_Botar.services.student_ids import student_id_allocator
+from E_Botar.services.user_search import index_users
+
+logger = logging.getLogger(__name__)
+
+# Hard upper bound for a single generation request
+BULK_USER_MAX = 100_000
+# Requests up to this size are generated inside the HTTP request; larger ones
+# are queued as a background job (see E_Botar.services.jobs)
+BULK_USER_SYNC_LIMIT = 100
+# Rows written per bulk_create / transaction
+BULK_USER_BATCH_SIZE = 1000
+# Number of generated users kept for the results page
+BULK_USER_PREVIEW_SIZE = 100
+
+FIRST_NAMES = [
+    'John', 'Jane', 'Michael', 'Sarah', 'David', 'Emily', 'James', 'Jessica', 'Robert', 'Ashley',
+    'William', 'Amanda', 'Richard', 'Jennifer', 'Charles', 'Lisa', 'Joseph', 'Nancy', 'Thomas', 'Karen',
+    'Christopher', 'Betty', 'Daniel', 'Helen', 'Matthew', 'Sandra', 'Anthony', 'Donna', 'Mark', 'Carol',
+    'Donald', 'Ruth', 'Steven', 'Sharon', 'Paul', 'Michelle', 'Andrew', 'Laura', 'Joshua', 'Sarah',
+    'Kenneth', 'Kimberly', 'Kevin', 'Deborah', 'Brian', 'Dorothy', 'George', 'Lisa', 'Timothy', 'Nancy',
+]
+
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+    'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin',
+    'Lee', 'Perez', 'Thompson', 'White', 'Harris', 'Sanchez', 'Clark', 'Ramirez', 'Lewis', 'Robinson',
+    'Walker', 'Young', 'Allen', 'King', 'Wright', 'Scott', 'Torres', 'Nguyen', 'Hill', 'Flores',
+    'Green', 'Adams', 'Nelson', 'Baker', 'Hall', 'Rivera', 'Campbell', 'Mitchell', 'Carter', 'Roberts', 'Gomez',
+]
+
+
+def year_level_label(year_level: str) -> str:
+    """Turn a year number ('1'..'5') into the display label stored on profiles"""
+    suffix = {'1': 'st', '2': 'nd', '3': 'rd'}.get(str(year_level), 'th')
+    return f"{year_level}{suffix} Year"
+
+
+class BulkUserGenerator:
+    """Generate verified user accounts with profiles in bulk.
+
+    All users share one password, so it is hashed once up front instead of
+    running the password hasher for every account. Background jobs pass the
+    already hashed ``password_hash`` so the plain password is never queued.
+    """
+
+    def __init__(self, count, password=None, department=None, course=None, year_level='1',
+                 departments=None, courses=None, randomize_department=False,
+                 randomize_course=False, year_level_distribution=None,
+                 batch_size=BULK_USER_BATCH_SIZE, password_hash=None):
+        if count < 1 or count > BULK_USER_MAX:
+            raise ValueError(f'Count must be between 1 and {BULK_USER_MAX:,}.')
+        self.count = count
+        self.password = password
+        self.password_hash = password_hash
+        self.department = department
+        self.course = course
+        self.year_level = year_level
+        self.departments = list(departments or [])
+        self.courses = list(courses or [])
+        self.randomize_department = randomize_department
+        self.randomize_course = randomize_course
+        self.year_level_distribution = year_level_distribution
+        self.batch_size = batch_size
+
+        self._courses_by_department: Dict[int, list] = {}
+        for c in self.courses:
+            self._courses_by_department.setdefault(c.department_id, []).append(c)
+        self._suffix_counters: Dict[str, int] = {}
+        self._taken_usernames: set = set()
+
+    # --- attribute selection -------------------------------------------------
+
+    def _select_department(self):
+        if self.randomize_department and self.departments:
+            return random.choice(self.departments)
+        return self.department
+
+    def _select_course(self, selected_dept=None):
+        if self.randomize_course and self.courses:
+            if selected_dept:
+                dept_courses = self._courses_by_department.get(selected_dept.id)
+                if dept_courses:
+                    return random.choice(dept_courses)
+            return random.choice(self.courses)
+        return self.course
+
+    def _select_year_level(self):
+        if not self.year_level_distribution:
+            return self.year_level
+        rand_num = random.randint(1, 100)
+        cumulative = 0
+        for year, percentage in self.year_level_distribution.items():
+            cumulative += percentage
+            if rand_num <= cumulative:
+                return year
+        return '1'  # Fallback
+
+    # --- in-memory uniqueness ------------------------------------------------
+
+    def _load_existing(self):
+        """Prefetch taken usernames so uniqueness can be checked in memory"""
+        self._taken_usernames = set(User.objects.values_list('username', flat=True))
+
+    def _unique_username(self, first_name, last_name):
+        original = f"{first_name.lower()}.{last_name.lower()}{random.randint(10, 99)}"
+        username = original
+        counter = self._suffix_counters.get(original, 1)
+        while username in self._taken_usernames:
+            username = f"{original}{counter}"
+            counter += 1
+        self._suffix_counters[original] = counter
+        self._taken_usernames.add(username)
+        return username
+
+    def _build_batch(self, size, password_hash):
+        users, profiles = [], []
+        student_ids = student_id_allocator.allocate(size)
+        for student_id in student_ids:
+            first_name = random.choice(FIRST_NAMES)
+            last_name = random.choice(LAST_NAMES)
+            username = self._unique_username(first_name, last_name)
+            users.append(User(
+                username=username,
+                first_name=first_name,
+                last_name=last_name,
+                email=f"{username}@school.edu",
+                password=password_hash,
+            ))
+            selected_department = self._select_department()
+            profiles.append(UserProfile(
+                student_id=student_id,
+                department=selected_department,
+                course=self._select_course(selected_department),
+                year_level=year_level_label(self._select_year_level()),
+                is_verified=True,
+            ))
+        return users, profiles
+
+    def _write_batch(self, users, profiles):
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            if any(u.pk is None for u in users):
+                # Backend could not return primary keys from the insert
+                ids = dict(
+                    User.objects
+                    .filter(username__in=[u.username for u in users])
+                    .values_list('username', 'id')
+                )
+                for u in users:
+                    u.pk = ids[u.username]
+            for user, profile in zip(users, profiles):
+                profile.user = user
+            UserProfile.objects.bulk_create(profiles)
+            # bulk_create skips the post_save signals that maintain the search index and counters
+            index_users(users, profiles)
+            increment('users.total', len(profiles))
+            increment('users.verified', sum(1 for p in profiles if p.is_verified))
+
+    # --- public API ----------------------------------------------------------
+
+    def run(self, progress: Optional[Callable[[int, int], None]] = None) -> dict:
+        """Generate ``count`` users and return a summary dict.
+
+        ``progress`` is called with ``(done, total)`` after every committed batch.
+        """
+        self._load_existing()
+        password_hash = self.password_hash or make_password(self.password)
+        preview: List[dict] = []
+        created = 0
+        retries = 0
+
+        while created < self.count:
+            size = min(self.batch_size, self.count - created)
+            users, profiles = self._build_batch(size, password_hash)
+            try:
+                self._write_batch(users, profiles)
+            except IntegrityError:
+                # Another writer took some of our values; refresh and retry the batch
+                retries += 1
+                if retries > 3:
+                    raise
+                logger.warning('Bulk user batch collided with concurrent writes, retrying')
+                self._load_existing()
+                continue
+
+            created += size
+            for user, profile in zip(users, profiles):
+                if len(preview) >= BULK_USER_PREVIEW_SIZE:
+                    break
+                preview.append({
+                    'username': user.username,
+                    'name': f"{user.first_name} {user.last_name}",
+                    'student_id': profile.student_id,
+                    'email': user.email,
+                })
+            if progress:
+                progress(created, self.count)
+
+        return {'created': created, 'generated_users': preview}
@@ -0,0 +1,341 @@
+"""
+Indexed user search.
+
+Each user has one ``UserSearchDocument`` row holding a normalised string of
+their full name, username, email and student ID, kept current by signals on
+User/UserProfile (and written directly by bulk paths that bypass signals).
+Searches match every query term against that single column instead of
+OR-ing ``icontains`` over several joined columns:
+
+* PostgreSQL: a ``pg_trgm`` GIN index serves substring (``LIKE``) matches and
+  a ``to_tsvector('simple', ...)`` GIN index serves word-prefix matches for
+  terms too short for trigrams.
+* SQLite: an external-content FTS5 table with the trigram tokenizer, kept in
+  sync by triggers; short terms fall back to ``LIKE`` on the document table.
+
+Both are created by ``auth_module`` migration 0005; without them (e.g. an
+SQLite build lacking FTS5) the same queries still work, just unindexed.
+
+Autocomplete additionally uses ``user_prefix_index``, a per-process sorted
+token array over active users answered with binary search, so typing does
+not hit the database until the final page of ids is hydrated.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from sys import intern
+from typing import Dict, Iterable, List, Tuple
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from auth_module.models import UserProfile, UserSearchDocument
+
+FTS_TABLE = 'auth_module_usersearch_fts'
+# Trigram indexes (pg_trgm and FTS5 trigram) only help for terms this long
+MIN_TRIGRAM_LENGTH = 3
+MAX_QUERY_TERMS = 5
+
+# Bumped whenever a search document is written, so prefix indexes refresh early
+VERSION_CACHE_KEY = 'user_search:version'
+
+_fts_available = None
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse whitespace"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.lower().split())
+
+
+def build_document(user, profile=None) -> str:
+    parts = [user.first_name, user.last_name, user.username, user.email]
+    if profile is not None and profile.student_id:
+        parts.append(profile.student_id)
+    return normalize(' '.join(p for p in parts if p))
+
+
+def _profile_for(user):
+    try:
+        return user.profile
+    except UserProfile.DoesNotExist:
+        return None
+
+
+def index_user(user, profile=None):
+    """Create or refresh the search document for one user"""
+    if profile is None:
+        profile = _profile_for(user)
+    UserSearchDocument.objects.update_or_create(
+        user_id=user.pk,
+        defaults={'document': build_document(user, profile)},
+    )
+    bump_version()
+
+
+def index_users(users: Iterable, profiles: Iterable = None):
+    """Upsert search documents for many users in one statement.
+
+    ``profiles`` may be passed in the same order as ``users`` when the caller
+    already has them (bulk generation), otherwise they are looked up.
+    """
+    users = list(users)
+    if not users:
+        return
+    if profiles is None:
+        by_user = {p.user_id: p for p in UserProfile.objects.filter(user__in=users)}
+        profiles = [by_user.get(u.pk) for u in users]
+    UserSearchDocument.objects.bulk_create(
+        [
+            UserSearchDocument(user_id=u.pk, document=build_document(u, p))
+            for u, p in zip(users, profiles)
+        ],
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['document', 'updated_at'],
+    )
+    bump_version()
+
+
+def bump_version():
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(VERSION_CACHE_KEY, 1, None)
+
+
+def fts_available() -> bool:
+    """Whether the SQLite FTS5 shadow table exists in this database"""
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names()
+    return _fts_available
+
+
+def _terms(query: str) -> List[str]:
+    return normalize(query).split()[:MAX_QUERY_TERMS]
+
+
+def _term_filter(term: str) -> Q:
+    if connection.vendor == 'postgresql':
+        if len(term) >= MIN_TRIGRAM_LENGTH:
+            return Q(document__contains=term)
+        word = re.sub(r'\W', '', term)
+        if not word:
+            return Q(document__contains=term)
+        return Q(user_id__in=RawSQL(
+            f"SELECT user_id FROM {UserSearchDocument._meta.db_table} "
+            "WHERE to_tsvector('simple', document) @@ to_tsquery('simple', %s)",
+            [f'{word}:*'],
+        ))
+    if len(term) >= MIN_TRIGRAM_LENGTH and fts_available():
+        phrase = '"' + term.replace('"', '""') + '"'
+        return Q(user_id__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+            [phrase],
+        ))
+    return Q(document__contains=term)
+
+
+def search_documents(query: str):
+    """Queryset of search documents matching every term of ``query``"""
+    qs = UserSearchDocument.objects.all()
+    for term in _terms(query):
+        qs = qs.filter(_term_filter(term))
+    return qs
+
+
+def matching_user_ids(query: str):
+    """Subquery of user ids for ``filter(user_id__in=...)`` / ``filter(id__in=...)``"""
+    return search_documents(query).values('user_id')
+
+
+# --- in-memory prefix index ---------------------------------------------------
+
+_TOKEN_SPLIT = re.compile(r'[\s._@+-]+')
+
+
+def tokenize(*values) -> List[str]:
+    """Normalised tokens of names/usernames/student IDs, including whole values"""
+    tokens = set()
+    for value in values:
+        value = normalize(value or '')
+        if not value:
+            continue
+        tokens.add(value.replace(' ', ''))
+        tokens.update(t for t in _TOKEN_SPLIT.split(value) if t)
+    return sorted(tokens)
+
+
+class UserPrefixIndex:
+    """Sorted (token, user id) arrays over active users with binary-search prefix lookup.
+
+    The index is built once per process and then kept current incrementally:
+    when the search version counter changes, or at most every
+    ``refresh_interval`` seconds (the counter lives in a per-process cache in
+    some deployments), documents updated since the last high-water mark are
+    re-tokenised and patched in. Deleted users are dropped lazily when
+    hydration no longer finds them, and a full rebuild happens every
+    ``rebuild_interval`` seconds as a backstop.
+    """
+
+    def __init__(self, refresh_interval=5.0, rebuild_interval=600.0, full_rebuild_threshold=2000):
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.full_rebuild_threshold = full_rebuild_threshold
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._tokens: List[str] = []
+        self._user_ids = array('q')
+        self._user_tokens: Dict[int, Tuple[str, ...]] = {}
+        self._sort_keys: Dict[int, str] = {}
+        self._high_water = None
+        self._version = None
+        self._checked_at = 0.0
+        self._built_at = 0.0
+        self._built = False
+
+    # --- maintenance ---------------------------------------------------------
+
+    def _rows(self, queryset):
+        return queryset.values_list(
+            'user_id', 'updated_at', 'user__first_name', 'user__last_name',
+            'user__username', 'user__profile__student_id', 'user__is_active',
+        )
+
+    def _rebuild(self):
+        entries = []
+        user_tokens = {}
+        sort_keys = {}
+        high_water = None
+        for user_id, updated_at, first, last, username, student_id, is_active in (
+            self._rows(UserSearchDocument.objects.all()).iterator(chunk_size=5000)
+        ):
+            if high_water is None or updated_at > high_water:
+                high_water = updated_at
+            if not is_active:
+                continue
+            # Interned tokens let users with common names share one string object
+            tokens = tuple(intern(t) for t in tokenize(first, last, username, student_id))
+            user_tokens[user_id] = tokens
+            sort_keys[user_id] = normalize(f"{first} {last}")
+            entries.extend((t, user_id) for t in tokens)
+        entries.sort()
+        self._tokens = [t for t, _ in entries]
+        self._user_ids = array('q', (uid for _, uid in entries))
+        self._user_tokens = user_tokens
+        self._sort_keys = sort_keys
+        self._high_water = high_water
+        self._built_at = time.monotonic()
+        self._built = True
+
+    def _remove(self, user_id):
+        for token in self._user_tokens.pop(user_id, ()):
+            i = bisect_left(self._tokens, token)
+            while i < len(self._tokens) and self._tokens[i] == token:
+                if self._user_ids[i] == user_id:
+                    del self._tokens[i]
+                    del self._user_ids[i]
+                    break
+                i += 1
+        self._sort_keys.pop(user_id, None)
+
+    def _insert(self, user_id, tokens, sort_key):
+        for token in tokens:
+            i = bisect_left(self._tokens, token)
+            self._tokens.insert(i, token)
+            self._user_ids.insert(i, user_id)
+        self._user_tokens[user_id] = tokens
+        self._sort_keys[user_id] = sort_key
+
+    def _apply_changes(self):
+        changed = self._rows(UserSearchDocument.objects.filter(updated_at__gte=self._high_water))
+        rows = list(changed[:self.full_rebuild_threshold + 1])
+        if len(rows) > self.full_rebuild_threshold:
+            self._rebuild()
+            return
+        for user_id, updated_at, first, last, username, student_id, is_active in rows:
+            if updated_at > self._high_water:
+                self._high_water = updated_at
+            self._remove(user_id)
+            if is_active:
+                tokens = tuple(intern(t) for t in tokenize(first, last, username, student_id))
+                self._insert(user_id, tokens, normalize(f"{first} {last}"))
+
+    def refresh(self, force=False):
+        """Bring the index up to date if the version changed or it is due"""
+        now = time.monotonic()
+        version = cache.get(VERSION_CACHE_KEY)
+        if not force and self._built and version == self._version and now - self._checked_at < self.refresh_interval:
+            return
+        with self._lock:
+            if not self._built or now - self._built_at > self.rebuild_interval:
+                self._rebuild()
+            elif self._high_water is not None:
+                self._apply_changes()
+            else:
+                self._rebuild()
+            self._version = version
+            self._checked_at = now
+
+    def discard(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._remove(user_id)
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    # --- lookup --------------------------------------------------------------
+
+    def _prefix_ids(self, prefix) -> set:
+        ids = set()
+        i = bisect_left(self._tokens, prefix)
+        tokens = self._tokens
+        while i < len(tokens) and tokens[i].startswith(prefix):
+            ids.add(self._user_ids[i])
+            i += 1
+        return ids
+
+    def search(self, query: str, limit: int = 20) -> List[int]:
+        """Ids of active users with a token starting with every query term, name-ordered"""
+        self.refresh()
+        terms = [t for t in _TOKEN_SPLIT.split(normalize(query)) if t][:MAX_QUERY_TERMS]
+        if not terms:
+            return []
+        with self._lock:
+            # Narrowest term first keeps the intersections small
+            candidate_sets = sorted((self._prefix_ids(t) for t in terms), key=len)
+            matches = candidate_sets[0]
+            for other in candidate_sets[1:]:
+                matches = matches & other
+                if not matches:
+                    return []
+            sort_keys = self._sort_keys
+            return sorted(matches, key=lambda uid: (sort_keys.get(uid, ''), uid))[:limit]
+
+    def hydrate(self, query: str, limit: int = 20, queryset=None) -> List:
+        """Users for ``search(query)`` in index order, fetched with one query"""
+        if queryset is None:
+            queryset = User.objects.all()
+        ids = self.search(query, limit)
+        users = queryset.filter(id__in=ids, is_active=True).in_bulk()
+        missing = [uid for uid in ids if uid not in users]
+        if missing:
+            self.discard(missing)
+        return [users[uid] for uid in ids if uid in users]
+
+
+user_prefix_index = UserPrefixIndex()
@@ -0,0 +1,81 @@
+"""
+Request-scoped voter context.
+
+``VoterContextMiddleware`` sets ``request.voter`` to a lazy ``VoterContext``.
+The first attribute access loads the user's ``UserProfile`` together with
+its ``Department`` and ``Course`` in one ``select_related`` query; every
+later check in the same request (profile completeness, verification, voting
+eligibility) reuses it instead of querying ``UserProfile`` again.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from auth_module.models import UserProfile
+
+INCOMPLETE_PROFILE = "Please complete your profile by selecting your course and department."
+MISSING_PROFILE = "Please complete your profile first."
+
+
+class VoterContext:
+    """The requesting user's profile and the eligibility flags derived from it"""
+
+    def __init__(self, user, profile: Optional[UserProfile] = None):
+        self.user = user
+        self.profile = profile
+
+    @classmethod
+    def for_user(cls, user) -> 'VoterContext':
+        if not getattr(user, 'is_authenticated', False):
+            return cls(user)
+        profile = (
+            UserProfile.objects.select_related('user', 'department', 'course')
+            .filter(user_id=user.pk)
+            .first()
+        )
+        if profile is not None:
+            # Keep the request's user object so changes to it are seen through the profile
+            profile.user = user
+            course = profile.course
+            if course is not None and course.department_id == profile.department_id:
+                course.department = profile.department
+        return cls(user, profile)
+
+    @property
+    def is_authenticated(self) -> bool:
+        return bool(getattr(self.user, 'is_authenticated', False))
+
+    @property
+    def has_profile(self) -> bool:
+        return self.profile is not None
+
+    @property
+    def is_verified(self) -> bool:
+        return self.has_profile and self.profile.is_verified
+
+    @property
+    def is_profile_complete(self) -> bool:
+        return self.has_profile and self.profile.department_id is not None and self.profile.course_id is not None
+
+    @property
+    def profile_error(self) -> Optional[str]:
+        """Why the profile is not complete, or None"""
+        if not self.has_profile:
+            return MISSING_PROFILE
+        if not self.is_profile_complete:
+            return INCOMPLETE_PROFILE
+        return None
+
+    @property
+    def can_vote(self) -> bool:
+        return self.is_authenticated and self.is_verified and self.is_profile_complete
+
+    @property
+    def can_apply(self) -> bool:
+        return self.is_authenticated and self.is_profile_complete
+
+    def ensure_profile(self) -> UserProfile:
+        """The profile, created empty if the user has none yet"""
+        if self.profile is None:
+            self.profile = UserProfile.objects.create(user=self.user)
+        return self.profile
@@ -81,12 +81,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'E_Botar.middleware.BlockedIPMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Serve static files efficiently
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'E_Botar.middleware.VoterContextMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
@@ -148,6 +150,33 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# Login throttling windows and the change-version keys of the IP blocklist,
+# security settings and election calendar must be shared by every Gunicorn
+# worker and the job worker, or each process enforces its own limits.
+# REDIS_URL selects Redis (needs the `redis` package); deployed environments
+# otherwise use a database table (`python manage.py createcachetable`, run by
+# scripts/start_web.sh). Local development keeps the per-process memory cache.
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+elif DATABASE_URL or IS_PRODUCTION:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -195,6 +224,87 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Background jobs (admin_module.Job) are executed by `python manage.py run_jobs`.
+# Set JOBS_RUN_EAGERLY=true to run them inside the request when no worker is running.
+JOBS_RUN_EAGERLY = os.environ.get('JOBS_RUN_EAGERLY', 'False').lower() == 'true'
+# Running jobs send a heartbeat every 30 seconds. A 'running' job with no
+# heartbeat for this many seconds belonged to a worker that stopped (crash,
+# redeploy); workers mark such jobs failed.
+JOB_STALE_SECONDS = int(os.environ.get('JOB_STALE_SECONDS', str(10 * 60)))
+
+# ActivityLog entries are queued in-process and written in batches by a
+# background thread (see E_Botar.utils.logging_utils). Actions listed in
+# ACTIVITY_LOG_SYNC_ACTIONS are always written synchronously, inside the
+# caller's transaction. The test runner (E_Botar.test_runner) turns buffering off.
+ACTIVITY_LOG_BUFFERED = os.environ.get('ACTIVITY_LOG_BUFFERED', 'True').lower() == 'true'
+ACTIVITY_LOG_SYNC_ACTIONS = ['vote']
+ACTIVITY_LOG_BATCH_SIZE = int(os.environ.get('ACTIVITY_LOG_BATCH_SIZE', '200'))
+ACTIVITY_LOG_FLUSH_INTERVAL_MS = int(os.environ.get('ACTIVITY_LOG_FLUSH_INTERVAL_MS', '500'))
+ACTIVITY_LOG_QUEUE_SIZE = int(os.environ.get('ACTIVITY_LOG_QUEUE_SIZE', '10000'))
+
+# Entries older than this are moved to gzip JSON-lines segments (one per month)
+# by `python manage.py purge_activity_logs`, which the job worker also runs daily.
+ACTIVITY_LOG_RETENTION_DAYS = int(os.environ.get('ACTIVITY_LOG_RETENTION_DAYS', '90'))
+ACTIVITY_LOG_ARCHIVE_DIR = Path(os.environ.get('ACTIVITY_LOG_ARCHIVE_DIR', BASE_DIR / 'log_archive'))
+
+# Dashboard counters (E_Botar.services.counters): per-process read cache and
+# how often the job worker recomputes them from the real tables.
+COUNTER_CACHE_TTL = int(os.environ.get('COUNTER_CACHE_TTL', '5'))
+COUNTER_RECONCILE_SECONDS = int(os.environ.get('COUNTER_RECONCILE_SECONDS', '900'))
+
+# Login throttling (E_Botar.services.login_throttle): sliding windows checked
+# before the password is hashed. Every login POST counts against the client
+# IP; only failed logins count against the username.
+LOGIN_RATE_LIMIT_PER_IP = int(os.environ.get('LOGIN_RATE_LIMIT_PER_IP', '20'))
+LOGIN_RATE_WINDOW_PER_IP = int(os.environ.get('LOGIN_RATE_WINDOW_PER_IP', '60'))
+LOGIN_RATE_LIMIT_PER_USERNAME = int(os.environ.get('LOGIN_RATE_LIMIT_PER_USERNAME', '5'))
+LOGIN_RATE_WINDOW_PER_USERNAME = int(os.environ.get('LOGIN_RATE_WINDOW_PER_USERNAME', '300'))
+
+# BlockedIP enforcement (E_Botar.middleware.BlockedIPMiddleware): each process
+# rebuilds its blocklist when a block changes, and at least this often (seconds)
+# so workers that do not share a cache backend also pick changes up.
+BLOCKED_IP_MAX_AGE = int(os.environ.get('BLOCKED_IP_MAX_AGE', '60'))
+# Widest networks an admin may block from the UI (shorter prefixes are refused).
+BLOCKED_IP_MIN_PREFIX_V4 = int(os.environ.get('BLOCKED_IP_MIN_PREFIX_V4', '16'))
+BLOCKED_IP_MIN_PREFIX_V6 = int(os.environ.get('BLOCKED_IP_MIN_PREFIX_V6', '48'))
+
+# Security reports over closed date ranges are cached once this many seconds
+# (on top of the access attempt flush interval) have passed since the range end.
+SECURITY_REPORT_CACHE_MARGIN = int(os.environ.get('SECURITY_REPORT_CACHE_MARGIN', '60'))
+
+# SecuritySettings rows are cached per process (E_Botar.services.security_settings)
+# and reloaded when one is saved, or at least this often (seconds).
+SECURITY_SETTINGS_MAX_AGE = int(os.environ.get('SECURITY_SETTINGS_MAX_AGE', '60'))
+
+# Election calendar answers (E_Botar.services.election_calendar) are cached until
+# the next election boundary or change; this caps their age in seconds so
+# workers without a shared cache see other workers' changes.
+ELECTION_CALENDAR_MAX_AGE = int(os.environ.get('ELECTION_CALENDAR_MAX_AGE', '60'))
+
+# Security anomaly detector (E_Botar.services.anomaly_detection): seconds between
+# incremental runs in the job worker. Thresholds can be overridden with a
+# SECURITY_ANOMALY_THRESHOLDS dict.
+SECURITY_DETECTOR_INTERVAL = int(os.environ.get('SECURITY_DETECTOR_INTERVAL', '30'))
+
+# Candidate photo / party logo variants (E_Botar.services.image_variants): resize
+# threads per job, and the max-age sent for the content-hashed variant files.
+IMAGE_VARIANT_WORKERS = int(os.environ.get('IMAGE_VARIANT_WORKERS', '4'))
+IMAGE_VARIANT_CACHE_SECONDS = int(os.environ.get('IMAGE_VARIANT_CACHE_SECONDS', str(60 * 60 * 24 * 365)))
+
+# Orphaned media cleanup (`python manage.py cleanup_orphaned_media`): unreferenced
+# uploads are moved here (outside MEDIA_ROOT) unless --delete is given; the
+# media tree is listed with this many threads.
+ORPHANED_MEDIA_QUARANTINE_DIR = Path(os.environ.get('ORPHANED_MEDIA_QUARANTINE_DIR', BASE_DIR / 'orphaned_media'))
+ORPHANED_MEDIA_SCAN_WORKERS = int(os.environ.get('ORPHANED_MEDIA_SCAN_WORKERS', '8'))
+
+# Reverse proxies in front of the app that append the connecting address to
+# X-Forwarded-For (Railway's edge is one). The client IP used for login
+# throttling, the IP blocklist and audit logs is the entry the outermost of
+# them added; 0 ignores X-Forwarded-For and uses REMOTE_ADDR.
+TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', '1' if IS_RAILWAY else '0'))
+
+TEST_RUNNER = 'E_Botar.test_runner.TestRunner'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
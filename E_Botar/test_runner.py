@@ -0,0 +1,22 @@
+"""
+Test runner for E-Botar (``TEST_RUNNER`` in settings)
+"""
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    DiscoverRunner that writes activity logs and access attempts synchronously,
+    so tests see them without draining the background writers. Tests of the
+    buffered path re-enable it with override_settings.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._log_settings = override_settings(ACTIVITY_LOG_BUFFERED=False)
+        self._log_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._log_settings.disable()
+        super().teardown_test_environment(**kwargs)
@@ -15,12 +15,13 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.views.generic import RedirectView
 from django.shortcuts import redirect
 from django.conf import settings
 from django.conf.urls.static import static
 from voting_module.views import home_view, voting_history
+from E_Botar.services.image_variants import VARIANTS_DIR, serve_variant
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -43,5 +44,13 @@ urlpatterns = [
 
 # Add media files support for development
 if settings.DEBUG:
+    # Content-hashed image variants never change, so they can be cached forever
+    urlpatterns += [
+        re_path(
+            rf'^{settings.MEDIA_URL.strip("/")}/(?P<path>{VARIANTS_DIR}/.*)$',
+            serve_variant,
+            {'document_root': settings.MEDIA_ROOT},
+        ),
+    ]
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -3,7 +3,6 @@ Consolidated helper utilities for E-Botar system
 """
 from django.utils import timezone
 from django.core.paginator import Paginator
-from django.db.models import Q
 from django.contrib.auth.models import User
 from django.http import JsonResponse
 from django.core.serializers.json import DjangoJSONEncoder
@@ -30,29 +29,25 @@ def get_paginated_data(queryset, page_number=1, per_page=20):
 
 def search_users(query, filters=None):
     """Search users with filters"""
-    queryset = User.objects.select_related('userprofile', 'userprofile__department', 'userprofile__course')
+    from E_Botar.services.user_search import matching_user_ids
+    
+    queryset = User.objects.select_related('profile', 'profile__department', 'profile__course')
     
     if query:
-        queryset = queryset.filter(
-            Q(username__icontains=query) |
-            Q(first_name__icontains=query) |
-            Q(last_name__icontains=query) |
-            Q(email__icontains=query) |
-            Q(userprofile__student_id__icontains=query)
-        )
+        queryset = queryset.filter(id__in=matching_user_ids(query))
     
     if filters:
         if filters.get('department'):
-            queryset = queryset.filter(userprofile__department__id=filters['department'])
+            queryset = queryset.filter(profile__department__id=filters['department'])
         
         if filters.get('course'):
-            queryset = queryset.filter(userprofile__course__id=filters['course'])
+            queryset = queryset.filter(profile__course__id=filters['course'])
         
         if filters.get('year_level'):
-            queryset = queryset.filter(userprofile__year_level=filters['year_level'])
+            queryset = queryset.filter(profile__year_level=filters['year_level'])
         
         if filters.get('is_verified') is not None:
-            queryset = queryset.filter(userprofile__is_verified=filters['is_verified'])
+            queryset = queryset.filter(profile__is_verified=filters['is_verified'])
         
         if filters.get('is_active') is not None:
             queryset = queryset.filter(is_active=filters['is_active'])
@@ -71,6 +66,49 @@ def format_datetime(dt, format_string='%Y-%m-%d %H:%M:%S'):
     return dt.strftime(format_string)
 
 
+def local_date_bounds(date_from=None, date_to=None):
+    """Turn inclusive calendar dates into a half-open ``[start, end)`` datetime range.
+
+    Dates (``date`` objects or ``YYYY-MM-DD`` strings) are interpreted in the
+    configured TIME_ZONE, so ``date_to`` covers that whole local day. Filtering
+    on the raw column instead of ``__date`` keeps timestamp indexes usable.
+    Missing or unparsable dates give ``None`` for that side.
+    """
+    from datetime import date, datetime, time, timedelta
+    from django.utils.dateparse import parse_date
+    
+    def _as_date(value):
+        if isinstance(value, date):
+            return value
+        try:
+            return parse_date(value) if value else None
+        except ValueError:
+            return None
+    
+    tz = timezone.get_current_timezone()
+    start = end = None
+    start_day = _as_date(date_from)
+    end_day = _as_date(date_to)
+    if start_day:
+        start = timezone.make_aware(datetime.combine(start_day, time.min), tz)
+    if end_day:
+        end = timezone.make_aware(datetime.combine(end_day + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+def date_range_filter(field, date_from=None, date_to=None):
+    """``Q`` selecting ``field`` within the local calendar dates ``date_from``..``date_to``"""
+    from django.db.models import Q
+    
+    start, end = local_date_bounds(date_from, date_to)
+    condition = Q()
+    if start:
+        condition &= Q(**{f'{field}__gte': start})
+    if end:
+        condition &= Q(**{f'{field}__lt': end})
+    return condition
+
+
 def get_time_remaining(start_date, end_date):
     """Get time remaining between two dates"""
     now = timezone.now()
@@ -106,13 +144,9 @@ def generate_unique_code(prefix='', length=8):
 
 
 def get_client_ip(request):
-    """Get client IP address"""
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
+    """Get client IP address (trusted proxy hop; see logging_utils.get_client_ip)"""
+    from E_Botar.utils.logging_utils import get_client_ip as client_ip
+    return client_ip(request)
 
 
 def get_user_agent(request):
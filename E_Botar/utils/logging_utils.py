@@ -1,9 +1,29 @@
 """
 Consolidated logging utilities for E-Botar system
+
+``log_activity`` does not write to the database directly. Entries are put on
+a bounded in-process queue and a background thread writes them with
+``bulk_create`` once ``ACTIVITY_LOG_BATCH_SIZE`` entries are waiting or every
+``ACTIVITY_LOG_FLUSH_INTERVAL_MS`` milliseconds. The queue is also drained at
+interpreter exit. Actions in ``ACTIVITY_LOG_SYNC_ACTIONS`` (or calls made
+with ``sync=True``) are written immediately inside the caller's transaction,
+so an audit entry such as a vote commits or rolls back together with it.
 """
+import atexit
+import ipaddress
 import json
 import logging
+import os
+import queue
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete
+from django.db import close_old_connections, transaction
 from django.utils import timezone
 
 # Import models (will be updated when modules are consolidated)
@@ -16,7 +36,130 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
-def log_activity(user, action, description, request=None, additional_data=None):
+class BufferedActivityLogWriter:
+    """Bounded queue of unsaved ``ActivityLog`` instances flushed in batches.
+
+    The flusher thread is started lazily on first use and again after a
+    fork, since threads do not survive into gunicorn workers. When the queue
+    is full the caller writes its own entry, so nothing is dropped under
+    load.
+
+    Subclasses may buffer another model by overriding ``model`` and
+    ``thread_name``; ``_written`` is called after each successful bulk insert.
+    """
+
+    model = ActivityLog
+    thread_name = 'activity-log-writer'
+
+    def __init__(self, max_size=10000, batch_size=200, flush_interval=0.5, autostart=True):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.autostart = autostart
+        self._queue = queue.Queue(maxsize=max_size)
+        self._wakeup = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    @property
+    def pending(self):
+        return self._queue.qsize()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+
+    def _ensure_thread(self):
+        if not self.autostart or self.is_running():
+            return
+        with self._start_lock:
+            if self.is_running():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+            self._thread.start()
+
+    def enqueue(self, entry):
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._write([entry])
+            return
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"{self.model.__name__} writer error: {str(e)}")
+            finally:
+                close_old_connections()
+
+    def _take_batch(self):
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self):
+        """Write everything queued so far; returns the number of entries taken"""
+        taken = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    return taken
+                self._write(batch)
+                taken += len(batch)
+
+    def _write(self, batch):
+        try:
+            self.model.objects.bulk_create(batch)
+        except Exception as e:
+            logger.error(f"Error writing {len(batch)} {self.model.__name__} rows in bulk, retrying one by one: {str(e)}")
+        else:
+            self._written(batch)
+            return
+        # One bad row (e.g. a user deleted since it was queued) must not lose the batch
+        for entry in batch:
+            try:
+                entry.save(force_insert=True)
+            except Exception as e:
+                logger.error(f"Error logging activity: {str(e)}")
+
+    def _written(self, batch):
+        pass
+
+    def request_finished(self, **kwargs):
+        # Without a live flusher thread (e.g. it could not start in this
+        # process) the request that queued entries writes them itself
+        if self.pending and not self.is_running():
+            self.flush()
+
+
+activity_log_writer = BufferedActivityLogWriter(
+    max_size=getattr(settings, 'ACTIVITY_LOG_QUEUE_SIZE', 10000),
+    batch_size=getattr(settings, 'ACTIVITY_LOG_BATCH_SIZE', 200),
+    flush_interval=getattr(settings, 'ACTIVITY_LOG_FLUSH_INTERVAL_MS', 500) / 1000,
+)
+request_finished.connect(activity_log_writer.request_finished, dispatch_uid='activity_log_writer_drain')
+atexit.register(activity_log_writer.flush)
+
+
+def flush_activity_logs():
+    """Write all buffered activity log entries now"""
+    return activity_log_writer.flush()
+
+
+def log_activity(user, action, description, request=None, additional_data=None, sync=None):
     """
     Log user activity to the database
     
@@ -26,6 +169,8 @@ def log_activity(user, action, description, request=None, additional_data=None):
         description: Human-readable description
         request: Django request object (optional)
         additional_data: Additional data as dict (optional)
+        sync: Write immediately in the current transaction instead of
+            buffering (defaults to ``action in ACTIVITY_LOG_SYNC_ACTIONS``)
     """
     try:
         # Handle anonymous users
@@ -38,8 +183,8 @@ def log_activity(user, action, description, request=None, additional_data=None):
             ip_address = get_client_ip(request)
             user_agent = request.META.get('HTTP_USER_AGENT', '')
         
-        # Create activity log entry
-        ActivityLog.objects.create(
+        # Timestamp is taken now, not when the entry is flushed
+        entry = ActivityLog(
             user=user_obj,
             action=action,
             description=description,
@@ -47,18 +192,110 @@ def log_activity(user, action, description, request=None, additional_data=None):
             user_agent=user_agent,
             additional_data=additional_data or {}
         )
+        if sync is None:
+            sync = action in getattr(settings, 'ACTIVITY_LOG_SYNC_ACTIONS', ())
+        if sync or not getattr(settings, 'ACTIVITY_LOG_BUFFERED', False):
+            entry.save(force_insert=True)
+        else:
+            # Entries for work that is rolled back are never queued
+            transaction.on_commit(lambda: activity_log_writer.enqueue(entry))
     except Exception as e:
         # Log the error but don't break the main functionality
         logger.error(f"Error logging activity: {str(e)}")
 
 
+class _BulkOperation:
+    """Distinct rows touched while audit signals are suppressed"""
+
+    def __init__(self, additional_data=None):
+        self.seen = set()
+        # Callers may add their own totals (e.g. rows written with bulk_create)
+        self.additional_data = dict(additional_data or {})
+
+    def record(self, sender, instance, operation):
+        self.seen.add((sender._meta.label, operation, instance.pk))
+
+    def summary(self):
+        counts = Counter((label, operation) for label, operation, _ in self.seen)
+        changes = {}
+        for (label, operation), count in sorted(counts.items()):
+            changes.setdefault(label, {})[operation] = count
+        return changes
+
+
+_bulk_state = threading.local()
+
+
+def current_bulk_operation():
+    return getattr(_bulk_state, 'operation', None)
+
+
+@contextmanager
+def bulk_operation(description, user=None, action='system_action', request=None, additional_data=None):
+    """
+    Suppress per-row audit logging from model signals and log one summary entry
+
+    Receivers decorated with ``audit_signal`` only count the rows they would
+    have logged while this is active. On a clean exit a single ActivityLog
+    entry is written with the per-model created/updated/deleted counts under
+    ``additional_data['changes']``, plus anything the caller put in the
+    yielded operation's ``additional_data``. Nested blocks fold into the
+    outermost one.
+    """
+    outer = current_bulk_operation()
+    if outer is not None:
+        yield outer
+        return
+    operation = _bulk_state.operation = _BulkOperation(additional_data)
+    try:
+        yield operation
+    finally:
+        _bulk_state.operation = None
+    log_activity(
+        user=user,
+        action=action,
+        description=description,
+        request=request,
+        additional_data={**operation.additional_data, 'bulk': True, 'changes': operation.summary()}
+    )
+
+
+def audit_signal(receiver_func):
+    """Skip a post_save/post_delete audit receiver inside ``bulk_operation()``"""
+    @wraps(receiver_func)
+    def wrapper(sender, instance, **kwargs):
+        operation = current_bulk_operation()
+        if operation is None:
+            return receiver_func(sender, instance, **kwargs)
+        if kwargs.get('signal') is post_delete:
+            operation.record(sender, instance, 'deleted')
+        else:
+            operation.record(sender, instance, 'created' if kwargs.get('created') else 'updated')
+    return wrapper
+
+
 def get_client_ip(request):
-    """Get client IP address from request"""
+    """Get client IP address from request
+    
+    Only the ``TRUSTED_PROXY_COUNT`` right-most ``X-Forwarded-For`` entries were
+    added by our own proxies; anything to their left is whatever the client sent.
+    The client is therefore the entry the outermost trusted proxy appended, or
+    ``REMOTE_ADDR`` when no proxy is trusted or the header is too short to have
+    passed through all of them.
+    """
+    remote_addr = request.META.get('REMOTE_ADDR')
+    proxies = getattr(settings, 'TRUSTED_PROXY_COUNT', 0)
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
+    if not proxies or not x_forwarded_for:
+        return remote_addr
+    hops = [hop.strip() for hop in x_forwarded_for.split(',') if hop.strip()]
+    if len(hops) < proxies:
+        return remote_addr
+    ip = hops[-proxies]
+    try:
+        ipaddress.ip_address(ip)
+    except ValueError:
+        return remote_addr
     return ip
 
 
@@ -221,14 +458,10 @@ def get_user_activity(user, days=30):
 
 
 def cleanup_old_logs(days=90):
-    """Clean up old activity logs"""
-    from datetime import timedelta
-    
-    cutoff_date = timezone.now() - timedelta(days=days)
+    """Archive and delete old activity logs in chunks (see E_Botar.services.log_archive)"""
+    from E_Botar.services.log_archive import purge_expired_logs
     
-    deleted_count = ActivityLog.objects.filter(
-        timestamp__lt=cutoff_date
-    ).delete()[0]
+    deleted_count = purge_expired_logs(days=days).deleted
     
     logger.info(f"Cleaned up {deleted_count} old activity logs")
     return deleted_count
@@ -0,0 +1,203 @@
+"""
+Keyset (cursor) pagination for large, append-heavy tables.
+
+Django's ``Paginator`` counts the whole filtered queryset and skips rows with
+``OFFSET``, so page N costs O(N * per_page). ``KeysetPaginator`` instead
+orders by a unique key such as ``(-timestamp, -id)`` and filters on the last
+row of the previous page, so every page is one indexed range scan of
+``per_page + 1`` rows. Cursors are opaque URL-safe tokens; a malformed cursor
+simply yields the first page.
+
+A total is only computed when asked for: PostgreSQL provides the planner's
+row estimate, other databases a count capped at ``COUNT_CAP``.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional, Sequence
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import urlencode
+
+CURSOR_PARAM = 'cursor'
+# Rows counted at most when no planner estimate is available
+COUNT_CAP = 10_000
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'dec': str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return parse_datetime(value['dt'])
+        if 'd' in value:
+            return parse_date(value['d'])
+        if 'dec' in value:
+            return Decimal(value['dec'])
+    return value
+
+
+def encode_cursor(values: Sequence, direction: str) -> str:
+    raw = json.dumps({'v': [_encode_value(v) for v in values], 'd': direction}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]):
+    """Return ``(values, direction)`` or ``(None, 'next')`` for a missing/invalid cursor"""
+    if not cursor:
+        return None, 'next'
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        values = [_decode_value(v) for v in data['v']]
+        direction = data.get('d', 'next')
+        if direction not in ('next', 'prev') or any(v is None for v in values):
+            raise ValueError('invalid cursor')
+        return values, direction
+    except (ValueError, KeyError, TypeError, binascii.Error, UnicodeDecodeError):
+        return None, 'next'
+
+
+class KeysetPage:
+    """One page of a keyset paginator; iterable like a Django ``Page``"""
+
+    def __init__(self, paginator, object_list, has_next, has_previous, total=None, total_is_estimate=False):
+        self.paginator = paginator
+        self.object_list = object_list
+        self.has_next_page = has_next
+        self.has_previous_page = has_previous
+        self.total = total
+        self.total_is_estimate = total_is_estimate
+        self.next_cursor = paginator.cursor_for(object_list[-1], 'next') if has_next and object_list else None
+        self.previous_cursor = paginator.cursor_for(object_list[0], 'prev') if has_previous and object_list else None
+        # Query strings for templates, filled in by paginate_keyset()
+        self.first_query = ''
+        self.next_query = ''
+        self.previous_query = ''
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.has_next_page
+
+    def has_previous(self):
+        return self.has_previous_page
+
+    def has_other_pages(self):
+        return self.has_next_page or self.has_previous_page
+
+
+class KeysetPaginator:
+    """Paginate ``queryset`` by the unique ordering ``ordering`` (e.g. ``('-timestamp', '-id')``)"""
+
+    def __init__(self, queryset, per_page, ordering: Sequence[str] = ('-timestamp', '-id'), estimate_count=False):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.fields = [f.lstrip('-') for f in self.ordering]
+        self.descending = [f.startswith('-') for f in self.ordering]
+        self.estimate_count = estimate_count
+
+    # --- cursors -------------------------------------------------------------
+
+    def _key(self, obj) -> List:
+        values = []
+        for field in self.fields:
+            value = obj
+            for part in field.split('__'):
+                value = getattr(value, part)
+            values.append(value)
+        return values
+
+    def cursor_for(self, obj, direction) -> str:
+        return encode_cursor(self._key(obj), direction)
+
+    def _after(self, values, reverse=False) -> Q:
+        """Rows strictly after ``values`` in the ordering (before it if ``reverse``)"""
+        condition = Q()
+        equal_prefix = Q()
+        for field, value, desc in zip(self.fields, values, self.descending):
+            forward_lookup = 'lt' if desc else 'gt'
+            if reverse:
+                forward_lookup = 'gt' if forward_lookup == 'lt' else 'lt'
+            condition |= equal_prefix & Q(**{f'{field}__{forward_lookup}': value})
+            equal_prefix &= Q(**{field: value})
+        return condition
+
+    def _reversed_ordering(self):
+        return [f[1:] if f.startswith('-') else f'-{f}' for f in self.ordering]
+
+    # --- counting ------------------------------------------------------------
+
+    def count(self):
+        """Return ``(total, is_estimate)``"""
+        if connection.vendor == 'postgresql':
+            sql, params = self.queryset.order_by().query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows']), True
+        capped = self.queryset.order_by()[:COUNT_CAP + 1].count()
+        return min(capped, COUNT_CAP), capped > COUNT_CAP
+
+    # --- pages ---------------------------------------------------------------
+
+    def get_page(self, cursor: Optional[str] = None) -> KeysetPage:
+        values, direction = decode_cursor(cursor)
+        if values is not None and len(values) != len(self.fields):
+            values, direction = None, 'next'
+
+        if direction == 'prev':
+            qs = self.queryset.filter(self._after(values, reverse=True)).order_by(*self._reversed_ordering())
+            rows = list(qs[:self.per_page + 1])
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            has_next = True
+        else:
+            qs = self.queryset
+            if values is not None:
+                qs = qs.filter(self._after(values))
+            rows = list(qs.order_by(*self.ordering)[:self.per_page + 1])
+            has_next = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_previous = values is not None
+
+        total, is_estimate = (None, False)
+        if self.estimate_count:
+            total, is_estimate = self.count()
+        return KeysetPage(self, rows, has_next, has_previous, total, is_estimate)
+
+
+def paginate_keyset(request, queryset, per_page, ordering=('-timestamp', '-id'), estimate_count=False) -> KeysetPage:
+    """Return the page for ``request``'s cursor with query strings that keep the other GET filters"""
+    page = KeysetPaginator(queryset, per_page, ordering, estimate_count).get_page(request.GET.get(CURSOR_PARAM))
+    params = [(k, v) for k, v in request.GET.items() if k not in (CURSOR_PARAM, 'page')]
+    page.first_query = '?' + urlencode(params)
+    if page.next_cursor:
+        page.next_query = '?' + urlencode(params + [(CURSOR_PARAM, page.next_cursor)])
+    if page.previous_cursor:
+        page.previous_query = '?' + urlencode(params + [(CURSOR_PARAM, page.previous_cursor)])
+    return page
@@ -6,6 +6,7 @@ from auth_module.models import UserProfile, Department, Course, ActivityLog
 from candidate_module.models import Candidate, CandidateApplication
 from election_module.models import SchoolElection, SchoolPosition, Party
 from voting_module.models import SchoolVote, VoteReceipt
+from .models import Job
 
 # Avoid double-registration when modules already register their models
 for _model in [
@@ -294,3 +295,16 @@ class VoteReceiptAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('voter', 'election')
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'job_type', 'status', 'progress_done', 'progress_total', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'job_type', 'created_at']
+    search_fields = ['job_type', 'created_by__username', 'worker']
+    readonly_fields = ['created_at', 'started_at', 'heartbeat_at', 'finished_at', 'worker', 'progress_done', 'progress_total', 'progress_message', 'result', 'error']
+    exclude = ['payload']
+    date_hierarchy = 'created_at'
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('created_by')
@@ -8,3 +8,5 @@ class AdminModuleConfig(AppConfig):
     
     def ready(self):
         import admin_module.signals
+        from E_Botar.services.counters import connect_signals
+        connect_signals()
@@ -357,13 +357,8 @@ class CandidateApplicationForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         
         # Get current active election
-        from django.utils import timezone
-        now = timezone.now()
-        current_election = SchoolElection.objects.filter(
-            is_active=True,
-            start_date__lte=now,
-            end_date__gte=now,
-        ).first()
+        from E_Botar.services.election_calendar import get_election_calendar
+        current_election = get_election_calendar().current_election
         
         if current_election:
             # Set default election
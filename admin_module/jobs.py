@@ -0,0 +1,280 @@
+"""
+Background job handlers for admin operations.
+
+Each handler receives the claimed ``Job`` and a ``progress(done, total, message)``
+callable, and returns a JSON-serialisable result. ``message`` and ``errors``
+keys in the result are shown on the job status page.
+"""
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from auth_module.models import Department, Course, UserProfile
+from E_Botar.services.email import EmailService
+from E_Botar.services.image_variants import generate_variants_for
+from E_Botar.services.jobs import job_handler
+from E_Botar.services.reference_import import apply_plan, plan_import
+from E_Botar.services.user_generation import BulkUserGenerator
+from E_Botar.utils.logging_utils import bulk_operation, log_activity
+
+# Recipients rendered and sent per progress step of a notification blast
+NOTIFICATION_CHUNK_SIZE = 50
+
+
+@job_handler('bulk_user_generation')
+def bulk_user_generation_job(job, progress):
+    payload = job.payload
+    department_ids = payload.get('department_ids')
+    course_ids = payload.get('course_ids')
+    generator = BulkUserGenerator(
+        count=payload['count'],
+        password_hash=payload['password_hash'],
+        department=Department.objects.filter(id=payload.get('department_id')).first(),
+        course=Course.objects.filter(id=payload.get('course_id')).first(),
+        year_level=payload.get('year_level', '1'),
+        departments=Department.objects.filter(id__in=department_ids) if department_ids else None,
+        courses=Course.objects.filter(id__in=course_ids) if course_ids else None,
+        randomize_department=payload.get('randomize_department', False),
+        randomize_course=payload.get('randomize_course', False),
+        year_level_distribution=payload.get('year_level_distribution'),
+    )
+    result = generator.run(progress=lambda done, total: progress(done, total))
+
+    log_activity(
+        user=job.created_by,
+        action='admin_action',
+        description=f'Generated {result["created"]} bulk user accounts',
+        additional_data={
+            **payload.get('log_data', {}),
+            'job_id': job.pk,
+            'generated_users': result['generated_users'][:10]  # Log first 10 users
+        }
+    )
+    result['message'] = f'Successfully generated {result["created"]:,} user accounts!'
+    return result
+
+
+@job_handler('bulk_user_import')
+def bulk_user_import_job(job, progress):
+    payload = job.payload
+    update_existing = payload.get('update_existing', True)
+    overwrite_data = payload.get('overwrite_data', True)
+    # Rows arrive with ``password_hash`` already computed by the view, never the plaintext password
+    rows = payload['rows']
+    departments = {d.code: d for d in Department.objects.all()}
+    courses = {c.code: c for c in Course.objects.all()}
+
+    created_count = 0
+    updated_count = 0
+    skipped_count = 0
+    error_count = 0
+    errors = []
+    results = []
+
+    # Profile saves would otherwise log one audit entry per row
+    with bulk_operation(
+        'Bulk user import finished',
+        user=job.created_by,
+        action='admin_action',
+        additional_data={'job_id': job.pk}
+    ) as operation:
+        for index, row in enumerate(rows, start=1):
+            row_num = index + 1  # Row 1 is the header
+            progress(index, len(rows))
+            try:
+                # Check if user already exists (by username or email)
+                existing_user = None
+                if row.get('username'):
+                    existing_user = User.objects.filter(username=row['username']).first()
+                if not existing_user and row.get('email'):
+                    existing_user = User.objects.filter(email=row['email']).first()
+
+                if existing_user and not update_existing:
+                    # Skip existing users if update_existing is False
+                    skipped_count += 1
+                    continue
+
+                department = None
+                course = None
+
+                if row.get('department_code'):
+                    department = departments.get(row['department_code'])
+                    if department is None:
+                        errors.append(f'Row {row_num}: Department with code "{row["department_code"]}" not found')
+                        error_count += 1
+                        continue
+
+                if row.get('course_code'):
+                    course = courses.get(row['course_code'])
+                    if course is None:
+                        errors.append(f'Row {row_num}: Course with code "{row["course_code"]}" not found')
+                        error_count += 1
+                        continue
+
+                with transaction.atomic():
+                    if existing_user:
+                        if not overwrite_data:
+                            # Skip if not overwriting
+                            skipped_count += 1
+                            continue
+
+                        # Overwrite user data with CSV data
+                        existing_user.first_name = row.get('first_name', existing_user.first_name)
+                        existing_user.last_name = row.get('last_name', existing_user.last_name)
+                        existing_user.email = row.get('email', existing_user.email)
+                        existing_user.save()
+
+                        profile, created = UserProfile.objects.get_or_create(
+                            user=existing_user,
+                            defaults={
+                                'student_id': row.get('student_id', ''),
+                                'department': department,
+                                'course': course,
+                                'year_level': row.get('year_level', ''),
+                                'phone_number': row.get('phone_number', ''),
+                                'is_verified': True
+                            }
+                        )
+
+                        if not created:
+                            profile.student_id = row.get('student_id', profile.student_id)
+                            profile.department = department or profile.department
+                            profile.course = course or profile.course
+                            profile.year_level = row.get('year_level', profile.year_level)
+                            profile.phone_number = row.get('phone_number', profile.phone_number)
+                            profile.is_verified = True
+                            profile.save()
+
+                        updated_count += 1
+                        results.append({
+                            'row': row_num,
+                            'username': existing_user.username,
+                            'email': existing_user.email,
+                            'first_name': existing_user.first_name,
+                            'last_name': existing_user.last_name,
+                            'status': 'updated',
+                        })
+                    else:
+                        user = User.objects.create(
+                            username=row['username'],
+                            email=User.objects.normalize_email(row['email']),
+                            first_name=row.get('first_name', ''),
+                            last_name=row.get('last_name', ''),
+                            password=row['password_hash']
+                        )
+
+                        UserProfile.objects.create(
+                            user=user,
+                            student_id=row.get('student_id', ''),
+                            department=department,
+                            course=course,
+                            year_level=row.get('year_level', ''),
+                            phone_number=row.get('phone_number', ''),
+                            is_verified=True
+                        )
+
+                        created_count += 1
+                        results.append({
+                            'row': row_num,
+                            'username': user.username,
+                            'email': user.email,
+                            'first_name': user.first_name,
+                            'last_name': user.last_name,
+                            'status': 'created',
+                        })
+
+            except Exception as e:
+                errors.append(f'Row {row_num}: {str(e)}')
+                error_count += 1
+
+        operation.additional_data.update({
+            'created': created_count,
+            'updated': updated_count,
+            'skipped': skipped_count,
+            'errors': error_count,
+        })
+
+    return {
+        'created': created_count,
+        'updated': updated_count,
+        'skipped': skipped_count,
+        'errors': errors,
+        'results': results,
+        'message': (
+            f"Import completed: {created_count} created, {updated_count} updated, "
+            f"{skipped_count} skipped, {error_count} errors"
+        ),
+    }
+
+
+def _reference_import(job, progress, kind, label):
+    plan = plan_import(kind, job.payload['csv_text'])
+    progress(0, 1, f'Applying {len(plan.objects)} {label} changes')
+    apply_plan(plan)
+    progress(1, 1)
+
+    summary = plan.summary()
+    log_activity(
+        user=job.created_by,
+        action='admin_action',
+        description=f'Imported {label}s from CSV: {summary["created"]} created, {summary["updated"]} updated',
+        additional_data={'job_id': job.pk, **summary}
+    )
+    return {
+        **summary,
+        'imported': summary['created'],
+        'errors': plan.errors,
+        'message': (
+            f'{label.title()} import completed: {summary["created"]} created, '
+            f'{summary["updated"]} updated, {summary["unchanged"]} unchanged'
+        ),
+    }
+
+
+@job_handler('department_import')
+def department_import_job(job, progress):
+    return _reference_import(job, progress, 'department', 'department')
+
+
+@job_handler('course_import')
+def course_import_job(job, progress):
+    return _reference_import(job, progress, 'course', 'course')
+
+
+@job_handler('system_notification')
+def system_notification_job(job, progress):
+    payload = job.payload
+    user_ids = payload['user_ids']
+    sent = 0
+    failed_chunks = 0
+
+    for start in range(0, len(user_ids), NOTIFICATION_CHUNK_SIZE):
+        chunk = list(User.objects.filter(id__in=user_ids[start:start + NOTIFICATION_CHUNK_SIZE]))
+        if EmailService.send_system_notification(
+            users=chunk,
+            subject=payload['subject'],
+            message=payload['message'],
+            notification_type=payload.get('notification_type', 'info'),
+        ):
+            sent += len(chunk)
+        else:
+            failed_chunks += 1
+        progress(min(start + NOTIFICATION_CHUNK_SIZE, len(user_ids)), len(user_ids))
+
+    return {
+        'sent': sent,
+        'errors': [f'{failed_chunks} batch(es) could not be sent'] if failed_chunks else [],
+        'message': f'Notification sent to {sent} user(s).',
+    }
+
+
+@job_handler('image_variants')
+def image_variants_job(job, progress):
+    payload = job.payload
+    variants = generate_variants_for(payload['model'], payload['pk'], payload['field'], payload.get('source'))
+    if variants is None:
+        return {'message': 'Image was replaced or removed; nothing to resize.'}
+    return {
+        'hash': variants['hash'],
+        'message': f"Image variants built for {payload['source']}.",
+    }
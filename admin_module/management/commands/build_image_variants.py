@@ -0,0 +1,27 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from E_Botar.services.image_variants import TRACKED_FIELDS, generate_variants_for, needs_variants, queue_variants
+
+
+class Command(BaseCommand):
+    help = 'Queue resized variants for candidate photos and party logos that do not have them yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--now', action='store_true', help='Build the variants here instead of queueing jobs')
+
+    def handle(self, *args, **options):
+        total = 0
+        for label, field_name in TRACKED_FIELDS.items():
+            model = apps.get_model(label)
+            rows = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            for instance in rows.iterator():
+                if not needs_variants(instance, field_name):
+                    continue
+                if options['now']:
+                    generate_variants_for(label, instance.pk, field_name)
+                else:
+                    queue_variants(instance, field_name, retry_failed=True)
+                total += 1
+        action = 'Built' if options['now'] else 'Queued'
+        self.stdout.write(self.style.SUCCESS(f'{action} variants for {total} image(s)'))
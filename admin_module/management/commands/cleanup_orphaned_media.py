@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from E_Botar.services.orphaned_media import BATCH_SIZE, DEFAULT_MIN_AGE, reconcile_media
+
+
+class Command(BaseCommand):
+    help = 'Quarantine (or delete) uploaded media files that no database row references'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report the orphaned files')
+        parser.add_argument('--delete', action='store_true', help='Delete orphaned files instead of quarantining them')
+        parser.add_argument('--min-age', type=int, default=DEFAULT_MIN_AGE,
+                            help='Ignore files modified within this many seconds')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Files moved or deleted per batch')
+        parser.add_argument('--workers', type=int, default=None, help='Directory scanning threads')
+
+    def handle(self, *args, **options):
+        result = reconcile_media(
+            dry_run=options['dry_run'],
+            quarantine=not options['delete'],
+            min_age=options['min_age'],
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+        )
+        self.stdout.write(
+            f'Scanned {result.scanned} files against {result.referenced} referenced names; '
+            f'{result.skipped_recent} recent file(s) skipped'
+        )
+        for name in result.sample:
+            self.stdout.write(f'  {name}')
+        if result.orphaned > len(result.sample):
+            self.stdout.write(f'  ... and {result.orphaned - len(result.sample)} more')
+        for error in result.errors:
+            self.stderr.write(error)
+        if options['dry_run']:
+            self.stdout.write(
+                f'{result.orphaned} orphaned file(s) would be {result.action}d, '
+                f'reclaiming {filesizeformat(result.orphaned_bytes)}'
+            )
+            return
+        destination = f' into {result.quarantine_dir}' if result.quarantine_dir else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.action.capitalize()}d {result.reclaimed} orphaned file(s){destination} in {result.batches} '
+            f'batch(es), reclaiming {filesizeformat(result.reclaimed_bytes)}'
+        ))
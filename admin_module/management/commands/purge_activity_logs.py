@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from E_Botar.services.log_archive import archive_dir, purge_expired_logs
+
+
+class Command(BaseCommand):
+    help = 'Archive activity logs past the retention period to monthly gzip segments and delete them in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ACTIVITY_LOG_RETENTION_DAYS,
+                            help='Keep this many days of activity logs in the database')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows archived and deleted per transaction')
+        parser.add_argument('--sleep', type=float, default=0.0, help='Seconds to pause between chunks')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be archived')
+        parser.add_argument('--no-archive', action='store_true', help='Delete expired rows without archiving them')
+
+    def handle(self, *args, **options):
+        result = purge_expired_logs(
+            days=options['days'],
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+            pause=options['sleep'],
+            archive=not options['no_archive'],
+        )
+        if result.skipped:
+            self.stdout.write(self.style.WARNING('Activity log retention is already running in another process'))
+            return
+        cutoff = f'{result.cutoff:%Y-%m-%d %H:%M}'
+        if options['dry_run']:
+            self.stdout.write(
+                f'{result.archived} activity logs older than {cutoff} would be archived '
+                f'into {len(result.segments)} segment(s): {", ".join(result.segments) or "-"}'
+            )
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {result.deleted} activity logs older than {cutoff} in {result.chunks} chunk(s); '
+            f'archived {result.archived} to {archive_dir()}'
+        ))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from E_Botar.services.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute the dashboard counters from the real tables'
+
+    def handle(self, *args, **options):
+        for name, value in sorted(reconcile_counters().items()):
+            self.stdout.write(f'{name}: {value}')
+        self.stdout.write(self.style.SUCCESS('Counters reconciled'))
@@ -0,0 +1,95 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from admin_module.models import Job
+from E_Botar.services.jobs import claim_next_job, default_worker_id, fail_stale_jobs, run_job
+from E_Botar.services.anomaly_detection import run_detector
+from E_Botar.services.counters import reconcile_counters
+from E_Botar.services.log_archive import purge_expired_logs
+
+# Seconds between housekeeping passes (job purge, activity log retention)
+HOUSEKEEPING_INTERVAL = 24 * 60 * 60
+# Seconds between checks for jobs abandoned by a stopped worker
+STALE_CHECK_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (bulk imports, user generation, result generation, notifications)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process the queue until empty, then exit')
+        parser.add_argument('--sleep', type=float, default=2.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--max-jobs', type=int, default=0, help='Exit after this many jobs (0 = unlimited)')
+        parser.add_argument('--purge-days', type=int, default=30, help='Delete finished jobs older than this many days, daily (0 = keep)')
+        parser.add_argument('--no-log-retention', action='store_true', help='Do not archive expired activity logs daily')
+        parser.add_argument('--no-anomaly-detection', action='store_true', help='Do not run the security anomaly detector while idle')
+
+    def housekeeping(self, options):
+        if options['purge_days']:
+            cutoff = timezone.now() - timedelta(days=options['purge_days'])
+            purged, _ = Job.objects.filter(status__in=['completed', 'failed'], finished_at__lt=cutoff).delete()
+            if purged:
+                self.stdout.write(f'Purged {purged} finished jobs')
+        if not options['no_log_retention']:
+            result = purge_expired_logs()
+            if result.deleted:
+                self.stdout.write(f'Archived {result.deleted} expired activity logs')
+
+    def detect_anomalies(self):
+        try:
+            result = run_detector()
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'Anomaly detection failed: {e}'))
+            return
+        if result.alerts:
+            self.stdout.write(self.style.WARNING(f'Raised {len(result.alerts)} security alerts'))
+
+    def handle(self, *args, **options):
+        worker_id = default_worker_id()
+        processed = 0
+
+        fail_stale_jobs()
+        self.housekeeping(options)
+        reconcile_counters()
+        last_housekeeping = last_reconcile = last_stale_check = time.monotonic()
+        last_detection = 0.0
+
+        self.stdout.write(f'Job worker {worker_id} started')
+        while True:
+            close_old_connections()
+            job = claim_next_job(worker_id)
+            if job is None:
+                if options['once']:
+                    break
+                if time.monotonic() - last_stale_check > STALE_CHECK_INTERVAL:
+                    fail_stale_jobs()
+                    last_stale_check = time.monotonic()
+                if time.monotonic() - last_housekeeping > HOUSEKEEPING_INTERVAL:
+                    self.housekeeping(options)
+                    last_housekeeping = time.monotonic()
+                if time.monotonic() - last_reconcile > settings.COUNTER_RECONCILE_SECONDS:
+                    reconcile_counters()
+                    last_reconcile = time.monotonic()
+                if not options['no_anomaly_detection'] and time.monotonic() - last_detection > settings.SECURITY_DETECTOR_INTERVAL:
+                    self.detect_anomalies()
+                    last_detection = time.monotonic()
+                time.sleep(options['sleep'])
+                continue
+
+            self.stdout.write(f'Running {job}')
+            job = run_job(job)
+            if job.status == 'completed':
+                self.stdout.write(self.style.SUCCESS(f'Finished {job}'))
+            else:
+                self.stdout.write(self.style.ERROR(f'Failed {job}: {job.error.splitlines()[0] if job.error else ""}'))
+
+            processed += 1
+            if options['max_jobs'] and processed >= options['max_jobs']:
+                break
+
+        self.stdout.write(f'Processed {processed} jobs')
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_module', '0002_systemcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaintenanceLease',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('holder', models.CharField(blank=True, max_length=150)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Maintenance Lease',
+                'verbose_name_plural': 'Maintenance Leases',
+            },
+        ),
+    ]
@@ -5,10 +5,11 @@ from auth_module.models import UserProfile, ActivityLog
 from candidate_module.models import Candidate, CandidateApplication
 from election_module.models import SchoolElection, SchoolPosition, Party
 from voting_module.models import SchoolVote, VoteReceipt
-from E_Botar.utils.logging_utils import log_activity
+from E_Botar.utils.logging_utils import audit_signal, log_activity
 
 
 @receiver(post_save, sender=UserProfile)
+@audit_signal
 def log_user_profile_created(sender, instance, created, **kwargs):
     """Log when a user profile is created or updated"""
     if created:
@@ -30,6 +31,7 @@ def log_user_profile_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=Candidate)
+@audit_signal
 def log_candidate_created(sender, instance, created, **kwargs):
     """Log when a candidate is created or updated"""
     if created:
@@ -51,6 +53,7 @@ def log_candidate_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=CandidateApplication)
+@audit_signal
 def log_application_status_change(sender, instance, created, **kwargs):
     """Log when an application status changes"""
     if not created:  # Only log updates, not creation
@@ -64,6 +67,7 @@ def log_application_status_change(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=SchoolElection)
+@audit_signal
 def log_election_status_change(sender, instance, created, **kwargs):
     """Log when an election status changes"""
     if not created:  # Only log updates, not creation
@@ -77,6 +81,7 @@ def log_election_status_change(sender, instance, created, **kwargs):
 
 
 @receiver(post_delete, sender=UserProfile)
+@audit_signal
 def log_user_profile_deleted(sender, instance, **kwargs):
     """Log when a user profile is deleted"""
     log_activity(
@@ -89,6 +94,7 @@ def log_user_profile_deleted(sender, instance, **kwargs):
 
 
 @receiver(post_delete, sender=Candidate)
+@audit_signal
 def log_candidate_deleted(sender, instance, **kwargs):
     """Log when a candidate is deleted"""
     log_activity(
@@ -101,6 +107,7 @@ def log_candidate_deleted(sender, instance, **kwargs):
 
 
 @receiver(post_delete, sender=SchoolElection)
+@audit_signal
 def log_election_deleted(sender, instance, **kwargs):
     """Log when an election is deleted"""
     log_activity(
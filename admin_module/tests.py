@@ -252,3 +252,945 @@ class ActivityLogTestCase(AdminModuleTestCase):
         self.assertEqual(ActivityLog.objects.count(), initial_count + 1)
         self.assertIsNone(log.user)
         self.assertEqual(log.action_type, 'system_action')
+
+
+class BulkUserGenerationTestCase(TestCase):
+    def setUp(self):
+        self.department = Department.objects.create(name="Computer Science", code="CS")
+        self.course = Course.objects.create(department=self.department, name="Software Engineering", code="SE101")
+    
+    def test_generates_unique_users_in_batches(self):
+        """Users and profiles are bulk inserted with a fixed number of queries"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from E_Botar.services.user_generation import BulkUserGenerator
+        
+        generator = BulkUserGenerator(
+            count=60,
+            password='password123',
+            department=self.department,
+            course=self.course,
+            batch_size=20,
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            result = generator.run()
+        
+        self.assertEqual(result['created'], 60)
+        self.assertEqual(User.objects.count(), 60)
+        self.assertEqual(UserProfile.objects.filter(course=self.course, is_verified=True).count(), 60)
+        student_ids = list(UserProfile.objects.values_list('student_id', flat=True))
+        self.assertEqual(len(set(student_ids)), 60)
+        # A fixed handful of queries per batch of 20, not two or more per user
+        self.assertLess(len(ctx.captured_queries), 40)
+    
+    def test_rejects_count_above_limit(self):
+        from E_Botar.services.user_generation import BulkUserGenerator, BULK_USER_MAX
+        
+        with self.assertRaises(ValueError):
+            BulkUserGenerator(count=BULK_USER_MAX + 1, password='password123')
+
+
+class BackgroundJobTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="jobadmin", password="admin123", is_staff=True)
+        self.department = Department.objects.create(name="Computer Science", code="CS")
+    
+    def test_queued_job_is_claimed_once_and_run(self):
+        from admin_module.models import Job
+        from E_Botar.services.jobs import enqueue, claim_next_job, run_job
+        
+        csv_text = "name,code,department_code,description\nSoftware Engineering,se101,cs,\nMissing,XX,NOPE,\n"
+        job = enqueue('course_import', {'csv_text': csv_text}, user=self.admin)
+        self.assertEqual(job.status, 'queued')
+        
+        claimed = claim_next_job('test-worker')
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.status, 'running')
+        self.assertIsNone(claim_next_job('other-worker'))
+        
+        run_job(claimed)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.result['imported'], 1)
+        self.assertEqual(len(job.result['errors']), 1)
+        self.assertEqual(job.percent, 100)
+        self.assertTrue(Course.objects.filter(code='SE101', department=self.department).exists())
+        
+        self.client.force_login(self.admin)
+        response = self.client.get(f'/admin-ui/jobs/{job.pk}/status/')
+        self.assertEqual(response.json()['status'], 'completed')
+    
+    def test_bulk_import_never_stores_plaintext_passwords(self):
+        import json
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.urls import reverse
+        from admin_module.models import Job
+        from E_Botar.services.jobs import claim_next_job, run_job
+        
+        csv_text = "username,email,first_name,last_name,password\nnewbie,newbie@example.com,New,Bie,S3cret-pass!\n"
+        self.client.force_login(self.admin)
+        self.client.post(reverse('admin_module:bulk_user_import'), {
+            'csv_file': SimpleUploadedFile('users.csv', csv_text.encode('utf-8'), content_type='text/csv'),
+            'update_existing': 'on',
+            'overwrite_data': 'on',
+        })
+        job = Job.objects.get(job_type='bulk_user_import')
+        self.assertNotIn('S3cret-pass!', json.dumps(job.payload))
+        
+        job = claim_next_job('test-worker')
+        run_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.result['created'], 1)
+        self.assertNotIn('password', job.result['results'][0])
+        self.assertTrue(User.objects.get(username='newbie').check_password('S3cret-pass!'))
+    
+    def test_jobs_abandoned_by_a_stopped_worker_are_failed(self):
+        from datetime import timedelta
+        from admin_module.models import Job
+        from E_Botar.services.jobs import fail_stale_jobs
+        
+        started = timezone.now() - timedelta(hours=2)
+        stale = Job.objects.create(job_type='course_import', status='running', started_at=started)
+        silent = Job.objects.create(
+            job_type='course_import', status='running', started_at=started, heartbeat_at=started + timedelta(minutes=5)
+        )
+        # Long-running but still beating
+        healthy = Job.objects.create(
+            job_type='course_import', status='running', started_at=started, heartbeat_at=timezone.now()
+        )
+        fresh = Job.objects.create(job_type='course_import', status='running', started_at=timezone.now())
+        self.assertEqual(fail_stale_jobs(max_age=600), 2)
+        for job in (stale, silent, healthy, fresh):
+            job.refresh_from_db()
+        self.assertEqual(
+            [job.status for job in (stale, silent, healthy, fresh)], ['failed', 'failed', 'running', 'running']
+        )
+        self.assertIsNotNone(stale.finished_at)
+    
+    def test_job_failed_as_stale_is_not_completed_by_its_worker(self):
+        from admin_module.models import Job
+        from E_Botar.services.jobs import _mark_running, run_job
+        
+        job = Job.objects.create(job_type='course_import', payload={'csv_text': 'code,name\nBSIT,IT\n'})
+        _mark_running(job, 'slow-worker')
+        # Another worker judged it stale meanwhile
+        Job.objects.filter(pk=job.pk).update(status='failed', error='stale')
+        run_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), ('failed', 'stale'))
+    
+    def test_failed_job_records_error(self):
+        from admin_module.models import Job
+        from E_Botar.services.jobs import run_job
+        
+        job = Job.objects.create(job_type='generate_results', status='running', payload={'election_id': 0})
+        run_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('does not exist', job.error)
+
+
+class KeysetPaginationTestCase(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        # Duplicate timestamps make sure the id tie-breaker is respected
+        self.logs = [
+            ActivityLog.objects.create(action='system_action', description=f'log {i}', timestamp=now - timezone.timedelta(minutes=i // 2))
+            for i in range(7)
+        ]
+    
+    def test_walks_forward_and_back_without_gaps(self):
+        from E_Botar.utils.pagination import KeysetPaginator
+        
+        paginator = KeysetPaginator(ActivityLog.objects.all(), 3, ordering=('-timestamp', '-id'))
+        expected = list(ActivityLog.objects.order_by('-timestamp', '-id'))
+        
+        first = paginator.get_page()
+        second = paginator.get_page(first.next_cursor)
+        third = paginator.get_page(second.next_cursor)
+        self.assertEqual(list(first) + list(second) + list(third), expected)
+        self.assertFalse(first.has_previous())
+        self.assertFalse(third.has_next())
+        
+        back = paginator.get_page(third.previous_cursor)
+        self.assertEqual(list(back), list(second))
+        self.assertTrue(back.has_previous())
+        self.assertEqual(list(paginator.get_page('not-a-cursor')), list(first))
+    
+    def test_activity_logs_view_uses_cursor(self):
+        admin = User.objects.create_user(username="keysetadmin", password="admin123", is_staff=True)
+        self.client.force_login(admin)
+        response = self.client.get('/admin-ui/activity-logs/')
+        page = response.context['page_obj']
+        self.assertEqual(len(page), 7)
+        self.assertFalse(page.has_other_pages())
+    
+    def test_candidates_list_renders_cursor_links(self):
+        admin = User.objects.create_user(username="keysetadmin", password="admin123", is_staff=True)
+        now = timezone.now()
+        election = SchoolElection.objects.create(title="SY 2025", start_date=now, end_date=now + timezone.timedelta(days=1))
+        position = SchoolPosition.objects.create(name="President")
+        for i in range(21):
+            user = User.objects.create(username=f"running{i}")
+            application = CandidateApplication.objects.create(
+                user=user, position=position, election=election, manifesto="m", status='approved'
+            )
+            Candidate.objects.create(
+                user=user, position=position, election=election, manifesto="m", approved_application=application
+            )
+        
+        self.client.force_login(admin)
+        response = self.client.get('/admin-ui/candidates/')
+        self.assertTemplateUsed(response, 'Static/_keyset_pagination.html')
+        self.assertContains(response, 'aria-label="Candidates pagination"')
+        self.assertContains(response, response.context['page_obj'].next_query.replace('&', '&amp;'))
+
+
+class BulkOperationTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="bulkadmin", password="admin123", is_staff=True)
+    
+    def test_per_row_audit_logging_is_coalesced(self):
+        from E_Botar.utils.logging_utils import bulk_operation
+        
+        initial_count = ActivityLog.objects.count()
+        # One INSERT per party plus a single summary entry, no per-row log writes
+        with self.assertNumQueries(6):
+            with bulk_operation('Seeded parties', user=self.user, action='admin_action'):
+                for i in range(5):
+                    Party.objects.create(name=f"Party {i}")
+        
+        self.assertEqual(ActivityLog.objects.count(), initial_count + 1)
+        summary = ActivityLog.objects.latest('id')
+        self.assertEqual(summary.description, 'Seeded parties')
+        self.assertEqual(summary.additional_data['changes'], {'election_module.Party': {'created': 5}})
+    
+    def test_election_delete_logs_one_summary_entry(self):
+        election = SchoolElection.objects.create(
+            title="Doomed Election",
+            start_date=timezone.now(),
+            end_date=timezone.now(),
+            created_by=self.user
+        )
+        position = SchoolPosition.objects.create(name="Treasurer")
+        for i in range(3):
+            candidate_user = User.objects.create_user(username=f"doomed{i}")
+            application = CandidateApplication.objects.create(
+                user=candidate_user,
+                position=position,
+                election=election,
+                status='approved'
+            )
+            Candidate.objects.create(user=candidate_user, position=position, election=election, approved_application=application)
+        
+        self.client.force_login(self.user)
+        initial_count = ActivityLog.objects.count()
+        self.client.post('/elections/delete/', {'election_id': election.id})
+        
+        self.assertFalse(SchoolElection.objects.filter(id=election.id).exists())
+        self.assertEqual(ActivityLog.objects.count(), initial_count + 1)
+        changes = ActivityLog.objects.latest('id').additional_data['changes']
+        # SchoolElection has two delete receivers but is counted once
+        self.assertEqual(changes['election_module.SchoolElection'], {'deleted': 1})
+        self.assertEqual(changes['candidate_module.Candidate'], {'deleted': 3})
+
+
+class ActivityLogRetentionTestCase(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+        from django.test import override_settings
+        
+        self.archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.archive_dir, True)
+        settings_override = override_settings(ACTIVITY_LOG_ARCHIVE_DIR=self.archive_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        
+        self.user = User.objects.create_user(username="retained", password="admin123", is_staff=True)
+        aware = lambda *args: timezone.make_aware(timezone.datetime(*args))
+        self.expired = [
+            ActivityLog.objects.create(user=self.user, action='login', description='january login', timestamp=aware(2024, 1, 15, 9)),
+            ActivityLog.objects.create(user=self.user, action='vote', description='january vote', timestamp=aware(2024, 1, 31, 23, 30)),
+            ActivityLog.objects.create(action='system_action', description='february job', timestamp=aware(2024, 2, 1, 0, 30)),
+        ]
+        self.recent = ActivityLog.objects.create(user=self.user, action='login', description='fresh login')
+    
+    def test_expired_rows_are_archived_by_month_then_deleted(self):
+        from E_Botar.services.log_archive import iter_archived_logs, list_segments, purge_expired_logs
+        
+        dry = purge_expired_logs(days=90, dry_run=True)
+        self.assertEqual((dry.archived, dry.segments), (3, ('2024-01', '2024-02')))
+        self.assertEqual(ActivityLog.objects.count(), 4)
+        
+        result = purge_expired_logs(days=90, chunk_size=2)
+        self.assertEqual((result.archived, result.deleted, result.chunks), (3, 3, 2))
+        self.assertEqual(list(ActivityLog.objects.all()), [self.recent])
+        self.assertEqual([s['month'] for s in list_segments()], ['2024-02', '2024-01'])
+        
+        descriptions = [e['description'] for e in iter_archived_logs()]
+        self.assertEqual(descriptions, ['february job', 'january login', 'january vote'])
+        self.assertEqual([e['description'] for e in iter_archived_logs(action='vote')], ['january vote'])
+        self.assertEqual([e['description'] for e in iter_archived_logs(username='retained', month_to='2024-01')],
+                         ['january login', 'january vote'])
+        
+        # Nothing left to do on a second run
+        self.assertEqual(purge_expired_logs(days=90).deleted, 0)
+    
+    def test_overlapping_purges_do_not_both_archive(self):
+        import gzip
+        import os
+        from unittest import mock
+        from E_Botar.services import log_archive
+        
+        overlapping = []
+        append_segments = log_archive._append_segments
+        
+        def append_then_overlap(directory, rows):
+            written = append_segments(directory, rows)
+            # A second worker starts retention while the first is mid-run
+            overlapping.append(log_archive.purge_expired_logs(days=90, chunk_size=1))
+            return written
+        
+        with mock.patch.object(log_archive, '_append_segments', side_effect=append_then_overlap):
+            result = log_archive.purge_expired_logs(days=90, chunk_size=1)
+        self.assertEqual(result.archived, 3)
+        self.assertTrue(overlapping and all(r.skipped and r.archived == 0 for r in overlapping))
+        
+        archived = []
+        for name in os.listdir(self.archive_dir):
+            with gzip.open(os.path.join(self.archive_dir, name), 'rt') as lines:
+                archived += [line for line in lines if line.strip()]
+        self.assertEqual(len(archived), 3)
+        # The lease is released, so the next run proceeds
+        self.assertFalse(log_archive.purge_expired_logs(days=90).skipped)
+    
+    def test_purge_stops_once_its_lease_is_taken_over(self):
+        from unittest import mock
+        from admin_module.models import MaintenanceLease
+        from E_Botar.services import log_archive
+        
+        append_segments = log_archive._append_segments
+        
+        def append_then_lose_lease(directory, rows):
+            # Our lease expired mid-run and another worker claimed it
+            MaintenanceLease.objects.filter(name=log_archive.LEASE_NAME).update(holder='other-worker')
+            return append_segments(directory, rows)
+        
+        with mock.patch.object(log_archive, '_append_segments', side_effect=append_then_lose_lease):
+            result = log_archive.purge_expired_logs(days=90, chunk_size=1)
+        self.assertEqual((result.archived, result.deleted, result.chunks), (1, 1, 1))
+        self.assertEqual(ActivityLog.objects.count(), 3)
+        # The other worker's lease is left alone
+        self.assertEqual(MaintenanceLease.objects.get(name=log_archive.LEASE_NAME).holder, 'other-worker')
+    
+    def test_archive_browser_filters_segments(self):
+        from E_Botar.services.log_archive import purge_expired_logs
+        
+        purge_expired_logs(days=90)
+        self.client.force_login(self.user)
+        response = self.client.get('/admin-ui/activity-logs/archive/', {'q': 'JANUARY'})
+        self.assertEqual([e['description'] for e in response.context['entries']], ['january login', 'january vote'])
+        self.assertFalse(response.context['has_next'])
+
+
+class UserExportTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="exportadmin", password="admin123", is_staff=True)
+        department = Department.objects.create(name="Engineering", code="ENG")
+        course = Course.objects.create(department=department, name="Civil Engineering", code="BSCE")
+        for i in range(3):
+            user = User.objects.create_user(username=f"student{i}", email=f"s{i}@school.edu", first_name="Stu", last_name=f"Dent{i}")
+            UserProfile.objects.create(user=user, department=department, course=course, year_level="1st Year")
+    
+    def test_rows_are_read_with_one_joined_query(self):
+        from E_Botar.services.user_export import FULL_COLUMNS, iter_user_csv
+        
+        with self.assertNumQueries(1):
+            lines = list(iter_user_csv(FULL_COLUMNS, chunk_size=2))
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith('username,email,'))
+        self.assertIn('student2,s2@school.edu,Stu,Dent2,', lines[3])
+        self.assertIn(',Engineering,ENG,Civil Engineering,BSCE,', lines[3])
+    
+    def test_export_view_streams_csv(self):
+        self.client.force_login(self.admin)
+        response = self.client.get('/admin-ui/users/export/')
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(content[0], 'Username,Email,First Name,Last Name,Student ID,Department,Course,Year Level,Phone Number,Verified')
+        self.assertEqual(len(content), 4)
+
+
+class ReferenceImportTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="importadmin", password="admin123", is_staff=True)
+        self.cs = Department.objects.create(name="Computer Science", code="CS", description="Old description")
+        self.eng = Department.objects.create(name="Engineering", code="ENG")
+        Course.objects.create(department=self.cs, name="Software Engineering", code="SE101")
+    
+    def test_department_plan_is_a_diff_and_applies_in_one_upsert(self):
+        from E_Botar.services.reference_import import apply_plan, plan_department_import
+        
+        csv_text = (
+            "name,code,description\n"
+            "Computer Science,cs,New description\n"
+            "Engineering,ENG,\n"
+            "Nursing,NUR,Health sciences\n"
+            "Nursing Again,nur,\n"
+            "Engineering,ARCH,\n"
+            ",X,\n"
+        )
+        with self.assertNumQueries(1):
+            plan = plan_department_import(csv_text)
+        self.assertEqual([c.key for c in plan.created], ['NUR'])
+        self.assertEqual([c.key for c in plan.updated], ['CS'])
+        self.assertEqual(plan.updated[0].changes, {'description': ('Old description', 'New description')})
+        self.assertEqual([c.key for c in plan.unchanged], ['ENG'])
+        self.assertEqual(len(plan.errors), 3)
+        self.assertEqual(Department.objects.count(), 2)
+        
+        # One upsert statement (inside its own savepoint)
+        with self.assertNumQueries(3):
+            apply_plan(plan)
+        self.cs.refresh_from_db()
+        self.assertEqual(self.cs.description, 'New description')
+        self.assertEqual(Department.objects.get(code='NUR').name, 'Nursing')
+        self.assertEqual(Department.objects.count(), 3)
+    
+    def test_course_import_previews_then_applies_on_confirm(self):
+        from django.test import override_settings
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        
+        csv_text = (
+            "name,code,department_code,description\n"
+            "Software Engineering,se101,cs,\n"
+            "Civil Engineering,CE101,eng,Structures\n"
+            "Unknown,XX1,NOPE,\n"
+        )
+        self.client.force_login(self.admin)
+        upload = SimpleUploadedFile('courses.csv', csv_text.encode('utf-8'), content_type='text/csv')
+        response = self.client.post('/admin-ui/courses/import-csv/', {'csv_file': upload})
+        self.assertEqual(response.context['summary'], {'created': 1, 'updated': 0, 'unchanged': 1, 'errors': 1})
+        self.assertFalse(Course.objects.filter(code='CE101').exists())
+        
+        with override_settings(JOBS_RUN_EAGERLY=True):
+            response = self.client.post('/admin-ui/courses/import-csv/', {'confirm': '1'})
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Course.objects.filter(code='CE101', department=self.eng, description='Structures').exists())
+        self.assertEqual(Course.objects.count(), 2)
+
+
+class SystemCounterTestCase(TestCase):
+    def setUp(self):
+        from E_Botar.services.counters import counter_cache, reconcile_counters
+        
+        self.department = Department.objects.create(name="Computer Science", code="CS")
+        reconcile_counters()
+        counter_cache.invalidate()
+    
+    def _create_profile(self, username, verified=False):
+        user = User.objects.create_user(username=username, password="pass12345")
+        return UserProfile.objects.create(user=user, department=self.department, is_verified=verified)
+    
+    def test_signals_keep_counters_in_step(self):
+        from E_Botar.services.counters import get_counters
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = self._create_profile("counted1")
+            self._create_profile("counted2", verified=True)
+        self.assertEqual(get_counters('users.total', 'users.verified'), {'users.total': 2, 'users.verified': 1})
+        
+        # Updating the filtered field moves the row between counters
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = UserProfile.objects.get(pk=profile.pk)
+            profile.is_verified = True
+            profile.save()
+        self.assertEqual(get_counters('users.verified'), {'users.verified': 2})
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.delete()
+        self.assertEqual(get_counters('users.total', 'users.verified'), {'users.total': 1, 'users.verified': 1})
+    
+    def test_bulk_delete_costs_one_update_per_counter(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from E_Botar.services.counters import get_counters
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(5):
+                self._create_profile(f"bulk{i}", verified=True)
+        
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                UserProfile.objects.filter(user__username__startswith="bulk").delete()
+        counter_updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE "admin_module_systemcounter"')]
+        self.assertEqual(len(counter_updates), 2)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(get_counters('users.total', 'users.verified'), {'users.total': 0, 'users.verified': 0})
+    
+    def test_savepoint_rollback_drops_only_its_own_deltas(self):
+        from django.db import transaction
+        from E_Botar.services.counters import get_counters
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_profile("outer1")
+            try:
+                with transaction.atomic():
+                    self._create_profile("rolled_back1", verified=True)
+                    with transaction.atomic():
+                        self._create_profile("rolled_back2")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            with transaction.atomic():
+                self._create_profile("released", verified=True)
+            self._create_profile("outer2")
+        self.assertEqual(get_counters('users.total', 'users.verified'), {'users.total': 3, 'users.verified': 1})
+        self.assertEqual(UserProfile.objects.count(), 3)
+        
+        # A later transaction starts from a clean batch
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_profile("later")
+        self.assertEqual(get_counters('users.total'), {'users.total': 4})
+    
+    def test_row_that_matched_no_counter_is_not_decremented_on_delete(self):
+        from security_module.models import AccessAttempt
+        from E_Botar.services.counters import get_counter, reconcile_counters
+        
+        attempt = AccessAttempt.objects.create(username="ok", ip_address="10.0.0.1", success=True)
+        reconcile_counters(['security.failed_logins'])
+        attempt = AccessAttempt.objects.get(pk=attempt.pk)
+        # Changed in memory only; the stored row never counted as a failure
+        attempt.success = False
+        with self.captureOnCommitCallbacks(execute=True):
+            attempt.delete()
+        self.assertEqual(get_counter('security.failed_logins'), 0)
+    
+    def test_reconcile_repairs_drift_and_reads_are_cached(self):
+        from E_Botar.services.counters import counter_cache, get_counter, reconcile_counters
+        
+        self._create_profile("drift1", verified=True)
+        self._create_profile("drift2", verified=True)
+        # Queryset updates fire no signals
+        UserProfile.objects.update(is_verified=False)
+        self.assertEqual(reconcile_counters(['users.total', 'users.verified']), {'users.total': 2, 'users.verified': 0})
+        
+        counter_cache.invalidate()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_counter('users.total'), 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_counter('users.verified'), 0)
+
+
+class ApplicationsStatusCacheTestCase(TestCase):
+    def setUp(self):
+        from E_Botar.services.election_calendar import invalidate_election_calendar
+        invalidate_election_calendar()
+    
+    def test_cached_until_start_date_or_change(self):
+        from datetime import timedelta
+        from E_Botar.services.election_calendar import applications_available
+        
+        now = timezone.now()
+        with self.assertNumQueries(1):
+            self.assertFalse(applications_available(now))
+        with self.assertNumQueries(0):
+            self.assertFalse(applications_available(now))
+        
+        # Saving an election invalidates the cached answer
+        with self.captureOnCommitCallbacks(execute=True):
+            election = SchoolElection.objects.create(
+                title="Upcoming", start_date=now + timedelta(days=2), end_date=now + timedelta(days=3)
+            )
+        self.assertTrue(applications_available(now))
+        with self.assertNumQueries(0):
+            self.assertTrue(applications_available(now + timedelta(days=1)))
+        # ... and the answer flips exactly when the election starts, from the loaded rows
+        with self.assertNumQueries(0):
+            self.assertFalse(applications_available(election.start_date))
+    
+    def test_calendar_classifies_and_reclassifies_at_boundaries(self):
+        from datetime import timedelta
+        from E_Botar.services.election_calendar import ElectionCalendar
+        
+        now = timezone.now()
+        past = SchoolElection(title="Past", start_date=now - timedelta(days=3), end_date=now - timedelta(days=2))
+        running = SchoolElection(title="Running", start_date=now - timedelta(hours=1), end_date=now + timedelta(hours=1))
+        soon = SchoolElection(title="Soon", start_date=now + timedelta(days=1), end_date=now + timedelta(days=2))
+        hidden = SchoolElection(title="Hidden", start_date=now - timedelta(hours=1), end_date=now + timedelta(hours=1), is_active=False)
+        
+        calendar = ElectionCalendar([past, running, soon, hidden], now)
+        self.assertEqual(calendar.current, [running])
+        self.assertEqual(calendar.completed, [past])
+        self.assertEqual(calendar.upcoming, [soon])
+        self.assertEqual(calendar.open_election, running)
+        self.assertEqual(calendar.status(hidden), 'inactive')
+        # Valid through running's end_date, reclassified just after it
+        self.assertIs(calendar.at(running.end_date), calendar)
+        later = calendar.at(running.end_date + timedelta(seconds=1))
+        self.assertEqual(later.current, [])
+        # Ended elections count as completed whether or not they are still active
+        self.assertEqual(later.completed, [running, hidden, past])
+        self.assertEqual(later.status(hidden), 'completed')
+        self.assertEqual(later.open_election, soon)
+    
+    def test_election_ended_now_still_shows_its_winners_on_home(self):
+        from datetime import timedelta
+        from election_module.models import ElectionPosition
+        
+        admin = User.objects.create_user(username="ender", password="admin123", is_staff=True)
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            election = SchoolElection.objects.create(
+                title="SY 2030-2031", start_date=now - timedelta(days=1), end_date=now + timedelta(days=1)
+            )
+        position = SchoolPosition.objects.create(name="President")
+        ElectionPosition.objects.create(election=election, position=position)
+        winner = User.objects.create_user(username="winner", first_name="Wendy", password="pass12345")
+        application = CandidateApplication.objects.create(
+            user=winner, position=position, election=election, manifesto="m", status='approved'
+        )
+        candidate = Candidate.objects.create(
+            user=winner, position=position, election=election, manifesto="m", approved_application=application
+        )
+        SchoolVote.objects.create(voter=admin, candidate=candidate, position=position, election=election, receipt_code="R1")
+        
+        self.client.force_login(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/elections/end-now/', {'election_id': election.pk})
+        election.refresh_from_db()
+        self.assertFalse(election.is_active)
+        
+        self.client.logout()
+        response = self.client.get('/')
+        self.assertEqual(response.context['completed_election'], election)
+        self.assertEqual(response.context['administration_year'], '2030-2031')
+        self.assertEqual([w['candidate'] for w in response.context['previous_election_winners']], [candidate])
+    
+    def test_each_read_gets_its_own_election_instances(self):
+        from datetime import timedelta
+        from E_Botar.services.election_calendar import get_election_calendar
+        
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            SchoolElection.objects.create(title="Running", start_date=now - timedelta(hours=1), end_date=now + timedelta(hours=1))
+        first = get_election_calendar(now).current_election
+        first.title = "Modified by one request"
+        first.user_has_voted = True
+        
+        with self.assertNumQueries(0):
+            second = get_election_calendar(now).current_election
+        self.assertEqual(second, first)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.title, "Running")
+        self.assertFalse(hasattr(second, 'user_has_voted'))
+    
+    def test_context_processor_costs_no_query_when_warm(self):
+        from django.test import RequestFactory
+        from E_Botar.context_processors import applications_status
+        
+        request = RequestFactory().get('/')
+        applications_status(request)
+        with self.assertNumQueries(0):
+            self.assertEqual(applications_status(request), {'applications_available': False})
+
+
+class CandidateEligibilityTestCase(TestCase):
+    def setUp(self):
+        from datetime import timedelta
+        now = timezone.now()
+        self.position = SchoolPosition.objects.create(name="President")
+        self.party = Party.objects.create(name="Blue")
+        self.alice = User.objects.create_user(username="alice", first_name="Alice", last_name="Cruz", password="pass12345")
+        self.bob = User.objects.create_user(username="bob", first_name="Bob", last_name="Reyes", password="pass12345")
+        self.last_year = SchoolElection.objects.create(
+            title="SY 2024", start_date=now - timedelta(days=365), end_date=now - timedelta(days=364)
+        )
+        self.this_year = SchoolElection.objects.create(
+            title="SY 2025", start_date=now + timedelta(days=1), end_date=now + timedelta(days=2)
+        )
+        application = CandidateApplication.objects.create(
+            user=self.alice, position=self.position, election=self.last_year, manifesto="m", status='approved'
+        )
+        Candidate.objects.create(
+            user=self.alice, position=self.position, election=self.last_year, manifesto="m",
+            approved_application=application,
+        )
+        application = CandidateApplication.objects.create(
+            user=self.bob, position=self.position, election=self.this_year, party=self.party,
+            manifesto="m", status='approved',
+        )
+        Candidate.objects.create(
+            user=self.bob, position=self.position, election=self.this_year, party=self.party, manifesto="m",
+            approved_application=application,
+        )
+    
+    def test_rules_are_set_lookups(self):
+        from django.core.exceptions import ValidationError
+        from E_Botar.services.candidate_eligibility import EligibilityIndex
+        
+        with self.assertNumQueries(3):
+            index = EligibilityIndex.for_elections([self.this_year])
+        self.assertTrue(index.is_barred(self.alice.pk, self.position.pk, self.this_year.pk))
+        self.assertFalse(index.is_barred(self.bob.pk, self.position.pk, self.this_year.pk))
+        self.assertEqual(index.slot_holder(self.party.pk, self.position.pk, self.this_year.pk, self.alice.pk), "Bob Reyes")
+        self.assertIsNone(index.slot_holder(self.party.pk, self.position.pk, self.this_year.pk, self.bob.pk))
+        
+        repeat = CandidateApplication(user=self.alice, position=self.position, election=self.this_year, manifesto="m")
+        with self.assertNumQueries(0), self.assertRaisesMessage(ValidationError, "You previously ran in SY 2024"):
+            repeat.clean(eligibility=index)
+        second = CandidateApplication(
+            user=self.alice, position=self.position, election=self.last_year, party=self.party, manifesto="m"
+        )
+        with self.assertRaisesMessage(ValidationError, "already has a candidate (Bob Reyes)"):
+            second.election = self.this_year
+            second.clean()
+        # Bob's own application passes both rules
+        CandidateApplication.objects.get(user=self.bob).clean()
+
+
+class TallyAnnotationTestCase(TestCase):
+    def setUp(self):
+        from datetime import timedelta
+        from voting_module.models import AnonVote
+        now = timezone.now()
+        self.election = SchoolElection.objects.create(
+            title="SY 2025", start_date=now - timedelta(days=1), end_date=now + timedelta(days=1)
+        )
+        self.position = SchoolPosition.objects.create(name="President")
+        self.candidates = []
+        for username in ("ana", "ben"):
+            user = User.objects.create_user(username=username, first_name=username.title(), password="pass12345")
+            application = CandidateApplication.objects.create(
+                user=user, position=self.position, election=self.election, manifesto="m", status='approved'
+            )
+            self.candidates.append(Candidate.objects.create(
+                user=user, position=self.position, election=self.election, manifesto="m",
+                approved_application=application,
+            ))
+        for candidate in (self.candidates[0], self.candidates[0], self.candidates[0], self.candidates[1]):
+            AnonVote.objects.create(election=self.election, position=self.position, candidate=candidate)
+        voter = User.objects.create_user(username="voter", password="pass12345")
+        UserProfile.objects.create(user=voter, is_verified=True)
+        VoteReceipt.objects.create(user=voter, election=self.election, receipt_code="R1", encrypted_receipt_code="x")
+    
+    def test_instance_methods_read_annotations(self):
+        with self.assertNumQueries(1):
+            candidates = list(Candidate.objects.with_tallies(self.election).order_by('user__username'))
+            self.assertEqual([c.vote_count() for c in candidates], [3, 1])
+            self.assertEqual([c.percentage() for c in candidates], [75.0, 25.0])
+        # Same answers without the annotation
+        self.assertEqual([c.percentage() for c in self.candidates], [75.0, 25.0])
+        
+        with self.assertNumQueries(1):
+            position = SchoolPosition.objects.with_totals(self.election).get(pk=self.position.pk)
+            self.assertEqual(position.total_votes(), 4)
+        with self.assertNumQueries(1):
+            election = SchoolElection.objects.with_turnout().get(pk=self.election.pk)
+            self.assertEqual(election.total_votes(), 1)
+            self.assertEqual(election.turnout(), 100.0)
+        self.assertEqual(self.election.turnout(), 100.0)
+    
+    def test_election_list_queries_do_not_grow_with_elections(self):
+        from datetime import timedelta
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        voter = User.objects.get(username="voter")
+        self.client.force_login(voter)
+        self.client.get('/elections/')
+        
+        with CaptureQueriesContext(connection) as one_election:
+            response = self.client.get('/elections/')
+        self.assertEqual(response.status_code, 200)
+        
+        now = timezone.now()
+        for year in (2026, 2027, 2028):
+            election = SchoolElection.objects.create(
+                title=f"SY {year}", start_date=now - timedelta(days=1), end_date=now + timedelta(days=1)
+            )
+            VoteReceipt.objects.create(user=voter, election=election, receipt_code=f"R{year}", encrypted_receipt_code="x")
+        with self.assertNumQueries(len(one_election)):
+            response = self.client.get('/elections/')
+        self.assertEqual([e.total_votes() for e in response.context['elections']], [1, 1, 1, 1])
+    
+    def test_tally_election_counts_every_candidate_in_one_query(self):
+        from E_Botar.services.analytics import tally_election
+        from election_module.models import ElectionPosition
+        ElectionPosition.objects.create(election=self.election, position=self.position)
+        
+        with self.assertNumQueries(2):
+            results = tally_election(self.election)
+        rows = results[self.position]['candidates']
+        self.assertEqual([(row['candidate'], row['vote_count'], row['percentage']) for row in rows], [
+            (self.candidates[0], 3, 75.0), (self.candidates[1], 1, 25.0),
+        ])
+        self.assertEqual(results[self.position]['total_votes'], 4)
+
+
+class ImageVariantTestCase(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+        from django.test import override_settings
+        
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root, JOBS_RUN_EAGERLY=True)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+    
+    def _upload(self, color):
+        import io
+        from PIL import Image
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        
+        output = io.BytesIO()
+        Image.new('RGBA', (600, 300), color).save(output, format='PNG')
+        return SimpleUploadedFile('logo.png', output.getvalue(), content_type='image/png')
+    
+    def test_upload_builds_hashed_variants_in_background_job(self):
+        from django.core.files.storage import default_storage
+        from django.template import Context, Template
+        from admin_module.models import Job
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            party = Party.objects.create(name="Blue", logo=self._upload((0, 0, 255, 128)))
+        self.assertTrue(Job.objects.filter(job_type='image_variants', status='completed').exists())
+        party.refresh_from_db()
+        variants = party.logo_variants
+        self.assertEqual(variants['source'], party.logo.name)
+        self.assertEqual((variants['thumb']['width'], variants['thumb']['height']), (96, 48))
+        self.assertEqual((variants['full']['width'], variants['full']['height']), (600, 300))
+        for variant in ('thumb', 'card', 'full'):
+            self.assertTrue(variants[variant]['webp'].endswith(f"{variants['hash']}-{variant}.webp"))
+            self.assertTrue(default_storage.exists(variants[variant]['jpeg']))
+        
+        html = Template("{% load image_variants %}{% picture party.logo 'thumb' alt=party.name %}").render(
+            Context({'party': party})
+        )
+        self.assertIn('type="image/webp"', html)
+        self.assertIn(f"{variants['hash']}-thumb.jpg", html)
+        
+        # Identical content maps to the same files; a replaced logo falls back to the original until rebuilt
+        with self.captureOnCommitCallbacks(execute=True):
+            twin = Party.objects.create(name="Red", logo=self._upload((0, 0, 255, 128)))
+        twin.refresh_from_db()
+        self.assertEqual(twin.logo_variants['thumb'], variants['thumb'])
+        Party.objects.filter(pk=twin.pk).update(logo='party_logos/other.png')
+        twin.refresh_from_db()
+        html = Template("{% load image_variants %}{% image_variant party.logo 'card' %}").render(Context({'party': twin}))
+        self.assertEqual(html, twin.logo.url)
+    
+    def test_saves_before_variants_exist_queue_one_job_per_upload(self):
+        import io
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.core.management import call_command
+        from django.test import override_settings
+        from admin_module.models import Job
+        
+        variant_jobs = Job.objects.filter(job_type='image_variants')
+        with override_settings(JOBS_RUN_EAGERLY=False):
+            with self.captureOnCommitCallbacks(execute=True):
+                party = Party.objects.create(name="Queued", logo=self._upload((0, 255, 0, 255)))
+            with self.captureOnCommitCallbacks(execute=True):
+                party.save()
+                party.save()
+        self.assertEqual(variant_jobs.filter(status='queued').count(), 1)
+        
+        # An upload Pillow cannot read fails once and is not retried on every save
+        with self.captureOnCommitCallbacks(execute=True):
+            broken = Party.objects.create(
+                name="Broken", logo=SimpleUploadedFile('logo.png', b'not an image', content_type='image/png')
+            )
+        for _ in range(3):
+            with self.captureOnCommitCallbacks(execute=True):
+                broken.save()
+        broken_jobs = variant_jobs.filter(payload__pk=broken.pk)
+        self.assertEqual(list(broken_jobs.values_list('status', flat=True)), ['failed'])
+        
+        # The management command retries it explicitly
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('build_image_variants', stdout=io.StringIO())
+        self.assertEqual(broken_jobs.count(), 2)
+
+
+class OrphanedMediaTestCase(TestCase):
+    def setUp(self):
+        import tempfile
+        import shutil
+        from django.test import override_settings
+        
+        self.media_root = tempfile.mkdtemp()
+        self.quarantine = tempfile.mkdtemp()
+        for path in (self.media_root, self.quarantine):
+            self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, ORPHANED_MEDIA_QUARANTINE_DIR=self.quarantine)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        
+        self.files = {
+            'party_logos/kept.png': 10,
+            'variants/party_logos/abc-thumb.webp': 20,
+            'candidate_photos/gone.jpg': 300,
+            'variants/candidate_photos/old-card.jpg': 40,
+            'profile_photos/new.jpg': 5,
+        }
+        for name, size in self.files.items():
+            self._write(name, size, age=None if name == 'profile_photos/new.jpg' else 2 * 60 * 60)
+        Party.objects.create(
+            name="Blue", logo='party_logos/kept.png',
+            logo_variants={'source': 'party_logos/kept.png', 'thumb': {'webp': 'variants/party_logos/abc-thumb.webp'}},
+        )
+    
+    def _write(self, name, size, age=None):
+        import os
+        import time
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as handle:
+            handle.write(b'x' * size)
+        if age:
+            os.utime(path, (time.time() - age, time.time() - age))
+    
+    def test_dry_run_then_quarantine(self):
+        import os
+        from E_Botar.services.orphaned_media import reconcile_media
+        
+        result = reconcile_media(dry_run=True, workers=2)
+        self.assertEqual(result.scanned, 5)
+        self.assertEqual(result.skipped_recent, 1)
+        self.assertEqual(sorted(result.sample), ['candidate_photos/gone.jpg', 'variants/candidate_photos/old-card.jpg'])
+        self.assertEqual(result.orphaned_bytes, 340)
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'candidate_photos/gone.jpg')))
+        
+        result = reconcile_media(dry_run=False, batch_size=1, workers=2)
+        self.assertEqual((result.reclaimed, result.reclaimed_bytes, result.batches), (2, 340, 2))
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, 'candidate_photos/gone.jpg')))
+        self.assertTrue(os.path.exists(os.path.join(result.quarantine_dir, 'candidate_photos/gone.jpg')))
+        for kept in ('party_logos/kept.png', 'variants/party_logos/abc-thumb.webp', 'profile_photos/new.jpg'):
+            self.assertTrue(os.path.exists(os.path.join(self.media_root, kept)))
+    
+    def test_variant_referenced_again_during_the_walk_is_kept(self):
+        import os
+        from unittest import mock
+        from E_Botar.services import orphaned_media
+        
+        snapshot = orphaned_media.referenced_names
+        
+        def snapshot_then_reupload():
+            names = snapshot()
+            # An identical image is uploaded after the snapshot and reuses the old content-addressed variant
+            Party.objects.create(
+                name="Green", logo='party_logos/green.png',
+                logo_variants={'source': 'party_logos/green.png', 'hash': 'old',
+                               'card': {'jpeg': 'variants/candidate_photos/old-card.jpg'}},
+            )
+            return names
+        
+        with mock.patch.object(orphaned_media, 'referenced_names', side_effect=snapshot_then_reupload):
+            result = orphaned_media.reconcile_media(dry_run=False, batch_size=1, workers=2)
+        self.assertEqual((result.orphaned, result.reclaimed, result.reclaimed_bytes), (1, 1, 300))
+        self.assertEqual(result.sample, ['candidate_photos/gone.jpg'])
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'variants/candidate_photos/old-card.jpg')))
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, 'candidate_photos/gone.jpg')))
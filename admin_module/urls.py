@@ -37,8 +37,13 @@ urlpatterns = [
     
     # System Management
     path('activity-logs/', views.activity_logs, name='activity_logs'),
+    path('activity-logs/archive/', views.activity_log_archive, name='activity_log_archive'),
     path('statistics/', views.system_statistics, name='system_statistics'),
     
+    # Background Jobs
+    path('jobs/<int:job_id>/', views.job_detail, name='job_detail'),
+    path('jobs/<int:job_id>/status/', views.job_status, name='job_status'),
+    
     # Analytics
     path('analytics/course/<int:election_id>/', views.course_analytics, name='course_analytics'),
     path('analytics/department/<int:election_id>/', views.department_analytics, name='department_analytics'),
@@ -3,25 +3,32 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
 from django.contrib.auth.models import User
-from django.http import JsonResponse, HttpResponse
+from django.contrib.auth.hashers import make_password
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.utils import timezone
-from django.db.models import Count, Q, Value, F
-from django.db.models.functions import Concat
+from django.db.models import Count, Q
 from django.core.paginator import Paginator
 from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import csv
 import json
-import random
 
 from auth_module.models import UserProfile, Department, Course, ActivityLog
 from candidate_module.models import Candidate, CandidateApplication
 from election_module.models import SchoolElection, SchoolPosition, Party
 from voting_module.models import SchoolVote, VoteReceipt
+from .models import Job
 from .forms import UserCreationForm, BulkUserImportForm, ElectionManagementForm, DepartmentForm, CourseForm, DepartmentCSVImportForm, CourseCSVImportForm
-from E_Botar.utils.logging_utils import log_activity
-from E_Botar.services.email import EmailService
+from E_Botar.utils.logging_utils import bulk_operation, log_activity
+from E_Botar.utils.pagination import paginate_keyset
+from E_Botar.services.jobs import enqueue
+from E_Botar.services.counters import get_counters
+from E_Botar.services.election_calendar import get_election_calendar
+from E_Botar.services.user_search import matching_user_ids, user_prefix_index
+from E_Botar.services.user_generation import (
+    BulkUserGenerator, BULK_USER_MAX, BULK_USER_SYNC_LIMIT, year_level_label,
+)
 
 
 @staff_member_required
@@ -59,21 +66,13 @@ def admin_dashboard(request):
     users = (
         UserProfile.objects
         .select_related('user', 'department', 'course')
-        .annotate(full_name=Concat(F('user__first_name'), Value(' '), F('user__last_name')))
         .order_by('-created_at')
     )
     
-    # Search functionality
+    # Search functionality (indexed name/username/email/student ID search)
     search_query = request.GET.get('search')
     if search_query:
-        users = users.filter(
-            Q(user__username__icontains=search_query) |
-            Q(user__first_name__icontains=search_query) |
-            Q(user__last_name__icontains=search_query) |
-            Q(user__email__icontains=search_query) |
-            Q(student_id__icontains=search_query) |
-            Q(full_name__icontains=search_query)
-        )
+        users = users.filter(user_id__in=matching_user_ids(search_query))
     
     # Filter by role
     role_filter = request.GET.get('role')
@@ -98,10 +97,8 @@ def admin_dashboard(request):
     elif verified_filter == 'unverified':
         users = users.filter(is_verified=False)
     
-    # Paginate results
-    paginator = Paginator(users, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Paginate results (keyset pagination keeps deep pages cheap)
+    page_obj = paginate_keyset(request, users, 20, ordering=('-created_at', '-id'))
     
     # Get departments for the modal form
     departments = Department.objects.filter(is_active=True).prefetch_related('courses').order_by('name')
@@ -125,21 +122,13 @@ def user_management(request):
     users = (
         UserProfile.objects
         .select_related('user', 'department', 'course')
-        .annotate(full_name=Concat(F('user__first_name'), Value(' '), F('user__last_name')))
         .order_by('-created_at')
     )
     
-    # Search functionality
+    # Search functionality (indexed name/username/email/student ID search)
     search_query = request.GET.get('search')
     if search_query:
-        users = users.filter(
-            Q(user__username__icontains=search_query) |
-            Q(user__first_name__icontains=search_query) |
-            Q(user__last_name__icontains=search_query) |
-            Q(user__email__icontains=search_query) |
-            Q(student_id__icontains=search_query) |
-            Q(full_name__icontains=search_query)
-        )
+        users = users.filter(user_id__in=matching_user_ids(search_query))
     
     # Filter by verification status
     verification_status = request.GET.get('verification_status')
@@ -211,6 +200,24 @@ def user_detail(request, user_id):
     return render(request, 'Admin_module/user_detail.html', context)
 
 
+# Password for imported rows that leave the password column empty
+DEFAULT_IMPORT_PASSWORD = 'defaultpassword123'
+
+
+def _hash_import_passwords(rows):
+    """Replace each row's ``password`` with ``password_hash`` so the job payload holds no plaintext"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    passwords = [row.pop('password', None) or DEFAULT_IMPORT_PASSWORD for row in rows]
+    # Hash each distinct password once; PBKDF2 releases the GIL, so threads run in parallel
+    distinct = sorted(set(passwords))
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        hashes = dict(zip(distinct, pool.map(make_password, distinct)))
+    for row, password in zip(rows, passwords):
+        row['password_hash'] = hashes[password]
+    return rows
+
+
 @staff_member_required
 def bulk_user_import(request):
     """Bulk import/update users from CSV with overwrite options"""
@@ -222,165 +229,20 @@ def bulk_user_import(request):
             overwrite_data = form.cleaned_data.get('overwrite_data', True)
             
             try:
-                # Process CSV file
                 decoded_file = csv_file.read().decode('utf-8')
-                csv_data = csv.DictReader(decoded_file.splitlines())
-                
-                created_count = 0
-                updated_count = 0
-                skipped_count = 0
-                error_count = 0
-                errors = []
-                results = []
-                
-                for row_num, row in enumerate(csv_data, start=2):  # Start at 2 for header
-                    try:
-                        # Check if user already exists (by username or email)
-                        existing_user = None
-                        if row.get('username'):
-                            existing_user = User.objects.filter(username=row['username']).first()
-                        if not existing_user and row.get('email'):
-                            existing_user = User.objects.filter(email=row['email']).first()
-                        
-                        if existing_user and not update_existing:
-                            # Skip existing users if update_existing is False
-                            skipped_count += 1
-                            continue
-                        
-                        # Get or create department and course
-                        department = None
-                        course = None
-                        
-                        if row.get('department_code'):
-                            try:
-                                department = Department.objects.get(code=row['department_code'])
-                            except Department.DoesNotExist:
-                                errors.append(f'Row {row_num}: Department with code "{row["department_code"]}" not found')
-                                error_count += 1
-                                continue
-                        
-                        if row.get('course_code'):
-                            try:
-                                course = Course.objects.get(code=row['course_code'])
-                            except Course.DoesNotExist:
-                                errors.append(f'Row {row_num}: Course with code "{row["course_code"]}" not found')
-                                error_count += 1
-                                continue
-                        
-                        if existing_user:
-                            # Update existing user
-                            if overwrite_data:
-                                # Overwrite user data with CSV data
-                                existing_user.first_name = row.get('first_name', existing_user.first_name)
-                                existing_user.last_name = row.get('last_name', existing_user.last_name)
-                                existing_user.email = row.get('email', existing_user.email)
-                                existing_user.save()
-                                
-                                # Update or create profile
-                                profile, created = UserProfile.objects.get_or_create(
-                                    user=existing_user,
-                                    defaults={
-                                        'student_id': row.get('student_id', ''),
-                                        'department': department,
-                                        'course': course,
-                                        'year_level': row.get('year_level', ''),
-                                        'phone_number': row.get('phone_number', ''),
-                                        'is_verified': True
-                                    }
-                                )
-                                
-                                if not created and overwrite_data:
-                                    # Overwrite profile data
-                                    profile.student_id = row.get('student_id', profile.student_id)
-                                    profile.department = department or profile.department
-                                    profile.course = course or profile.course
-                                    profile.year_level = row.get('year_level', profile.year_level)
-                                    profile.phone_number = row.get('phone_number', profile.phone_number)
-                                    profile.is_verified = True
-                                    profile.save()
-                                
-                                updated_count += 1
-                                results.append({
-                                    'row': row_num,
-                                    'username': existing_user.username,
-                                    'email': existing_user.email,
-                                    'first_name': existing_user.first_name,
-                                    'last_name': existing_user.last_name,
-                                    'status': 'updated',
-                                    'password': ''
-                                })
-                            else:
-                                # Skip if not overwriting
-                                skipped_count += 1
-                        else:
-                            # Create new user
-                            user = User.objects.create_user(
-                                username=row['username'],
-                                email=row['email'],
-                                first_name=row.get('first_name', ''),
-                                last_name=row.get('last_name', ''),
-                                password=row.get('password', 'defaultpassword123')
-                            )
-                            
-                            UserProfile.objects.create(
-                                user=user,
-                                student_id=row.get('student_id', ''),
-                                department=department,
-                                course=course,
-                                year_level=row.get('year_level', ''),
-                                phone_number=row.get('phone_number', ''),
-                                is_verified=True
-                            )
-                            
-                            created_count += 1
-                            results.append({
-                                'row': row_num,
-                                'username': user.username,
-                                'email': user.email,
-                                'first_name': user.first_name,
-                                'last_name': user.last_name,
-                                'status': 'created',
-                                'password': row.get('password', 'defaultpassword123')
-                            })
-                        
-                    except Exception as e:
-                        errors.append(f'Row {row_num}: {str(e)}')
-                        error_count += 1
-                
-                # Prepare result message
-                result_message = f"Import completed: {created_count} created, {updated_count} updated, {skipped_count} skipped, {error_count} errors"
-                
-                if created_count > 0 or updated_count > 0:
-                    messages.success(request, result_message)
-                
-                if errors:
-                    for error in errors[:10]:  # Show first 10 errors
-                        messages.error(request, error)
-                    if len(errors) > 10:
-                        messages.warning(request, f'... and {len(errors) - 10} more errors.')
-                
-                # Log the import activity
-                log_activity(
-                    user=request.user,
-                    action='admin_action',
-                    description=f'Bulk user import finished',
-                    request=request,
-                    additional_data={'created': created_count, 'updated': updated_count, 'skipped': skipped_count, 'errors': error_count}
-                )
-                
+                rows = _hash_import_passwords(list(csv.DictReader(decoded_file.splitlines())))
             except Exception as e:
                 messages.error(request, f'Error processing CSV file: {str(e)}')
                 return redirect('admin_module:bulk_user_import')
-
-            # On success, re-render the tools page with results visible
-            all_users = User.objects.all().order_by('username')[:100]
-            context = {
-                'form': BulkUserImportForm(),
-                'page_title': 'Bulk User Import',
-                'results': results,
-                'all_users': all_users,
-            }
-            return render(request, 'Admin_module/admin_user_tools.html', context)
+            
+            job = enqueue('bulk_user_import', {
+                'rows': rows,
+                'update_existing': update_existing,
+                'overwrite_data': overwrite_data,
+                'next_url': reverse('admin_module:bulk_user_import'),
+                'next_url_with_job': True,
+            }, user=request.user)
+            return redirect('admin_module:job_detail', job_id=job.id)
     else:
         form = BulkUserImportForm()
     
@@ -388,35 +250,24 @@ def bulk_user_import(request):
         'form': form,
         'page_title': 'Bulk User Import'
     }
+    
+    # Show the row results of a finished import job
+    job_id = request.GET.get('job')
+    if job_id:
+        job = Job.objects.filter(id=job_id, job_type='bulk_user_import', status='completed').first()
+        if job:
+            context['results'] = job.result.get('results', [])
+            context['all_users'] = User.objects.all().order_by('username')[:100]
     return render(request, 'Admin_module/admin_user_tools.html', context)
 
 
 @staff_member_required
 def export_users(request):
-    """Export users to CSV"""
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="users_export.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'Username', 'Email', 'First Name', 'Last Name', 'Student ID',
-        'Department', 'Course', 'Year Level', 'Phone Number', 'Verified'
-    ])
+    """Export users to CSV, streamed in chunks so memory stays flat for any user count"""
+    from E_Botar.services.user_export import iter_user_csv
     
-    users = UserProfile.objects.select_related('user', 'department', 'course')
-    for user_profile in users:
-        writer.writerow([
-            user_profile.user.username,
-            user_profile.user.email,
-            user_profile.user.first_name,
-            user_profile.user.last_name,
-            user_profile.student_id,
-            (user_profile.department.name if user_profile.department else ''),
-            (user_profile.course.name if user_profile.course else ''),
-            user_profile.year_level,
-            user_profile.phone_number,
-            'Yes' if user_profile.is_verified else 'No'
-        ])
+    response = StreamingHttpResponse(iter_user_csv(), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="users_export.csv"'
     
     # Record audit trail for export action
     log_activity(
@@ -491,9 +342,7 @@ def candidate_management(request):
         candidates = candidates.filter(position_id=selected_position)
     
     # Paginate results
-    paginator = Paginator(candidates, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate_keyset(request, candidates, 20, ordering=('-created_at', '-id'))
     
     # Get parties for filter dropdown
     parties = Party.objects.filter(is_active=True)
@@ -583,13 +432,13 @@ def approve_application(request, application_id):
             request=request
         )
         
-        # Send email notification
-        EmailService.send_system_notification(
-            users=[application.user],
-            subject='Application Approved',
-            message=f'Your application for {application.position.name} has been approved! You are now an official candidate.',
-            notification_type='success'
-        )
+        # Send email notification from the job worker
+        enqueue('system_notification', {
+            'user_ids': [application.user_id],
+            'subject': 'Application Approved',
+            'message': f'Your application for {application.position.name} has been approved! You are now an official candidate.',
+            'notification_type': 'success',
+        }, user=request.user)
         
         messages.success(request, f'Application approved and candidate {candidate.user.get_full_name()} created successfully!')
     else:
@@ -615,13 +464,13 @@ def reject_application(request, application_id):
             request=request
         )
         
-        # Send email notification
-        EmailService.send_system_notification(
-            users=[application.user],
-            subject='Application Rejected',
-            message=f'Your application for {application.position.name} has been rejected.',
-            notification_type='warning'
-        )
+        # Send email notification from the job worker
+        enqueue('system_notification', {
+            'user_ids': [application.user_id],
+            'subject': 'Application Rejected',
+            'message': f'Your application for {application.position.name} has been rejected.',
+            'notification_type': 'warning',
+        }, user=request.user)
         
         messages.success(request, 'Application rejected.')
     else:
@@ -648,15 +497,10 @@ def activity_logs(request):
     # Filter by date range
     date_from = request.GET.get('date_from')
     date_to = request.GET.get('date_to')
-    if date_from:
-        activities = activities.filter(timestamp__date__gte=date_from)
-    if date_to:
-        activities = activities.filter(timestamp__date__lte=date_to)
+    activities = activities.in_date_range(date_from, date_to)
     
-    # Paginate results
-    paginator = Paginator(activities, 50)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Paginate results by (timestamp, id) cursor instead of COUNT + OFFSET
+    page_obj = paginate_keyset(request, activities, 50, ordering=('-timestamp', '-id'), estimate_count=True)
     
     # Get users for filter dropdown
     users = User.objects.filter(is_active=True).order_by('username')
@@ -679,29 +523,77 @@ def activity_logs(request):
     return render(request, 'Admin_module/activity_logs.html', context)
 
 
+@staff_member_required
+def activity_log_archive(request):
+    """Browse archived activity logs (read-only, streamed from the monthly segments)"""
+    from itertools import islice
+    from django.utils.dateparse import parse_datetime
+    from E_Botar.services.log_archive import iter_archived_logs, list_segments
+    
+    per_page = 50
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    filters = {
+        'month_from': request.GET.get('month_from') or None,
+        'month_to': request.GET.get('month_to') or None,
+        'action': request.GET.get('action_type') or None,
+        'username': request.GET.get('username') or None,
+        'search': request.GET.get('q') or None,
+    }
+    
+    # Only the requested window of the (lazily filtered) archive stream is materialised
+    entries = list(islice(iter_archived_logs(**filters), (page - 1) * per_page, page * per_page + 1))
+    has_next = len(entries) > per_page
+    entries = entries[:per_page]
+    for entry in entries:
+        entry['timestamp'] = timezone.localtime(parse_datetime(entry['timestamp']))
+    
+    params = request.GET.copy()
+    params.pop('page', None)
+    context = {
+        'entries': entries,
+        'segments': list_segments(),
+        'action_types': ActivityLog.ACTION_TYPES,
+        'current_filters': request.GET,
+        'page': page,
+        'has_next': has_next,
+        'base_query': params.urlencode(),
+        'page_title': 'Activity Log Archive'
+    }
+    return render(request, 'Admin_module/activity_log_archive.html', context)
+
+
 @staff_member_required
 def system_statistics(request):
     """Display system statistics"""
+    # Large-table counts come from the counter cache
+    counters = get_counters(
+        'users.total', 'users.verified', 'elections.total', 'votes.total', 'votes.unique_voters',
+        'candidates.total', 'applications.approved', 'applications.pending',
+    )
+    
     # User statistics
-    total_users = UserProfile.objects.count()
-    verified_users = UserProfile.objects.filter(is_verified=True).count()
+    total_users = counters['users.total']
+    verified_users = counters['users.verified']
     unverified_users = total_users - verified_users
     
-    # Election statistics
-    total_elections = SchoolElection.objects.count()
+    # Election statistics (time-dependent, so counted directly; the table is small)
+    total_elections = counters['elections.total']
     active_elections = SchoolElection.objects.filter(is_active=True).count()
     completed_elections = SchoolElection.objects.filter(
         end_date__lt=timezone.now()
     ).count()
     
     # Voting statistics
-    total_votes = SchoolVote.objects.count()
-    unique_voters = SchoolVote.objects.values('voter').distinct().count()
+    total_votes = counters['votes.total']
+    unique_voters = counters['votes.unique_voters']
     
     # Candidate statistics
-    total_candidates = Candidate.objects.count()
-    approved_applications = CandidateApplication.objects.filter(status='approved').count()
-    pending_applications = CandidateApplication.objects.filter(status='pending').count()
+    total_candidates = counters['candidates.total']
+    approved_applications = counters['applications.approved']
+    pending_applications = counters['applications.pending']
     
     context = {
         'total_users': total_users,
@@ -724,7 +616,6 @@ def system_statistics(request):
 def candidate_create(request):
     """Create a new candidate application (admin-assisted)"""
     from .forms import CandidateApplicationForm
-    from django.utils import timezone
     
     if request.method == 'POST':
         form = CandidateApplicationForm(request.POST, request.FILES)
@@ -751,12 +642,7 @@ def candidate_create(request):
         form = CandidateApplicationForm()
     
     # Get current election info for context
-    now = timezone.now()
-    current_election = SchoolElection.objects.filter(
-        is_active=True,
-        start_date__lte=now,
-        end_date__gte=now,
-    ).first()
+    current_election = get_election_calendar().current_election
     
     context = {
         'form': form,
@@ -816,17 +702,17 @@ def candidate_delete(request):
 
     # Notify the candidate (user side)
     try:
-        EmailService.send_system_notification(
-            users=[User.objects.get(id=candidate.user.id)],
-            subject='Candidacy Update: Disqualification/Removal',
-            message=(
+        enqueue('system_notification', {
+            'user_ids': [candidate.user_id],
+            'subject': 'Candidacy Update: Disqualification/Removal',
+            'message': (
                 f'Dear {candidate_name},\n\n'
                 f'Your candidacy for {position_name} has been removed/disqualified.\n'
                 f'Reason: {reason}\n\n'
                 f'If you believe this is in error, please contact the election administrators.'
             ),
-            notification_type='warning'
-        )
+            'notification_type': 'warning',
+        }, user=request.user)
     except Exception:
         # Non-fatal; continue even if email fails
         pass
@@ -923,23 +809,17 @@ def user_delete(request):
             messages.error(request, 'Cannot delete superuser accounts')
             return redirect('admin_module:admin_dashboard')
         
-        # Delete the user profile first (if it exists)
-        try:
-            user_profile = UserProfile.objects.get(user=user)
-            user_profile.delete()
-        except UserProfile.DoesNotExist:
-            pass  # Profile doesn't exist, continue with user deletion
-        
-        # Delete the user
-        user.delete()
-        
-        # Log the activity
-        log_activity(
-            user=request.user,
-            action='admin_action',
-            description=f'Deleted user {username}',
-            request=request
-        )
+        # Votes, applications and candidacies cascade; log one entry for all of it
+        with bulk_operation(f'Deleted user {username}', user=request.user, action='admin_action', request=request):
+            # Delete the user profile first (if it exists)
+            try:
+                user_profile = UserProfile.objects.get(user=user)
+                user_profile.delete()
+            except UserProfile.DoesNotExist:
+                pass  # Profile doesn't exist, continue with user deletion
+            
+            # Delete the user
+            user.delete()
         
         messages.success(request, f'User {username} has been deleted successfully')
         
@@ -1380,150 +1260,66 @@ def course_export_csv(request):
     return response
 
 
-@staff_member_required
-def department_import_csv(request):
-    """Import departments from CSV"""
-    if request.method == 'POST':
-        form = DepartmentCSVImportForm(request.POST, request.FILES)
-        if form.is_valid():
-            csv_file = form.cleaned_data['csv_file']
-            
-            try:
-                # Read CSV file
-                decoded_file = csv_file.read().decode('utf-8')
-                csv_data = csv.reader(decoded_file.splitlines(), delimiter=',')
-                
-                # Skip header row
-                next(csv_data)
-                
-                imported_count = 0
-                errors = []
-                
-                for row_num, row in enumerate(csv_data, start=2):
-                    if len(row) >= 3:  # name, code, description
-                        name, code, description = row[0].strip(), row[1].strip(), row[2].strip()
-                        
-                        if name and code:
-                            try:
-                                department, created = Department.objects.get_or_create(
-                                    code=code.upper(),
-                                    defaults={
-                                        'name': name,
-                                        'description': description
-                                    }
-                                )
-                                if created:
-                                    imported_count += 1
-                            except Exception as e:
-                                errors.append(f'Row {row_num}: {str(e)}')
-                        else:
-                            errors.append(f'Row {row_num}: Missing name or code')
-                    else:
-                        errors.append(f'Row {row_num}: Insufficient columns')
-                
-                if imported_count > 0:
-                    messages.success(request, f'Successfully imported {imported_count} department(s)!')
-                
-                if errors:
-                    for error in errors[:5]:  # Show first 5 errors
-                        messages.error(request, error)
-                    if len(errors) > 5:
-                        messages.warning(request, f'... and {len(errors) - 5} more errors.')
-                
-                log_activity(
-                    user=request.user,
-                    action='admin_action',
-                    description=f'Imported {imported_count} departments from CSV',
-                    request=request
-                )
-                
-            except Exception as e:
-                messages.error(request, f'Error processing CSV file: {str(e)}')
-            
-            return redirect('admin_module:department_management')
-    else:
-        form = DepartmentCSVImportForm()
+def _reference_import(request, kind, form_class, management_url, label):
+    """Upload -> diff preview -> confirm flow shared by the department and course CSV imports.
+
+    The uploaded file is planned in the request (one prefetch, no writes) and
+    kept in the session; confirming queues the job that re-plans against the
+    current data and applies the upsert.
+    """
+    from E_Botar.services.reference_import import plan_import
+    
+    session_key = f'reference_import:{kind}'
+    if request.method != 'POST':
+        return redirect(management_url)
+    
+    if request.POST.get('confirm'):
+        csv_text = request.session.pop(session_key, None)
+        if csv_text is None:
+            messages.error(request, 'The import preview has expired. Please upload the file again.')
+            return redirect(management_url)
+        job = enqueue(f'{kind}_import', {
+            'csv_text': csv_text,
+            'next_url': reverse(management_url),
+        }, user=request.user)
+        return redirect('admin_module:job_detail', job_id=job.id)
+    
+    form = form_class(request.POST, request.FILES)
+    if not form.is_valid():
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(request, error)
+        return redirect(management_url)
+    
+    try:
+        csv_text = form.cleaned_data['csv_file'].read().decode('utf-8')
+    except Exception as e:
+        messages.error(request, f'Error processing CSV file: {str(e)}')
+        return redirect(management_url)
     
+    plan = plan_import(kind, csv_text)
+    request.session[session_key] = csv_text
     context = {
-        'form': form,
-        'page_title': 'Import Departments from CSV'
+        'plan': plan,
+        'summary': plan.summary(),
+        'label': label,
+        'import_url': request.path,
+        'management_url': reverse(management_url),
+        'page_title': f'Import {label.title()}s - Preview'
     }
-    return render(request, 'Admin_module/department_import_csv.html', context)
+    return render(request, 'Admin_module/reference_import_preview.html', context)
+
+
+@staff_member_required
+def department_import_csv(request):
+    """Import departments from CSV (previewed, then applied by the background job worker)"""
+    return _reference_import(request, 'department', DepartmentCSVImportForm, 'admin_module:department_management', 'department')
 
 
 @staff_member_required
 def course_import_csv(request):
-    """Import courses from CSV"""
-    if request.method == 'POST':
-        form = CourseCSVImportForm(request.POST, request.FILES)
-        if form.is_valid():
-            csv_file = form.cleaned_data['csv_file']
-            
-            try:
-                # Read CSV file
-                decoded_file = csv_file.read().decode('utf-8')
-                csv_data = csv.reader(decoded_file.splitlines(), delimiter=',')
-                
-                # Skip header row
-                next(csv_data)
-                
-                imported_count = 0
-                errors = []
-                
-                for row_num, row in enumerate(csv_data, start=2):
-                    if len(row) >= 4:  # name, code, department_code, description
-                        name, code, dept_code, description = row[0].strip(), row[1].strip(), row[2].strip(), row[3].strip()
-                        
-                        if name and code and dept_code:
-                            try:
-                                department = Department.objects.get(code=dept_code.upper())
-                                course, created = Course.objects.get_or_create(
-                                    code=code.upper(),
-                                    department=department,
-                                    defaults={
-                                        'name': name,
-                                        'description': description
-                                    }
-                                )
-                                if created:
-                                    imported_count += 1
-                            except Department.DoesNotExist:
-                                errors.append(f'Row {row_num}: Department with code "{dept_code}" not found')
-                            except Exception as e:
-                                errors.append(f'Row {row_num}: {str(e)}')
-                        else:
-                            errors.append(f'Row {row_num}: Missing name, code, or department code')
-                    else:
-                        errors.append(f'Row {row_num}: Insufficient columns')
-                
-                if imported_count > 0:
-                    messages.success(request, f'Successfully imported {imported_count} course(s)!')
-                
-                if errors:
-                    for error in errors[:5]:  # Show first 5 errors
-                        messages.error(request, error)
-                    if len(errors) > 5:
-                        messages.warning(request, f'... and {len(errors) - 5} more errors.')
-                
-                log_activity(
-                    user=request.user,
-                    action='admin_action',
-                    description=f'Imported {imported_count} courses from CSV',
-                    request=request
-                )
-                
-            except Exception as e:
-                messages.error(request, f'Error processing CSV file: {str(e)}')
-            
-            return redirect('admin_module:course_management')
-    else:
-        form = CourseCSVImportForm()
-    
-    context = {
-        'form': form,
-        'page_title': 'Import Courses from CSV'
-    }
-    return render(request, 'Admin_module/course_import_csv.html', context)
+    """Import courses from CSV (previewed, then applied by the background job worker)"""
+    return _reference_import(request, 'course', CourseCSVImportForm, 'admin_module:course_management', 'course')
 
 
 # ============================================
@@ -1531,7 +1327,11 @@ def course_import_csv(request):
 
 @staff_member_required
 def bulk_user_generation(request):
-    """Generate multiple random user accounts"""
+    """Generate multiple random user accounts.
+
+    Small batches are generated inside the request; larger ones (up to
+    BULK_USER_MAX) are queued as a background job the page polls for progress.
+    """
     if request.method == 'POST':
         try:
             # Get form data
@@ -1555,13 +1355,9 @@ def bulk_user_generation(request):
                     '5': int(request.POST.get('year5Range', 20))
                 }
             
-            # Get all departments and courses for randomization
-            all_departments = list(Department.objects.filter(is_active=True))
-            all_courses = list(Course.objects.filter(is_active=True))
-            
             # Validate count
-            if count < 1 or count > 100:
-                messages.error(request, 'Count must be between 1 and 100.')
+            if count < 1 or count > BULK_USER_MAX:
+                messages.error(request, f'Count must be between 1 and {BULK_USER_MAX:,}.')
                 return redirect('admin_module:bulk_user_generation')
             
             # Get department and course (either specific or random)
@@ -1574,123 +1370,64 @@ def bulk_user_generation(request):
             if not randomize_course and course_id:
                 course = get_object_or_404(Course, id=course_id)
             
-            # Function to select department (random or specific)
-            def select_department():
-                if randomize_department and all_departments:
-                    return random.choice(all_departments)
-                return department
-            
-            # Function to select course (random or specific)
-            def select_course(selected_dept=None):
-                if randomize_course and all_courses:
-                    if selected_dept:
-                        # Filter courses by selected department
-                        dept_courses = [c for c in all_courses if c.department == selected_dept]
-                        if dept_courses:
-                            return random.choice(dept_courses)
-                    # If no department-specific courses or no department, choose any course
-                    return random.choice(all_courses)
-                return course
-            
-            # Function to select year level based on distribution
-            def select_year_level():
-                if not randomize_year_level:
-                    return year_level
-                
-                # Create weighted random selection
-                rand_num = random.randint(1, 100)
-                cumulative = 0
-                
-                for year, percentage in year_level_distribution.items():
-                    cumulative += percentage
-                    if rand_num <= cumulative:
-                        return year
-                
-                return '1'  # Fallback
-            
-            # Generate users
-            generated_users = []
-            errors = []
+            log_data = {
+                'count': count,
+                'department': department.name if department else None,
+                'course': course.name if course else None,
+                'year_level': year_level_label(year_level),
+                'randomize_department': randomize_department,
+                'randomize_course': randomize_course,
+                'randomize_year_level': randomize_year_level,
+                'year_level_distribution': year_level_distribution,
+            }
             
-            for i in range(count):
-                try:
-                    # Generate random user data
-                    first_names = ['John', 'Jane', 'Michael', 'Sarah', 'David', 'Emily', 'James', 'Jessica', 'Robert', 'Ashley', 'William', 'Amanda', 'Richard', 'Jennifer', 'Charles', 'Lisa', 'Joseph', 'Nancy', 'Thomas', 'Karen', 'Christopher', 'Betty', 'Daniel', 'Helen', 'Matthew', 'Sandra', 'Anthony', 'Donna', 'Mark', 'Carol', 'Donald', 'Ruth', 'Steven', 'Sharon', 'Paul', 'Michelle', 'Andrew', 'Laura', 'Joshua', 'Sarah', 'Kenneth', 'Kimberly', 'Kevin', 'Deborah', 'Brian', 'Dorothy', 'George', 'Lisa', 'Timothy', 'Nancy']
-                    last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin', 'Lee', 'Perez', 'Thompson', 'White', 'Harris', 'Sanchez', 'Clark', 'Ramirez', 'Lewis', 'Robinson', 'Walker', 'Young', 'Allen', 'King', 'Wright', 'Scott', 'Torres', 'Nguyen', 'Hill', 'Flores', 'Green', 'Adams', 'Nelson', 'Baker', 'Hall', 'Rivera', 'Campbell', 'Mitchell', 'Carter', 'Roberts', 'Gomez']
-                    
-                    first_name = random.choice(first_names)
-                    last_name = random.choice(last_names)
-                    username = f"{first_name.lower()}.{last_name.lower()}{random.randint(10, 99)}"
-                    
-                    # Ensure username is unique
-                    counter = 1
-                    original_username = username
-                    while User.objects.filter(username=username).exists():
-                        username = f"{original_username}{counter}"
-                        counter += 1
-                    
-                    # Create user
-                    user = User.objects.create_user(
-                        username=username,
-                        first_name=first_name,
-                        last_name=last_name,
-                        email=f"{username}@school.edu",
-                        password=password
-                    )
-                    
-                    # Create user profile
-                    selected_year_level = select_year_level()
-                    selected_department = select_department()
-                    selected_course = select_course(selected_department)
-                    
-                    profile = UserProfile.objects.create(
-                        user=user,
-                        department=selected_department,
-                        course=selected_course,
-                        year_level=f"{selected_year_level}st Year" if selected_year_level == '1' else f"{selected_year_level}nd Year" if selected_year_level == '2' else f"{selected_year_level}rd Year" if selected_year_level == '3' else f"{selected_year_level}th Year",
-                        is_verified=True
-                    )
-                    
-                    generated_users.append({
-                        'username': username,
-                        'name': f"{first_name} {last_name}",
-                        'student_id': profile.student_id,
-                        'email': f"{username}@school.edu"
-                    })
-                    
-                except Exception as e:
-                    errors.append(f"Error creating user {i+1}: {str(e)}")
+            if count > BULK_USER_SYNC_LIMIT:
+                job = enqueue('bulk_user_generation', {
+                    'count': count,
+                    'password_hash': make_password(password),
+                    'department_id': department.id if department else None,
+                    'course_id': course.id if course else None,
+                    'year_level': year_level,
+                    'department_ids': list(Department.objects.filter(is_active=True).values_list('id', flat=True)) if randomize_department else None,
+                    'course_ids': list(Course.objects.filter(is_active=True).values_list('id', flat=True)) if randomize_course else None,
+                    'randomize_department': randomize_department,
+                    'randomize_course': randomize_course,
+                    'year_level_distribution': year_level_distribution,
+                    'log_data': log_data,
+                    'next_url': reverse('admin_module:bulk_user_results'),
+                    'next_url_with_job': True,
+                    'auto_redirect': True,
+                }, user=request.user, total=count)
+                messages.info(request, f'Generating {count:,} user accounts in the background.')
+                return redirect('admin_module:job_detail', job_id=job.id)
             
-            # Log the activity
+            generator = BulkUserGenerator(
+                count=count,
+                password=password,
+                department=department,
+                course=course,
+                year_level=year_level,
+                departments=Department.objects.filter(is_active=True) if randomize_department else None,
+                courses=Course.objects.filter(is_active=True) if randomize_course else None,
+                randomize_department=randomize_department,
+                randomize_course=randomize_course,
+                year_level_distribution=year_level_distribution,
+            )
+            result = generator.run()
             log_activity(
                 user=request.user,
                 action='admin_action',
-                description=f'Generated {len(generated_users)} bulk user accounts',
+                description=f'Generated {result["created"]} bulk user accounts',
                 request=request,
                 additional_data={
-                    'count': count,
-                    'department': department.name if department else None,
-                    'course': course.name if course else None,
-                    'year_level': f"{year_level}st Year" if year_level == '1' else f"{year_level}nd Year" if year_level == '2' else f"{year_level}rd Year" if year_level == '3' else f"{year_level}th Year",
-                    'randomize_department': randomize_department,
-                    'randomize_course': randomize_course,
-                    'randomize_year_level': randomize_year_level,
-                    'year_level_distribution': year_level_distribution,
-                    'generated_users': generated_users[:10]  # Log first 10 users
+                    **log_data,
+                    'generated_users': result['generated_users'][:10]  # Log first 10 users
                 }
             )
             
-            # Show results
-            if generated_users:
-                messages.success(request, f'Successfully generated {len(generated_users)} user accounts!')
-                request.session['generated_users'] = generated_users
-                return redirect('admin_module:bulk_user_results')
-            
-            if errors:
-                for error in errors[:5]:
-                    messages.error(request, error)
-                if len(errors) > 5:
-                    messages.warning(request, f'... and {len(errors) - 5} more errors.')
+            messages.success(request, f'Successfully generated {result["created"]} user accounts!')
+            request.session['generated_users'] = result['generated_users']
+            return redirect('admin_module:bulk_user_results')
             
         except Exception as e:
             messages.error(request, f'Error generating users: {str(e)}')
@@ -1702,6 +1439,8 @@ def bulk_user_generation(request):
     context = {
         'departments': departments,
         'courses': courses,
+        'max_count': BULK_USER_MAX,
+        'sync_limit': BULK_USER_SYNC_LIMIT,
         'page_title': 'Bulk User Generation'
     }
     return render(request, 'Admin_module/bulk_user_generation.html', context)
@@ -1710,7 +1449,14 @@ def bulk_user_generation(request):
 @staff_member_required
 def bulk_user_results(request):
     """Display results of bulk user generation"""
-    generated_users = request.session.get('generated_users', [])
+    job_id = request.GET.get('job')
+    if job_id:
+        job = Job.objects.filter(id=job_id, job_type='bulk_user_generation', status='completed').first()
+        generated_users = job.result.get('generated_users', []) if job else []
+        total_generated = job.result.get('created', len(generated_users)) if job else 0
+    else:
+        generated_users = request.session.get('generated_users', [])
+        total_generated = len(generated_users)
     
     if not generated_users:
         messages.warning(request, 'No generated users found. Please generate users first.')
@@ -1722,11 +1468,57 @@ def bulk_user_results(request):
     
     context = {
         'generated_users': generated_users,
+        'total_generated': total_generated,
         'page_title': 'Bulk User Generation Results'
     }
     return render(request, 'Admin_module/bulk_user_results.html', context)
 
 
+# ============================================
+# Background Job Views
+
+def _job_next_url(job):
+    next_url = job.payload.get('next_url')
+    if next_url and job.payload.get('next_url_with_job'):
+        next_url = f"{next_url}?job={job.id}"
+    return next_url
+
+
+@staff_member_required
+def job_detail(request, job_id):
+    """Progress page for a queued background job"""
+    job = get_object_or_404(Job, id=job_id)
+    context = {
+        'job': job,
+        'next_url': _job_next_url(job),
+        'page_title': f'Background Job #{job.id}'
+    }
+    return render(request, 'Admin_module/job_detail.html', context)
+
+
+@staff_member_required
+def job_status(request, job_id):
+    """JSON progress for a background job, polled by the job page"""
+    job = Job.objects.filter(id=job_id).first()
+    if job is None:
+        return JsonResponse({'success': False, 'error': 'Job not found'}, status=404)
+    
+    return JsonResponse({
+        'success': True,
+        'id': job.id,
+        'job_type': job.job_type,
+        'status': job.status,
+        'done': job.progress_done,
+        'total': job.progress_total,
+        'percent': job.percent,
+        'message': job.result.get('message') or job.progress_message,
+        'errors': job.result.get('errors', [])[:20],
+        'error': job.error.split('\n', 1)[0] if job.error else None,
+        'next_url': _job_next_url(job),
+        'auto_redirect': bool(job.payload.get('auto_redirect')),
+    })
+
+
 @staff_member_required
 def user_autocomplete(request):
     """AJAX endpoint for user autocomplete search"""
@@ -1735,23 +1527,13 @@ def user_autocomplete(request):
     if len(query) < 2:
         return JsonResponse({'results': []})
     
-    # Annotate full name for more natural matching (e.g., "First Last")
-    users_qs = (
-        User.objects
-        .annotate(full_name=Concat(F('first_name'), Value(' '), F('last_name')))
-        .filter(
-            Q(username__icontains=query) |
-            Q(first_name__icontains=query) |
-            Q(last_name__icontains=query) |
-            Q(email__icontains=query) |
-            Q(full_name__icontains=query)
-        )
-        .prefetch_related('profile__course', 'profile__department')
-        .order_by('first_name', 'last_name')
+    # Answered from the in-memory prefix index; only the top 20 ids are
+    # hydrated from the database ("First Last" matches both name tokens)
+    users = user_prefix_index.hydrate(
+        query,
+        limit=20,
+        queryset=User.objects.select_related('profile__course', 'profile__department'),
     )
-
-    # Limit results
-    users = users_qs[:20]
     
     results = []
     for user in users:
@@ -1823,10 +1605,7 @@ def user_detail(request, user_id):
         
         # Auto-generate student ID when user gets verified
         if not old_verified_status and user_profile.is_verified and not user_profile.student_id:
-            current_year = timezone.now().year
-            import random
-            random_num = random.randint(10000, 99999)
-            user_profile.student_id = f"{current_year}-{random_num}"
+            user_profile.student_id = UserProfile.generate_student_id()
             
             # Log the auto-generation
             log_activity(
@@ -1939,9 +1718,7 @@ def user_edit_ajax(request):
         
         # Auto-generate student ID when user gets verified
         if not old_verified_status and user_profile.is_verified and not user_profile.student_id:
-            current_year = timezone.now().year
-            random_num = random.randint(10000, 99999)
-            user_profile.student_id = f"{current_year}-{random_num}"
+            user_profile.student_id = UserProfile.generate_student_id()
             
             # Log the auto-generation
             log_activity(
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import User
-from .models import UserProfile, Department, Course, ActivityLog
+from .models import UserProfile, Department, Course, ActivityLog, StudentIdSequence
 
 
 class UserProfileInline(admin.StackedInline):
@@ -55,6 +55,13 @@ class ActivityLogAdmin(admin.ModelAdmin):
     ordering = ('-timestamp',)
 
 
+@admin.register(StudentIdSequence)
+class StudentIdSequenceAdmin(admin.ModelAdmin):
+    list_display = ('year', 'next_value', 'updated_at')
+    readonly_fields = ('updated_at',)
+    ordering = ('-year',)
+
+
 # Unregister the default User admin and register our custom one
 admin.site.unregister(User)
 admin.site.register(User, CustomUserAdmin)
@@ -0,0 +1,27 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from E_Botar.services.user_search import index_users
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalised user search documents used by admin user search'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Users indexed per statement')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        batch = []
+        total = 0
+        for user in User.objects.select_related('profile').order_by('pk').iterator(chunk_size=batch_size):
+            batch.append(user)
+            if len(batch) >= batch_size:
+                index_users(batch, [getattr(u, 'profile', None) for u in batch])
+                total += len(batch)
+                batch = []
+        if batch:
+            index_users(batch, [getattr(u, 'profile', None) for u in batch])
+            total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} users'))
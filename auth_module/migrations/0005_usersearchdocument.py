@@ -0,0 +1,109 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:22
+
+import unicodedata
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+DOC_TABLE = 'auth_module_usersearchdocument'
+FTS_TABLE = 'auth_module_usersearch_fts'
+
+POSTGRES_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    f'CREATE INDEX usersearch_doc_trgm_idx ON {DOC_TABLE} USING gin (document gin_trgm_ops)',
+    f"CREATE INDEX usersearch_doc_tsv_idx ON {DOC_TABLE} USING gin (to_tsvector('simple', document))",
+]
+POSTGRES_REVERSE = [
+    'DROP INDEX IF EXISTS usersearch_doc_tsv_idx',
+    'DROP INDEX IF EXISTS usersearch_doc_trgm_idx',
+]
+SQLITE_FORWARD = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(document, content='{DOC_TABLE}', content_rowid='user_id', tokenize='trigram')",
+    f'''CREATE TRIGGER usersearch_fts_ai AFTER INSERT ON {DOC_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, document) VALUES (new.user_id, new.document);
+    END''',
+    f'''CREATE TRIGGER usersearch_fts_ad AFTER DELETE ON {DOC_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) VALUES ('delete', old.user_id, old.document);
+    END''',
+    f'''CREATE TRIGGER usersearch_fts_au AFTER UPDATE ON {DOC_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) VALUES ('delete', old.user_id, old.document);
+        INSERT INTO {FTS_TABLE}(rowid, document) VALUES (new.user_id, new.document);
+    END''',
+]
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS usersearch_fts_au',
+    'DROP TRIGGER IF EXISTS usersearch_fts_ad',
+    'DROP TRIGGER IF EXISTS usersearch_fts_ai',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        statements = POSTGRES_FORWARD
+    elif vendor == 'sqlite':
+        statements = SQLITE_FORWARD
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                # Unindexed LIKE search still works without FTS5
+                return
+    else:
+        return
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': POSTGRES_REVERSE, 'sqlite': SQLITE_REVERSE}.get(vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def _normalize(text):
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.lower().split())
+
+
+def backfill_documents(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    UserProfile = apps.get_model('auth_module', 'UserProfile')
+    UserSearchDocument = apps.get_model('auth_module', 'UserSearchDocument')
+    student_ids = dict(UserProfile.objects.exclude(student_id=None).values_list('user_id', 'student_id'))
+    batch = []
+    for user in User.objects.only('id', 'first_name', 'last_name', 'username', 'email').iterator(chunk_size=2000):
+        parts = [user.first_name, user.last_name, user.username, user.email, student_ids.get(user.id)]
+        batch.append(UserSearchDocument(user_id=user.id, document=_normalize(' '.join(p for p in parts if p))))
+        if len(batch) >= 2000:
+            UserSearchDocument.objects.bulk_create(batch)
+            batch = []
+    UserSearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('auth_module', '0004_studentidsequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchDocument',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('document', models.TextField(help_text='Lowercased, accent-stripped name, username, email and student ID')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'User Search Document',
+                'verbose_name_plural': 'User Search Documents',
+            },
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_module', '0005_usersearchdocument'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usersearchdocument',
+            index=models.Index(fields=['updated_at'], name='usersearch_updated_idx'),
+        ),
+    ]
@@ -3,8 +3,6 @@ from django.contrib.auth.models import User
 from django.core.validators import RegexValidator
 from django.utils import timezone
 from django.core.exceptions import ValidationError
-import random
-import string
 from datetime import datetime
 
 
@@ -84,7 +82,10 @@ class UserProfile(models.Model):
     def generate_student_id(cls, year=None):
         """
         Generate a unique student ID in format XXXX-XXXXX
-        where XXXX is the year created and XXXXX is random/indexed
+        where XXXX is the year created and XXXXX is indexed
+        
+        IDs come from the per-year StudentIdSequence through a process-local
+        reservation buffer, so no uniqueness retry loop is needed.
         
         Args:
             year (int): Year to use for the ID. If None, uses current year.
@@ -92,24 +93,8 @@ class UserProfile(models.Model):
         Returns:
             str: Generated student ID
         """
-        if year is None:
-            year = datetime.now().year
-        
-        # Ensure year is 4 digits
-        year_str = str(year).zfill(4)
-        
-        # Generate random 5-digit number
-        random_part = random.randint(10000, 99999)
-        
-        # Create the student ID
-        student_id = f"{year_str}-{random_part}"
-        
-        # Check if this ID already exists
-        while cls.objects.filter(student_id=student_id).exists():
-            random_part = random.randint(10000, 99999)
-            student_id = f"{year_str}-{random_part}"
-        
-        return student_id
+        from E_Botar.services.student_ids import student_id_allocator
+        return student_id_allocator.next_id(year)
 
     def clean(self):
         """Custom validation for the model"""
@@ -142,6 +127,49 @@ class UserProfile(models.Model):
         super().save(*args, **kwargs)
 
 
+class StudentIdSequence(models.Model):
+    """Per-year counter handing out contiguous blocks of student ID suffixes"""
+    FIRST_VALUE = 10000
+    LAST_VALUE = 99999
+    
+    year = models.PositiveIntegerField(unique=True)
+    next_value = models.PositiveIntegerField(default=FIRST_VALUE)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.year}: next {self.next_value}"
+    
+    class Meta:
+        verbose_name = 'Student ID Sequence'
+        verbose_name_plural = 'Student ID Sequences'
+
+
+class UserSearchDocument(models.Model):
+    """Denormalised, normalised search text for a user (see E_Botar.services.user_search)"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='search_document')
+    document = models.TextField(help_text="Lowercased, accent-stripped name, username, email and student ID")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.document}"
+
+    class Meta:
+        # Added as an index rather than db_index so SQLite does not rebuild the
+        # table (which would drop the FTS sync triggers)
+        indexes = [
+            models.Index(fields=['updated_at'], name='usersearch_updated_idx'),
+        ]
+        verbose_name = 'User Search Document'
+        verbose_name_plural = 'User Search Documents'
+
+
+class ActivityLogQuerySet(models.QuerySet):
+    def in_date_range(self, date_from=None, date_to=None):
+        """Entries on the local calendar dates ``date_from``..``date_to`` (inclusive)"""
+        from E_Botar.utils.helpers import date_range_filter
+        return self.filter(date_range_filter('timestamp', date_from, date_to))
+
+
 class ActivityLog(models.Model):
     """Model for tracking all system activities and user actions"""
     ACTION_TYPES = [
@@ -167,12 +195,21 @@ class ActivityLog(models.Model):
     additional_data = models.JSONField(default=dict, blank=True)
     timestamp = models.DateTimeField(default=timezone.now)
     
+    objects = ActivityLogQuerySet.as_manager()
+    
     def __str__(self):
         user_info = self.user.username if self.user else 'Anonymous'
         return f"{user_info} - {self.get_action_display()} - {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            # Keyset pagination key (see E_Botar.utils.pagination)
+            models.Index(fields=['-timestamp', '-id'], name='activitylog_ts_id_idx'),
+            # Filtered log pages: equality on action/user, range and order on timestamp
+            models.Index(fields=['action', '-timestamp'], name='activitylog_action_ts_idx'),
+            models.Index(fields=['user', '-timestamp'], name='activitylog_user_ts_idx'),
+        ]
         verbose_name = 'Activity Log'
         verbose_name_plural = 'Activity Logs'
 
@@ -1,7 +1,12 @@
 from django.contrib.auth.models import User
-from django.db.models.signals import pre_delete
+from django.db.models.signals import pre_delete, post_save
 from django.dispatch import receiver
 
+from .models import UserProfile
+
+# User fields that make up the search document and prefix index
+SEARCH_USER_FIELDS = {'first_name', 'last_name', 'username', 'email', 'is_active'}
+
 
 @receiver(pre_delete, sender=User)
 def delete_user_dependents(sender, instance: User, using, **kwargs):
@@ -21,3 +26,26 @@ def delete_user_dependents(sender, instance: User, using, **kwargs):
     except Exception:
         # Best effort cleanup; the database CASCADE on some relations may still handle it
         pass
+
+
+@receiver(post_save, sender=User)
+def index_user_on_save(sender, instance: User, raw=False, update_fields=None, **kwargs):
+    """Keep the user's search document in sync with name/username/email changes"""
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & SEARCH_USER_FIELDS:
+        # e.g. last_login updates on every sign-in
+        return
+    from E_Botar.services.user_search import index_user
+    index_user(instance)
+
+
+@receiver(post_save, sender=UserProfile)
+def index_profile_on_save(sender, instance: UserProfile, raw=False, update_fields=None, **kwargs):
+    """Keep the user's search document in sync with student ID changes"""
+    if raw:
+        return
+    if update_fields is not None and 'student_id' not in update_fields:
+        return
+    from E_Botar.services.user_search import index_user
+    index_user(instance.user, instance)
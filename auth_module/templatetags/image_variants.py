@@ -0,0 +1,29 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+
+from E_Botar.services.image_variants import current_variants, variant_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def image_variant(field_file, variant='card', fmt='jpeg'):
+    """URL of a resized variant, e.g. {% image_variant candidate.photo 'thumb' %}"""
+    return variant_url(field_file, variant, fmt)
+
+
+@register.simple_tag
+def picture(field_file, variant='card', alt='', css_class=''):
+    """<picture> with a WebP source and JPEG fallback; a plain <img> until the variants exist"""
+    if not field_file:
+        return ''
+    entry = (current_variants(field_file) or {}).get(variant)
+    if not entry:
+        return format_html('<img src="{}" alt="{}" class="{}" loading="lazy">', field_file.url, alt, css_class)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}">'
+        '<img src="{}" alt="{}" class="{}" width="{}" height="{}" loading="lazy"></picture>',
+        default_storage.url(entry['webp']), default_storage.url(entry['jpeg']),
+        alt, css_class, entry['width'], entry['height'],
+    )
@@ -1,6 +1,9 @@
+from datetime import datetime
+
 from django.test import TestCase
 from django.contrib.auth.models import User
-from auth_module.models import Department, Course, UserProfile, ActivityLog
+from auth_module.models import Department, Course, UserProfile, ActivityLog, StudentIdSequence
+from E_Botar.services.student_ids import student_id_allocator
 
 
 class DepartmentModelTest(TestCase):
@@ -55,6 +58,82 @@ class UserProfileModelTest(TestCase):
         self.assertFalse(profile.is_verified)
 
 
+class StudentIdAllocatorTest(TestCase):
+    def setUp(self):
+        student_id_allocator.reset()
+        self.year = datetime.now().year
+    
+    def test_block_allocation_skips_existing_ids(self):
+        user = User.objects.create_user(username="legacy")
+        UserProfile.objects.create(user=user, student_id=f"{self.year}-10001")
+        
+        ids = student_id_allocator.allocate(3, self.year)
+        
+        self.assertEqual(ids, [f"{self.year}-10000", f"{self.year}-10002", f"{self.year}-10003"])
+        self.assertEqual(StudentIdSequence.objects.get(year=self.year).next_value, 10020)
+    
+    def test_single_ids_served_from_buffer(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = UserProfile.generate_student_id()
+        with self.assertNumQueries(0):
+            second = UserProfile.generate_student_id()
+        self.assertNotEqual(first, second)
+
+
+class UserSearchTest(TestCase):
+    def setUp(self):
+        self.jose = User.objects.create_user(username="jdelacruz", first_name="José", last_name="Dela Cruz", email="jose@school.edu")
+        UserProfile.objects.create(user=self.jose, student_id="2024-10001")
+        self.maria = User.objects.create_user(username="mreyes", first_name="Maria", last_name="Clara", email="m.reyes@school.edu")
+    
+    def search(self, query):
+        from E_Botar.services.user_search import matching_user_ids
+        return set(User.objects.filter(id__in=matching_user_ids(query)).values_list('username', flat=True))
+    
+    def test_matches_full_name_accents_and_student_id(self):
+        self.assertEqual(self.search("jose dela"), {"jdelacruz"})
+        self.assertEqual(self.search("2024-1000"), {"jdelacruz"})
+        self.assertEqual(self.search("CLARA"), {"mreyes"})
+        self.assertEqual(self.search("school.edu"), {"jdelacruz", "mreyes"})
+        self.assertEqual(self.search("ma"), {"mreyes"})
+    
+    def test_signals_keep_document_current(self):
+        self.maria.last_name = "Santos"
+        self.maria.save()
+        self.assertEqual(self.search("santos"), {"mreyes"})
+        self.assertEqual(self.search("clara"), set())
+
+
+class UserPrefixIndexTest(TestCase):
+    def setUp(self):
+        from E_Botar.services.user_search import UserPrefixIndex
+        self.index = UserPrefixIndex(refresh_interval=60)
+        self.ana = User.objects.create_user(username="asantos", first_name="Ana", last_name="Santos")
+        self.andres = User.objects.create_user(username="abonifacio", first_name="Andres", last_name="Bonifacio")
+        UserProfile.objects.create(user=self.andres, student_id="2024-10002")
+    
+    def test_prefix_lookup_answers_from_memory(self):
+        self.index.refresh(force=True)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.index.search("an"), [self.ana.id, self.andres.id])
+            self.assertEqual(self.index.search("and bon"), [self.andres.id])
+            self.assertEqual(self.index.search("2024-1000"), [self.andres.id])
+        with self.assertNumQueries(1):
+            users = self.index.hydrate("santos")
+        self.assertEqual(users, [self.ana])
+    
+    def test_changes_are_applied_incrementally(self):
+        self.index.refresh(force=True)
+        self.ana.last_name = "Reyes"
+        self.ana.save()
+        self.andres.is_active = False
+        self.andres.save(update_fields=['is_active'])
+        self.index.refresh()  # version counter changed
+        self.assertEqual(self.index.search("reyes"), [self.ana.id])
+        self.assertEqual(self.index.search("santos"), [])
+        self.assertEqual(self.index.search("bonifacio"), [])
+
+
 class ActivityLogModelTest(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(
@@ -70,4 +149,203 @@ class ActivityLogModelTest(TestCase):
             ip_address="127.0.0.1"
         )
         self.assertIn("testuser", str(log))
-        self.assertEqual(log.action_type, "login")
\ No newline at end of file
+        self.assertEqual(log.action_type, "login")
+
+
+class ActivityLogQueryTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="loguser")
+    
+    def log_at(self, local_string):
+        from django.utils import timezone
+        from django.utils.dateparse import parse_datetime
+        ts = timezone.make_aware(parse_datetime(local_string))
+        return ActivityLog.objects.create(user=self.user, action="login", description=local_string, timestamp=ts)
+    
+    def test_date_filters_are_half_open_local_ranges(self):
+        before = self.log_at("2025-03-09 23:59:59")
+        first = self.log_at("2025-03-10 00:00:00")
+        last = self.log_at("2025-03-11 23:59:59")
+        after = self.log_at("2025-03-12 00:00:00")
+        
+        found = set(ActivityLog.objects.in_date_range("2025-03-10", "2025-03-11"))
+        self.assertEqual(found, {first, last})
+        self.assertEqual(set(ActivityLog.objects.in_date_range(date_from="2025-03-12")), {after})
+        self.assertEqual(set(ActivityLog.objects.in_date_range(date_to="bad-date")), {before, first, last, after})
+    
+    def test_filtered_log_pages_use_composite_indexes(self):
+        from django.db import connection
+        
+        queries = {
+            'activitylog_action_ts_idx': ActivityLog.objects.filter(action="vote"),
+            'activitylog_user_ts_idx': ActivityLog.objects.filter(user=self.user),
+        }
+        for index_name, qs in queries.items():
+            qs = qs.in_date_range("2025-03-10", "2025-03-11").order_by('-timestamp')[:50]
+            if connection.vendor == 'postgresql':
+                # Tiny test tables favour sequential scans; ask whether the index is usable
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = qs.explain()
+            self.assertIn(index_name, plan)
+            self.assertNotIn('SCAN auth_module_activitylog\n', plan + '\n')
+
+
+class BufferedActivityLogWriterTest(TestCase):
+    def setUp(self):
+        from E_Botar.utils.logging_utils import BufferedActivityLogWriter
+        self.user = User.objects.create_user(username="bufferuser")
+        self.writer = BufferedActivityLogWriter(batch_size=2, autostart=False)
+    
+    def test_flush_writes_queued_entries_in_batches(self):
+        for i in range(5):
+            self.writer.enqueue(ActivityLog(user=self.user, action="login", description=f"entry {i}"))
+        self.assertEqual(ActivityLog.objects.filter(user=self.user).count(), 0)
+        
+        with self.assertNumQueries(3):
+            self.assertEqual(self.writer.flush(), 5)
+        self.assertEqual(ActivityLog.objects.filter(user=self.user).count(), 5)
+        self.assertEqual(self.writer.pending, 0)
+    
+    def test_sync_actions_bypass_buffer(self):
+        from unittest import mock
+        from django.db import transaction
+        from django.test import override_settings
+        from E_Botar.utils import logging_utils
+        
+        with override_settings(ACTIVITY_LOG_BUFFERED=True, ACTIVITY_LOG_SYNC_ACTIONS=['vote']), \
+                mock.patch.object(logging_utils, 'activity_log_writer', self.writer):
+            with self.captureOnCommitCallbacks(execute=True):
+                logging_utils.log_activity(self.user, 'vote', 'voted')
+                logging_utils.log_activity(self.user, 'login', 'logged in')
+            self.assertEqual(list(ActivityLog.objects.values_list('action', flat=True)), ['vote'])
+            self.assertEqual(self.writer.pending, 1)
+            
+            # Buffered entries from rolled-back work are never queued
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        logging_utils.log_activity(self.user, 'logout', 'logged out')
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+            self.assertEqual(self.writer.pending, 1)
+            
+            self.writer.flush()
+        self.assertEqual(set(ActivityLog.objects.values_list('action', flat=True)), {'vote', 'login'})
+
+
+class LoginThrottleTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from django.urls import reverse
+        cache.clear()
+        self.user = User.objects.create_user(username="throttled", password="correct-pass")
+        self.login_url = reverse('auth_module:login')
+    
+    def test_sliding_window_retry_after(self):
+        from E_Botar.services.login_throttle import SlidingWindow
+        
+        window = SlidingWindow('test', limit=3, window=10)
+        window.hit('k', now=100)
+        window.hit('k', now=100)
+        window.hit('k', now=105)
+        self.assertEqual(window.buckets('k', now=105), [(100, 2), (105, 1)])
+        # Full until the two hits at t=100 slide out of the window
+        self.assertEqual(window.retry_after('k', now=106), 4)
+        self.assertIsNone(window.retry_after('k', now=110))
+        
+        window.reset('k', now=105)
+        self.assertIsNone(window.retry_after('k', now=105))
+    
+    def test_username_burst_is_rejected_before_authenticate(self):
+        from unittest import mock
+        from django.test import override_settings
+        from security_module.models import AccessAttempt
+        from auth_module import views
+        
+        with override_settings(LOGIN_RATE_LIMIT_PER_USERNAME=3, LOGIN_RATE_LIMIT_PER_IP=100), \
+                mock.patch.object(views, 'authenticate', wraps=views.authenticate) as authenticate:
+            for _ in range(3):
+                response = self.client.post(self.login_url, {'username': 'throttled', 'password': 'wrong'})
+                self.assertEqual(response.status_code, 200)
+            response = self.client.post(self.login_url, {'username': 'Throttled', 'password': 'correct-pass'})
+            self.assertEqual(response.status_code, 429)
+            self.assertTrue(int(response['Retry-After']) > 0)
+            self.assertEqual(authenticate.call_count, 3)
+        
+        self.assertEqual(AccessAttempt.objects.filter(username__iexact='throttled', success=False).count(), 4)
+    
+    def test_ip_window_counts_every_attempt_and_success_clears_username(self):
+        from django.test import override_settings
+        
+        with override_settings(LOGIN_RATE_LIMIT_PER_USERNAME=2, LOGIN_RATE_LIMIT_PER_IP=4):
+            self.client.post(self.login_url, {'username': 'throttled', 'password': 'wrong'})
+            response = self.client.post(self.login_url, {'username': 'throttled', 'password': 'correct-pass'})
+            self.assertEqual(response.status_code, 302)
+            self.client.logout()
+            # The earlier failure no longer counts against the username
+            self.client.post(self.login_url, {'username': 'throttled', 'password': 'wrong'})
+            self.assertEqual(self.client.post(self.login_url, {'username': 'throttled', 'password': 'correct-pass'}).status_code, 302)
+            self.client.logout()
+            # ... but all four POSTs counted against the IP
+            response = self.client.post(self.login_url, {'username': 'someone-else', 'password': 'x'})
+            self.assertEqual(response.status_code, 429)
+    
+    def test_spoofed_forwarded_for_does_not_bypass_ip_limit(self):
+        from django.test import RequestFactory, override_settings
+        from E_Botar.utils.logging_utils import get_client_ip
+        
+        with override_settings(TRUSTED_PROXY_COUNT=1, LOGIN_RATE_LIMIT_PER_IP=2, LOGIN_RATE_LIMIT_PER_USERNAME=100):
+            # The proxy appends the real peer address after whatever the client sent
+            for spoofed in ('1.1.1.1', '2.2.2.2'):
+                self.client.post(self.login_url, {'username': 'x', 'password': 'x'},
+                                 HTTP_X_FORWARDED_FOR=f'{spoofed}, 203.0.113.9', REMOTE_ADDR='10.0.0.1')
+            response = self.client.post(self.login_url, {'username': 'x', 'password': 'x'},
+                                        HTTP_X_FORWARDED_FOR='3.3.3.3, 203.0.113.9', REMOTE_ADDR='10.0.0.1')
+            self.assertEqual(response.status_code, 429)
+            
+            request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR='9.9.9.9', REMOTE_ADDR='10.0.0.1')
+            self.assertEqual(get_client_ip(request), '9.9.9.9')
+            request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR='not-an-ip', REMOTE_ADDR='10.0.0.1')
+            self.assertEqual(get_client_ip(request), '10.0.0.1')
+        with override_settings(TRUSTED_PROXY_COUNT=0):
+            request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR='9.9.9.9', REMOTE_ADDR='10.0.0.1')
+            self.assertEqual(get_client_ip(request), '10.0.0.1')
+
+
+class VoterContextTest(TestCase):
+    def setUp(self):
+        self.department = Department.objects.create(name="Computer Science", code="CS")
+        self.course = Course.objects.create(department=self.department, name="Software Engineering", code="SE101")
+        self.user = User.objects.create_user(username="contextvoter", password="pass12345")
+    
+    def test_flags_come_from_one_query(self):
+        from E_Botar.services.voter_context import VoterContext
+        
+        UserProfile.objects.create(user=self.user, department=self.department, course=self.course, is_verified=True)
+        with self.assertNumQueries(1):
+            voter = VoterContext.for_user(self.user)
+            self.assertTrue(voter.is_verified)
+            self.assertTrue(voter.is_profile_complete)
+            self.assertTrue(voter.can_vote)
+            self.assertEqual(voter.profile.course.department.code, "CS")
+    
+    def test_missing_and_incomplete_profiles(self):
+        from django.contrib.auth.models import AnonymousUser
+        from E_Botar.services.voter_context import INCOMPLETE_PROFILE, MISSING_PROFILE, VoterContext
+        
+        with self.assertNumQueries(0):
+            self.assertFalse(VoterContext.for_user(AnonymousUser()).can_vote)
+        voter = VoterContext.for_user(self.user)
+        self.assertEqual(voter.profile_error, MISSING_PROFILE)
+        voter.ensure_profile()
+        self.assertEqual(voter.profile_error, INCOMPLETE_PROFILE)
+        self.assertFalse(voter.can_apply)
+    
+    def test_request_voter_is_lazy_and_shared(self):
+        self.client.force_login(self.user)
+        UserProfile.objects.create(user=self.user, department=self.department, course=self.course)
+        response = self.client.get('/voting/')
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(response.wsgi_request.voter.is_verified)
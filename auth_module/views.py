@@ -3,13 +3,15 @@ from django.contrib.auth import login, authenticate, update_session_auth_hash, l
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import HttpRequest, HttpResponse, JsonResponse
-from django.utils import timezone
 from django.contrib.auth.models import User
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import re
 
 from .models import UserProfile, Department, Course
+from E_Botar.services.login_throttle import check_login, login_result, record_attempt
+from E_Botar.services.security_settings import security_settings
+from E_Botar.utils.helpers import get_client_ip
 
 
 def register_view(request: HttpRequest) -> HttpResponse:
@@ -62,9 +64,23 @@ def login_view(request: HttpRequest) -> HttpResponse:
     if request.method == 'POST':
         username = (request.POST.get('username') or '').strip()
         password = request.POST.get('password') or ''
+        # Throttled before authenticate() so rejected bursts never hash a password
+        retry_after = check_login(get_client_ip(request), username)
+        if retry_after is not None:
+            record_attempt(request, username)
+            minutes = (retry_after + 59) // 60
+            error = f'Too many login attempts. Please try again in {minutes} minute{"s" if minutes != 1 else ""}.'
+            response = render(request, 'Auth_module/login.html', {'error': error}, status=429)
+            response['Retry-After'] = str(retry_after)
+            return response
         user = authenticate(request, username=username, password=password)
+        login_result(username, user is not None)
+        record_attempt(request, username, user=user, success=user is not None)
         if user is not None:
             login(request, user)
+            session_timeout = security_settings.get_int('session_timeout', None)
+            if session_timeout:
+                request.session.set_expiry(session_timeout * 60)
             return redirect('home')
         error = 'Invalid username or password.'
     return render(request, 'Auth_module/login.html', {'error': error})
@@ -85,11 +101,8 @@ def logout_view(request: HttpRequest) -> HttpResponse:
 @login_required
 def profile_view(request):
     """User profile management page"""
-    try:
-        user_profile = UserProfile.objects.get(user=request.user)
-    except UserProfile.DoesNotExist:
-        # Create profile if it doesn't exist
-        user_profile = UserProfile.objects.create(user=request.user)
+    # Create profile if it doesn't exist
+    user_profile = request.voter.ensure_profile()
     
     departments = Department.objects.all()
     
@@ -170,10 +183,7 @@ def profile_view(request):
             # For regular users, only auto-generate if they don't have one and are verified
             if not user_profile.student_id and user_profile.is_verified:
                 # Auto-generate student ID for verified users
-                current_year = timezone.now().year
-                import random
-                random_num = random.randint(10000, 99999)
-                user_profile.student_id = f"{current_year}-{random_num}"
+                user_profile.student_id = UserProfile.generate_student_id()
         
         # Update department
         dept_id = request.POST.get('department')
@@ -5,3 +5,6 @@ class CandidateModuleConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'candidate_module'
     verbose_name = 'Candidate Module'
+    
+    def ready(self):
+        import candidate_module.signals
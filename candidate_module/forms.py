@@ -2,6 +2,7 @@ from django import forms
 from django.core.exceptions import ValidationError
 from .models import Candidate, CandidateApplication
 from election_module.models import SchoolElection, SchoolPosition, Party
+from E_Botar.services.election_calendar import get_election_calendar
 
 
 class CandidateForm(forms.ModelForm):
@@ -41,7 +42,8 @@ class CandidateApplicationForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Only show upcoming elections and positions
-        self.fields['election'].queryset = SchoolElection.objects.filter(is_active=True)
+        upcoming = get_election_calendar().upcoming
+        self.fields['election'].queryset = SchoolElection.objects.filter(pk__in=[e.pk for e in upcoming])
         self.fields['position'].queryset = SchoolPosition.objects.filter(is_active=True)
         self.fields['party'].queryset = Party.objects.filter(is_active=True)
         
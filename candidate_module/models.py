@@ -1,9 +1,40 @@
 from django.db import models
+from django.db.models import Case, Count, ExpressionWrapper, F, FloatField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from election_module.models import SchoolPosition, SchoolElection, Party, ElectionPosition
 
 
+class CandidateQuerySet(models.QuerySet):
+    def with_tallies(self, election=None):
+        """Annotate ``votes_cast``, ``position_votes_cast`` and ``vote_percentage`` from anonymous votes
+        
+        Counts are taken in each candidate's own election; ``election`` also limits the candidates to it.
+        """
+        from voting_module.models import AnonVote
+        
+        queryset = self.filter(election=election) if election is not None else self
+        votes = (
+            AnonVote.objects.filter(candidate=OuterRef('pk'), election=OuterRef('election'))
+            .values('candidate').annotate(total=Count('id')).values('total')
+        )
+        position_votes = (
+            AnonVote.objects.filter(position=OuterRef('position'), election=OuterRef('election'))
+            .values('position').annotate(total=Count('id')).values('total')
+        )
+        return queryset.annotate(
+            votes_cast=Coalesce(Subquery(votes), 0),
+            position_votes_cast=Coalesce(Subquery(position_votes), 0),
+        ).annotate(
+            vote_percentage=Case(
+                When(position_votes_cast=0, then=Value(0.0)),
+                default=ExpressionWrapper(F('votes_cast') * 100.0 / F('position_votes_cast'), output_field=FloatField()),
+                output_field=FloatField(),
+            )
+        )
+
+
 class Candidate(models.Model):
     """Model for candidates running for school positions"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='candidates')
@@ -12,11 +43,15 @@ class Candidate(models.Model):
     party = models.ForeignKey(Party, on_delete=models.SET_NULL, null=True, blank=True, related_name='candidates')
     manifesto = models.TextField(help_text="Campaign manifesto and goals")
     photo = models.ImageField(upload_to='candidate_photos/', blank=True, null=True)
+    # Resized copies of ``photo`` built in the background (see E_Botar.services.image_variants)
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     # Add reference to the approved application
     approved_application = models.OneToOneField('CandidateApplication', on_delete=models.SET_NULL, null=True, blank=True, related_name='candidate')
     
+    objects = CandidateQuerySet.as_manager()
+    
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.position.name}"
     
@@ -46,6 +81,8 @@ class Candidate(models.Model):
     
     def vote_count(self):
         """Get the vote count for this candidate"""
+        if 'votes_cast' in self.__dict__:
+            return self.votes_cast
         try:
             from voting_module.models import AnonVote
             return AnonVote.objects.filter(candidate=self, election=self.election).count()
@@ -55,6 +92,8 @@ class Candidate(models.Model):
     
     def percentage(self):
         """Calculate vote percentage for this candidate"""
+        if 'vote_percentage' in self.__dict__:
+            return round(self.vote_percentage, 1)
         try:
             from voting_module.models import AnonVote
             total_votes = AnonVote.objects.filter(election=self.election, position=self.position).count()
@@ -93,45 +132,20 @@ class CandidateApplication(models.Model):
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.position.name} ({self.get_status_display()})"
     
-    def clean(self):
-        """Validate application rules"""
+    def clean(self, eligibility=None):
+        """Validate application rules
         
-        # Rule 1: Check if same party already has a candidate for this position in this election
-        if self.party:
-            existing_candidate = Candidate.objects.filter(
-                position=self.position,
-                election=self.election,
-                party=self.party,
-                is_active=True
-            ).exclude(user=self.user).first()
-            
-            if existing_candidate:
-                raise ValidationError(
-                    f"Party '{self.party.name}' already has a candidate ({existing_candidate.user.get_full_name()}) "
-                    f"for the position '{self.position.name}' in this election."
-                )
+        Rule 1: the same party may not already have a candidate for this position in this election.
+        Rule 2: the user may not have run for the same position in the previous election.
         
-        # Rule 2: Check if user ran for the same position in the previous election
-        if self.election and self.position:
-            # Get the previous election (assuming elections are yearly)
-            previous_election = SchoolElection.objects.filter(
-                start_date__lt=self.election.start_date
-            ).order_by('-start_date').first()
-            
-            if previous_election:
-                # Check if user was a candidate for the same position in the previous election
-                previous_candidate = Candidate.objects.filter(
-                    user=self.user,
-                    position=self.position,
-                    election=previous_election,
-                    is_active=True
-                ).first()
-                
-                if previous_candidate:
-                    raise ValidationError(
-                        f"You cannot run for the same position '{self.position.name}' "
-                        f"in consecutive elections. You previously ran in {previous_election.title}."
-                    )
+        ``eligibility`` is an ``EligibilityIndex`` covering this application's election; bulk
+        validation passes one shared index instead of querying per application.
+        """
+        from E_Botar.services.candidate_eligibility import EligibilityIndex
+        
+        if eligibility is None:
+            eligibility = EligibilityIndex.for_application(self)
+        eligibility.validate(self)
     
     class Meta:
         unique_together = ['user', 'position', 'election']
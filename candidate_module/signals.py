@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Candidate
+from E_Botar.services.image_variants import needs_variants, queue_variants
+
+
+@receiver(post_save, sender=Candidate)
+def build_photo_variants(sender, instance, raw=False, **kwargs):
+    """Resize a new or replaced candidate photo in the background"""
+    if not raw and needs_variants(instance, 'photo'):
+        queue_variants(instance, 'photo')
@@ -2,34 +2,26 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import HttpResponse
-from django.utils import timezone
 from django.core.paginator import Paginator
 from django.db.models import Q
 
 from .models import Candidate, CandidateApplication
 from .forms import CandidateForm, CandidateApplicationForm
 from election_module.models import SchoolElection, SchoolPosition, Party
-from auth_module.models import UserProfile
+from E_Botar.services.election_calendar import get_election_calendar
 
 
-def check_profile_completion(user):
-    """Check if user has completed their profile"""
-    try:
-        profile = UserProfile.objects.get(user=user)
-        if not profile.course or not profile.department:
-            return False, "Please complete your profile by selecting your course and department."
-        return True, None
-    except UserProfile.DoesNotExist:
-        return False, "Please complete your profile first."
+def check_profile_completion(request):
+    """Check if the requesting user has completed their profile"""
+    error = request.voter.profile_error
+    return error is None, error
 
 
 @login_required
 def candidate_dashboard(request):
     """Candidate dashboard with statistics and quick actions"""
-    user_profile = None
-    try:
-        user_profile = UserProfile.objects.get(user=request.user)
-    except UserProfile.DoesNotExist:
+    user_profile = request.voter.profile
+    if user_profile is None:
         messages.warning(request, 'Please complete your profile first.')
         return redirect('candidate_module:candidate_profile')
     
@@ -44,10 +36,7 @@ def candidate_dashboard(request):
     ).order_by('-created_at')
     
     # Get upcoming elections for application
-    upcoming_elections = SchoolElection.objects.filter(
-        is_active=True,
-        start_date__gt=timezone.now()
-    ).order_by('start_date')
+    upcoming_elections = get_election_calendar().upcoming
     
     context = {
         'user_profile': user_profile,
@@ -68,7 +57,7 @@ def candidate_profile(request):
 @login_required
 def view_candidate_profile(request, candidate_id):
     """View a specific candidate's public profile"""
-    candidate = get_object_or_404(Candidate, id=candidate_id, is_active=True)
+    candidate = get_object_or_404(Candidate.objects.with_tallies(), id=candidate_id, is_active=True)
     
     # Get candidate statistics
     total_votes = candidate.vote_count()
@@ -127,25 +116,18 @@ def candidate_applications(request):
 def create_application(request):
     """Create new application"""
     # Check profile completion
-    profile_complete, error_message = check_profile_completion(request.user)
+    profile_complete, error_message = check_profile_completion(request)
     if not profile_complete:
         messages.warning(request, error_message)
         return redirect('auth_module:profile')
     
-    # Check if user has profile
-    try:
-        user_profile = UserProfile.objects.get(user=request.user)
-    except UserProfile.DoesNotExist:
-        messages.warning(request, 'Please complete your profile first.')
-        return redirect('auth_module:profile')
+    # A complete profile exists
+    user_profile = request.voter.profile
     
     # Check if there are upcoming elections
-    upcoming_elections = SchoolElection.objects.filter(
-        is_active=True,
-        start_date__gt=timezone.now()
-    )
+    upcoming_elections = get_election_calendar().upcoming
     
-    if not upcoming_elections.exists():
+    if not upcoming_elections:
         messages.warning(request, 'No upcoming elections available for application.')
         return render(request, 'Candidate_module/candidate_application.html', {
             'applications_closed': True,
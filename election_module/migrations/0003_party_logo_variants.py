@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('election_module', '0002_schoolelection_end_year_schoolelection_start_year'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='party',
+            name='logo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
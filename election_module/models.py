@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Case, Count, ExpressionWrapper, F, FloatField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.utils import timezone
 
@@ -8,6 +10,8 @@ class Party(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
     logo = models.ImageField(upload_to='party_logos/', blank=True, null=True)
+    # Resized copies of ``logo`` built in the background (see E_Botar.services.image_variants)
+    logo_variants = models.JSONField(default=dict, blank=True, editable=False)
     color = models.CharField(max_length=7, default='#0b6e3b', help_text="Hex color code for party branding")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -21,6 +25,13 @@ class Party(models.Model):
         verbose_name_plural = 'Parties'
 
 
+class SchoolPositionQuerySet(models.QuerySet):
+    def with_totals(self, election=None):
+        """Annotate ``votes_cast``: anonymous votes for the position (in ``election`` if given)"""
+        votes = Q(anon_votes__election=election) if election is not None else None
+        return self.annotate(votes_cast=Count('anon_votes', filter=votes))
+
+
 class SchoolPosition(models.Model):
     """Model for school administration positions"""
     POSITION_TYPES = [
@@ -40,11 +51,15 @@ class SchoolPosition(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = SchoolPositionQuerySet.as_manager()
+    
     def __str__(self):
         return self.name
     
     def total_votes(self):
         """Calculate total votes for all candidates in this position"""
+        if 'votes_cast' in self.__dict__:
+            return self.votes_cast
         try:
             from voting_module.models import AnonVote
             return AnonVote.objects.filter(position=self).count()
@@ -56,6 +71,32 @@ class SchoolPosition(models.Model):
         ordering = ['display_order', 'position_type', 'name']
 
 
+class SchoolElectionQuerySet(models.QuerySet):
+    def with_turnout(self):
+        """Annotate ``votes_cast`` (receipts, one per voter), ``eligible_voters`` and ``turnout_percentage``"""
+        from auth_module.models import UserProfile
+        from voting_module.models import VoteReceipt
+        
+        receipts = (
+            VoteReceipt.objects.filter(election=OuterRef('pk'))
+            .values('election').annotate(total=Count('id')).values('total')
+        )
+        eligible = (
+            UserProfile.objects.filter(is_verified=True)
+            .values('is_verified').annotate(total=Count('id')).values('total')
+        )
+        return self.annotate(
+            votes_cast=Coalesce(Subquery(receipts), 0),
+            eligible_voters=Coalesce(Subquery(eligible), 0),
+        ).annotate(
+            turnout_percentage=Case(
+                When(eligible_voters=0, then=Value(0.0)),
+                default=ExpressionWrapper(F('votes_cast') * 100.0 / F('eligible_voters'), output_field=FloatField()),
+                output_field=FloatField(),
+            )
+        )
+
+
 class SchoolElection(models.Model):
     """Model for school election periods"""
     title = models.CharField(max_length=200)
@@ -69,6 +110,8 @@ class SchoolElection(models.Model):
     # Compatibility: some tests/admin expect a creator field
     created_by = models.ForeignKey('auth.User', on_delete=models.SET_NULL, null=True, blank=True)
     
+    objects = SchoolElectionQuerySet.as_manager()
+    
     def save(self, *args, **kwargs):
         # Always auto-generate title from years
         if self.start_year and self.end_year:
@@ -87,9 +130,19 @@ class SchoolElection(models.Model):
         """Return the number of receipts issued (one per voter) for this election.
         Uses privacy-preserving receipts instead of legacy user-linked votes.
         """
+        if 'votes_cast' in self.__dict__:
+            return self.votes_cast
         from voting_module.models import VoteReceipt
         return VoteReceipt.objects.filter(election=self).count()
     
+    def turnout(self):
+        """Percentage of verified voters who cast a ballot in this election"""
+        if 'turnout_percentage' in self.__dict__:
+            return round(self.turnout_percentage, 1)
+        from auth_module.models import UserProfile
+        eligible = UserProfile.objects.filter(is_verified=True).count()
+        return round(self.total_votes() / eligible * 100, 1) if eligible else 0
+    
     class Meta:
         ordering = ['-start_date']
 
@@ -1,12 +1,30 @@
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 
 from .models import SchoolElection, SchoolPosition, Party
-from E_Botar.utils.logging_utils import log_activity
+from E_Botar.services.election_calendar import invalidate_election_calendar
+from E_Botar.services.image_variants import needs_variants, queue_variants
+from E_Botar.utils.logging_utils import audit_signal, log_activity
 
 
 @receiver(post_save, sender=SchoolElection)
+@receiver(post_delete, sender=SchoolElection)
+def refresh_election_calendar(sender, instance, **kwargs):
+    """Drop cached election calendar answers once the change commits"""
+    transaction.on_commit(invalidate_election_calendar)
+
+
+@receiver(post_save, sender=Party)
+def build_logo_variants(sender, instance, raw=False, **kwargs):
+    """Resize a new or replaced party logo in the background"""
+    if not raw and needs_variants(instance, 'logo'):
+        queue_variants(instance, 'logo')
+
+
+@receiver(post_save, sender=SchoolElection)
+@audit_signal
 def log_election_created(sender, instance, created, **kwargs):
     """Log when an election is created or updated"""
     if created:
@@ -28,6 +46,7 @@ def log_election_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=SchoolPosition)
+@audit_signal
 def log_position_created(sender, instance, created, **kwargs):
     """Log when a position is created or updated"""
     if created:
@@ -49,6 +68,7 @@ def log_position_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=Party)
+@audit_signal
 def log_party_created(sender, instance, created, **kwargs):
     """Log when a party is created or updated"""
     if created:
@@ -70,6 +90,7 @@ def log_party_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_delete, sender=SchoolElection)
+@audit_signal
 def log_election_deleted(sender, instance, **kwargs):
     """Log when an election is deleted"""
     log_activity(
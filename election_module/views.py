@@ -11,25 +11,32 @@ from django.urls import reverse
 from .models import SchoolElection, SchoolPosition, ElectionPosition, Party
 from .forms import ElectionForm, PositionForm, PartyForm
 from candidate_module.models import Candidate, CandidateApplication
-from auth_module.models import UserProfile, ActivityLog
-from E_Botar.utils.logging_utils import log_activity
+from auth_module.models import ActivityLog
+from E_Botar.utils.logging_utils import bulk_operation, log_activity
+from E_Botar.services.counters import get_counter
+from E_Botar.services.election_calendar import get_election_calendar
+
+
+def _open_election_for_update():
+    """The calendar's open election re-read from the database, for views that write against it"""
+    election = get_election_calendar().open_election
+    return SchoolElection.objects.filter(pk=election.pk).first() if election else None
 
 
 def election_list(request):
     """Display list of elections"""
-    elections = SchoolElection.objects.filter(is_active=True).order_by('-created_at')
+    elections = list(SchoolElection.objects.with_turnout().filter(is_active=True).order_by('-created_at'))
     
     # Check if user has voted in each election
+    voted_ids = set()
     if request.user.is_authenticated:
         from voting_module.models import SchoolVote
-        for election in elections:
-            election.user_has_voted = SchoolVote.objects.filter(
-                voter=request.user,
-                election=election
-            ).exists()
-    else:
-        for election in elections:
-            election.user_has_voted = False
+        voted_ids = set(
+            SchoolVote.objects.filter(voter=request.user, election__in=elections)
+            .values_list('election_id', flat=True)
+        )
+    for election in elections:
+        election.user_has_voted = election.pk in voted_ids
     
     context = {
         'elections': elections,
@@ -134,13 +141,14 @@ def election_delete(request):
     election_id = request.POST.get('election_id')
     election = get_object_or_404(SchoolElection, id=election_id)
     election_title = election.title
-    election.delete()
-    log_activity(
+    # Cascades to positions, candidates, votes and results; log one entry for all of it
+    with bulk_operation(
+        f'Deleted election: {election_title}',
         user=request.user,
         action='election_deleted',
-        description=f'Deleted election: {election_title}',
         request=request
-    )
+    ):
+        election.delete()
     messages.success(request, 'Election deleted successfully!')
     return redirect('election_module:school_election_list')
 
@@ -151,7 +159,7 @@ def position_list(request):
     positions = SchoolPosition.objects.filter(is_active=True).order_by('display_order', 'name')
     
     # Get active election
-    active_election = SchoolElection.objects.filter(is_active=True).first()
+    active_election = get_election_calendar().open_election
     
     # Add election availability info to each position
     positions_with_election_info = []
@@ -196,7 +204,7 @@ def position_create(request):
             position = form.save()
             
             # Automatically associate with active election
-            active_election = SchoolElection.objects.filter(is_active=True).first()
+            active_election = _open_election_for_update()
             if active_election:
                 # Get the next order number for this election
                 max_order = ElectionPosition.objects.filter(election=active_election).aggregate(
@@ -332,7 +340,7 @@ def election_end_now(request):
 def associate_position_with_election(request, position_id):
     """Associate a position with the active election"""
     position = get_object_or_404(SchoolPosition, id=position_id)
-    active_election = SchoolElection.objects.filter(is_active=True).first()
+    active_election = _open_election_for_update()
     
     if not active_election:
         messages.error(request, 'No active election found!')
@@ -370,7 +378,7 @@ def associate_position_with_election(request, position_id):
 @staff_member_required
 def fix_position_associations(request):
     """Fix all position associations with the active election"""
-    active_election = SchoolElection.objects.filter(is_active=True).first()
+    active_election = _open_election_for_update()
     
     if not active_election:
         messages.error(request, 'No active election found!')
@@ -506,7 +514,7 @@ def election_statistics(request, election_id):
     ).distinct().count()
     
     # Get voter statistics
-    total_eligible_voters = UserProfile.objects.filter(is_verified=True).count()
+    total_eligible_voters = get_counter('users.verified')
     
     context = {
         'election': election,
@@ -0,0 +1,47 @@
+"""
+Background job handlers for result generation.
+"""
+from django.db import transaction
+
+from election_module.models import SchoolElection
+from E_Botar.services.analytics import generate_election_results
+from E_Botar.services.jobs import job_handler
+from E_Botar.utils.logging_utils import bulk_operation
+from .models import ElectionResult
+
+
+@job_handler('generate_results')
+def generate_results_job(job, progress):
+    election = SchoolElection.objects.get(id=job.payload['election_id'])
+    results = generate_election_results(election)
+    progress(0, len(results), 'Tallying votes')
+
+    saved = 0
+    with bulk_operation(
+        f'Generated results for election: {election.title}',
+        user=job.created_by,
+        action='admin_action',
+        additional_data={'job_id': job.pk, 'election_id': election.id}
+    ) as operation, transaction.atomic():
+        # Replace all stored results for the election in one transaction
+        ElectionResult.objects.filter(election=election, position_id__in=list(results)).delete()
+        new_rows = []
+        for position_id, position_results in results.items():
+            for candidate_data in position_results['candidates']:
+                new_rows.append(ElectionResult(
+                    election=election,
+                    position_id=position_id,
+                    candidate=candidate_data['candidate'],
+                    vote_count=candidate_data['vote_count'],
+                    percentage=candidate_data['percentage']
+                ))
+        ElectionResult.objects.bulk_create(new_rows)
+        saved = len(new_rows)
+        operation.additional_data['results'] = saved
+    progress(len(results), len(results))
+
+    return {
+        'positions': len(results),
+        'results': saved,
+        'message': f'Results generated successfully for {election.title}!',
+    }
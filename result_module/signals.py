@@ -2,10 +2,11 @@ from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 from .models import ElectionResult, ResultChart, ResultExport, ResultAnalytics, ResultSnapshot
-from E_Botar.utils.logging_utils import log_activity
+from E_Botar.utils.logging_utils import audit_signal, log_activity
 
 
 @receiver(post_save, sender=ElectionResult)
+@audit_signal
 def log_election_result_created(sender, instance, created, **kwargs):
     """Log when an election result is created"""
     if created:
@@ -17,6 +18,7 @@ def log_election_result_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=ResultChart)
+@audit_signal
 def log_result_chart_created(sender, instance, created, **kwargs):
     """Log when a result chart is created"""
     if created:
@@ -28,6 +30,7 @@ def log_result_chart_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=ResultExport)
+@audit_signal
 def log_result_export_created(sender, instance, created, **kwargs):
     """Log when results are exported"""
     if created:
@@ -39,6 +42,7 @@ def log_result_export_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=ResultAnalytics)
+@audit_signal
 def log_result_analytics_created(sender, instance, created, **kwargs):
     """Log when result analytics are created"""
     if created:
@@ -50,6 +54,7 @@ def log_result_analytics_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=ResultSnapshot)
+@audit_signal
 def log_result_snapshot_created(sender, instance, created, **kwargs):
     """Log when a result snapshot is created"""
     if created:
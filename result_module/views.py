@@ -1,4 +1,4 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
@@ -17,30 +17,20 @@ from auth_module.models import UserProfile
 from .models import ElectionResult, ResultChart, ResultExport
 from .forms import ResultFilterForm, ChartConfigForm
 from E_Botar.services.analytics import generate_election_results, calculate_statistics
+from E_Botar.services.election_calendar import get_election_calendar
+from E_Botar.services.jobs import enqueue
 from E_Botar.utils.logging_utils import log_activity
 
 
 @login_required
 def results_dashboard(request):
     """Results dashboard for viewing election results"""
-    # Get completed elections
-    completed_elections = SchoolElection.objects.filter(
-        end_date__lt=timezone.now(),
-        is_active=True
-    ).order_by('-end_date')
+    calendar = get_election_calendar()
     
-    # Get active elections
-    active_elections = SchoolElection.objects.filter(
-        start_date__lte=timezone.now(),
-        end_date__gte=timezone.now(),
-        is_active=True
-    ).order_by('-start_date')
-    
-    # Get upcoming elections
-    upcoming_elections = SchoolElection.objects.filter(
-        start_date__gt=timezone.now(),
-        is_active=True
-    ).order_by('start_date')
+    # Get completed, active and upcoming elections
+    completed_elections = calendar.completed
+    active_elections = calendar.current
+    upcoming_elections = calendar.upcoming
     
     context = {
         'completed_elections': completed_elections,
@@ -100,9 +90,10 @@ def position_results(request, election_id, position_id):
     ).order_by('-vote_count')
     
     # Get candidate details
+    candidates = Candidate.objects.select_related('user', 'party').in_bulk([vote['candidate'] for vote in votes])
     candidates_with_votes = []
     for vote in votes:
-        candidate = Candidate.objects.get(id=vote['candidate'])
+        candidate = candidates[vote['candidate']]
         candidates_with_votes.append({
             'candidate': candidate,
             'vote_count': vote['vote_count']
@@ -134,35 +125,14 @@ def generate_results(request, election_id):
     election = get_object_or_404(SchoolElection, id=election_id)
     
     if request.method == 'POST':
-        # Generate results
-        results = generate_election_results(election)
-        
-        # Save results to database
-        for position_id, position_results in results.items():
-            position = SchoolPosition.objects.get(id=position_id)
-            
-            # Clear existing results
-            ElectionResult.objects.filter(election=election, position=position).delete()
-            
-            # Save new results
-            for candidate_data in position_results['candidates']:
-                ElectionResult.objects.create(
-                    election=election,
-                    position=position,
-                    candidate=candidate_data['candidate'],
-                    vote_count=candidate_data['vote_count'],
-                    percentage=candidate_data['percentage']
-                )
-        
-        log_activity(
-            user=request.user,
-            action_type='results_generated',
-            description=f'Generated results for election: {election.title}',
-            ip_address=request.META.get('REMOTE_ADDR')
-        )
-        
-        messages.success(request, 'Results generated successfully!')
-        return redirect('result_module:election_results', election_id=election.id)
+        # Tallying and saving run in the background job worker
+        job = enqueue('generate_results', {
+            'election_id': election.id,
+            'next_url': reverse('result_module:election_results', args=[election.id]),
+            'auto_redirect': True,
+        }, user=request.user)
+        messages.info(request, f'Generating results for {election.title} in the background.')
+        return redirect('admin_module:job_detail', job_id=job.id)
     
     context = {
         'election': election,
@@ -0,0 +1,18 @@
+#!/usr/bin/env bash
+# Start command for the nixpacks/Railway web service.
+#
+# Background jobs (imports, notifications, result generation, image variants,
+# log retention, anomaly detection) only run inside `manage.py run_jobs`. Unless a
+# separate worker service is deployed (then set JOBS_EMBEDDED_WORKER=false), a
+# worker is kept running next to Gunicorn and restarted if it exits.
+set -e
+
+python manage.py migrate --noinput
+# Table for the shared DatabaseCache (no-op when it exists or Redis is used)
+python manage.py createcachetable
+
+if [ "${JOBS_EMBEDDED_WORKER:-true}" = "true" ]; then
+    (while true; do python manage.py run_jobs || true; sleep 5; done) &
+fi
+
+exec gunicorn E_Botar.wsgi:application --bind "0.0.0.0:${PORT:-8000}"
@@ -18,14 +18,20 @@ from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.db.models import Count
+from E_Botar.services.candidate_eligibility import EligibilityIndex
 
 
 def validate_candidate_applications():
     """Validate all candidate applications and report issues"""
     print("=== CANDIDATE APPLICATION VALIDATION ===")
     
-    applications = CandidateApplication.objects.all()
-    print(f"Total applications found: {applications.count()}")
+    applications = list(
+        CandidateApplication.objects.select_related('user', 'position', 'election', 'party')
+    )
+    print(f"Total applications found: {len(applications)}")
+    
+    # One index for every election, so the business rules below need no per-application query
+    eligibility = EligibilityIndex.for_elections({app.election_id for app in applications})
     
     issues = []
     valid_apps = []
@@ -56,7 +62,7 @@ def validate_candidate_applications():
             
         # Check business rules using model validation
         try:
-            app.clean()
+            app.clean(eligibility=eligibility)
         except ValidationError as e:
             app_issues.append(f"Business rule violation: {e}")
         except Exception as e:
@@ -194,9 +200,9 @@ def main():
     print(f"Duplicate applications found: {'Yes' if has_duplicates else 'No'}")
     
     # Show final state
-    remaining_apps = CandidateApplication.objects.all()
+    remaining_apps = list(CandidateApplication.objects.select_related('user', 'position'))
     print(f"\n=== FINAL STATE ===")
-    print(f"Remaining applications: {remaining_apps.count()}")
+    print(f"Remaining applications: {len(remaining_apps)}")
     for app in remaining_apps:
         print(f"  - ID {app.id}: {app.user.get_full_name()} - {app.position.name} - {app.status}")
     
@@ -107,7 +107,7 @@ class SecuritySettingsAdmin(admin.ModelAdmin):
 
 @admin.register(BlockedIP)
 class BlockedIPAdmin(admin.ModelAdmin):
-    list_display = ['ip_address', 'reason_preview', 'blocked_by', 'blocked_at', 'is_active']
+    list_display = ['ip_address', 'prefix_length', 'reason_preview', 'blocked_by', 'blocked_at', 'is_active']
     list_filter = ['is_active', 'blocked_at']
     search_fields = ['ip_address', 'reason']
     readonly_fields = ['blocked_at']
@@ -115,7 +115,7 @@ class BlockedIPAdmin(admin.ModelAdmin):
     
     fieldsets = (
         ('Block Information', {
-            'fields': ('ip_address', 'reason', 'is_active')
+            'fields': ('ip_address', 'prefix_length', 'reason', 'is_active')
         }),
         ('Administration', {
             'fields': ('blocked_by', 'blocked_at')
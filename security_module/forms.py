@@ -60,9 +60,10 @@ class BlockedIPForm(forms.ModelForm):
     
     class Meta:
         model = BlockedIP
-        fields = ['ip_address', 'reason']
+        fields = ['ip_address', 'prefix_length', 'reason']
         widgets = {
             'ip_address': forms.TextInput(attrs={'class': 'form-control'}),
+            'prefix_length': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'e.g. 24 to block a /24 network'}),
             'reason': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
         }
     
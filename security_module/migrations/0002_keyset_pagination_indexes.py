@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('security_module', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accessattempt',
+            index=models.Index(fields=['-timestamp', '-id'], name='accessattempt_ts_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='securityevent',
+            index=models.Index(fields=['-created_at', '-id'], name='securityevent_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='securitylog',
+            index=models.Index(fields=['-timestamp', '-id'], name='securitylog_ts_id_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('security_module', '0003_blockedip_prefix_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnomalyDetectorState',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('high_water_marks', models.JSONField(blank=True, default=dict)),
+                ('state', models.JSONField(blank=True, default=dict)),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Anomaly Detector State',
+                'verbose_name_plural': 'Anomaly Detector State',
+            },
+        ),
+    ]
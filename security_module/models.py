@@ -1,3 +1,5 @@
+import ipaddress
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
@@ -36,6 +38,9 @@ class SecurityEvent(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='securityevent_created_id_idx'),
+        ]
         verbose_name = 'Security Event'
         verbose_name_plural = 'Security Events'
     
@@ -62,6 +67,9 @@ class SecurityLog(models.Model):
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['-timestamp', '-id'], name='securitylog_ts_id_idx'),
+        ]
         verbose_name = 'Security Log'
         verbose_name_plural = 'Security Logs'
     
@@ -80,6 +88,9 @@ class AccessAttempt(models.Model):
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['-timestamp', '-id'], name='accessattempt_ts_id_idx'),
+        ]
         verbose_name = 'Access Attempt'
         verbose_name_plural = 'Access Attempts'
     
@@ -104,8 +115,10 @@ class SecuritySettings(models.Model):
 
 
 class BlockedIP(models.Model):
-    """Model for blocked IP addresses"""
+    """Model for blocked IP addresses and networks"""
     ip_address = models.GenericIPAddressField(unique=True)
+    # CIDR prefix length when a whole network is blocked; empty for a single address
+    prefix_length = models.PositiveSmallIntegerField(null=True, blank=True)
     reason = models.TextField()
     blocked_by = models.ForeignKey(User, on_delete=models.CASCADE)
     blocked_at = models.DateTimeField(default=timezone.now)
@@ -117,7 +130,17 @@ class BlockedIP(models.Model):
         verbose_name_plural = 'Blocked IPs'
     
     def __str__(self):
-        return f"{self.ip_address} - {self.reason}"
+        return f"{self.cidr} - {self.reason}"
+    
+    @property
+    def network(self):
+        if self.prefix_length is None:
+            return ipaddress.ip_network(self.ip_address)
+        return ipaddress.ip_network(f"{self.ip_address}/{self.prefix_length}", strict=False)
+    
+    @property
+    def cidr(self):
+        return self.ip_address if self.prefix_length is None else f"{self.ip_address}/{self.prefix_length}"
 
 
 class SecurityAlert(models.Model):
@@ -145,3 +168,19 @@ class SecurityAlert(models.Model):
     
     def __str__(self):
         return f"{self.alert_type} - {self.title}"
+
+
+class AnomalyDetectorState(models.Model):
+    """Progress and windowed statistics of the anomaly detector (see E_Botar.services.anomaly_detection)"""
+    name = models.CharField(max_length=50, primary_key=True)
+    # Per event source: {'settled': id every row up to has been read, 'seen': ids read above it}
+    high_water_marks = models.JSONField(default=dict, blank=True)
+    state = models.JSONField(default=dict, blank=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'Anomaly Detector State'
+        verbose_name_plural = 'Anomaly Detector State'
+    
+    def __str__(self):
+        return f"{self.name} ({self.last_run_at})"
@@ -1,11 +1,15 @@
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
-from .models import SecurityEvent, SecurityLog, AccessAttempt, BlockedIP, SecurityAlert
-from E_Botar.utils.logging_utils import log_activity
+from .models import SecurityEvent, SecurityLog, AccessAttempt, BlockedIP, SecurityAlert, SecuritySettings
+from E_Botar.services.ip_blocklist import bump_blocklist_version
+from E_Botar.services.security_settings import bump_security_settings_version
+from E_Botar.utils.logging_utils import audit_signal, log_activity
 
 
 @receiver(post_save, sender=SecurityEvent)
+@audit_signal
 def log_security_event_created(sender, instance, created, **kwargs):
     """Log when a security event is created"""
     if created:
@@ -19,6 +23,7 @@ def log_security_event_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=SecurityLog)
+@audit_signal
 def log_security_log_created(sender, instance, created, **kwargs):
     """Log when a security log is created"""
     if created:
@@ -32,6 +37,7 @@ def log_security_log_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=AccessAttempt)
+@audit_signal
 def log_access_attempt(sender, instance, created, **kwargs):
     """Log when an access attempt is made"""
     if created:
@@ -46,6 +52,7 @@ def log_access_attempt(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=BlockedIP)
+@audit_signal
 def log_ip_blocked(sender, instance, created, **kwargs):
     """Log when an IP is blocked"""
     if created:
@@ -58,7 +65,22 @@ def log_ip_blocked(sender, instance, created, **kwargs):
         )
 
 
+@receiver(post_save, sender=BlockedIP)
+@receiver(post_delete, sender=BlockedIP)
+def refresh_blocklist(sender, instance, **kwargs):
+    """Have every process rebuild its IP blocklist once the change commits"""
+    transaction.on_commit(bump_blocklist_version)
+
+
+@receiver(post_save, sender=SecuritySettings)
+@receiver(post_delete, sender=SecuritySettings)
+def refresh_security_settings(sender, instance, **kwargs):
+    """Have every process reload the settings registry once the change commits"""
+    transaction.on_commit(bump_security_settings_version)
+
+
 @receiver(post_save, sender=SecurityAlert)
+@audit_signal
 def log_security_alert_created(sender, instance, created, **kwargs):
     """Log when a security alert is created"""
     if created:
@@ -72,6 +94,7 @@ def log_security_alert_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=SecurityAlert)
+@audit_signal
 def log_security_alert_resolved(sender, instance, created, **kwargs):
     """Log when a security alert is resolved"""
     if not created and instance.is_resolved:
@@ -138,3 +138,279 @@ class SecurityAlertModelTest(TestCase):
         self.assertEqual(str(alert), "threat_detected - Suspicious Login Pattern")
         self.assertEqual(alert.alert_type, 'threat_detected')
         self.assertFalse(alert.is_resolved)
+
+
+class BlockedIPMiddlewareTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from E_Botar.services.ip_blocklist import blocklist
+        cache.clear()
+        blocklist.invalidate()
+        self.user = User.objects.create_user(username="blocker", email="blocker@example.com")
+    
+    def test_radix_tree_matches_addresses_and_networks(self):
+        from E_Botar.services.ip_blocklist import IPRadixTree
+        
+        tree = IPRadixTree.build([
+            ('10.1.0.0/16', '10.1.0.0/16'),
+            ('192.168.1.100', '192.168.1.100'),
+            ('2001:db8::/32', '2001:db8::/32'),
+        ])
+        self.assertEqual(tree.lookup('10.1.200.7'), '10.1.0.0/16')
+        self.assertIsNone(tree.lookup('10.2.0.1'))
+        self.assertEqual(tree.lookup('192.168.1.100'), '192.168.1.100')
+        self.assertIsNone(tree.lookup('192.168.1.101'))
+        self.assertEqual(tree.lookup('2001:db8:abcd::1'), '2001:db8::/32')
+        self.assertEqual(tree.lookup('::ffff:10.1.0.9'), '10.1.0.0/16')
+        self.assertIsNone(tree.lookup('not-an-ip'))
+    
+    def test_blocked_clients_are_refused_without_queries(self):
+        from django.test import override_settings
+        
+        self.assertEqual(self.client.get('/', REMOTE_ADDR='10.0.0.5').status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            BlockedIP.objects.create(ip_address='10.0.0.0', prefix_length=24, reason='Scan', blocked_by=self.user)
+        
+        self.assertEqual(self.client.get('/', REMOTE_ADDR='10.0.0.5').status_code, 403)
+        # Tree is rebuilt once per version; later lookups do not query
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/', REMOTE_ADDR='10.0.0.77').status_code, 403)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            BlockedIP.objects.filter(ip_address='10.0.0.0').get().delete()
+        self.assertEqual(self.client.get('/', REMOTE_ADDR='10.0.0.5').status_code, 200)
+    
+    def test_block_ip_view_accepts_cidr(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_login(self.user)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/security/block-ip/', {'ip_address': '172.16.5.9/16', 'reason': 'Botnet'})
+        blocked = BlockedIP.objects.get()
+        self.assertEqual(blocked.cidr, '172.16.0.0/16')
+        self.assertEqual(self.client.get('/', REMOTE_ADDR='172.16.200.1').status_code, 403)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/security/unblock-ip/', {'ip_address': '172.16.0.0/16'}, REMOTE_ADDR='127.0.0.1')
+        self.assertFalse(BlockedIP.objects.get().is_active)
+        self.assertEqual(self.client.get('/', REMOTE_ADDR='172.16.200.1').status_code, 200)
+    
+    def test_block_ip_view_refuses_own_and_overly_wide_networks(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_login(self.user)
+        
+        self.client.post('/security/block-ip/', {'ip_address': '10.0.0.0/24'}, REMOTE_ADDR='10.0.0.5')
+        self.client.post('/security/block-ip/', {'ip_address': '10.0.0.0/8'}, REMOTE_ADDR='192.168.1.1')
+        self.client.post('/security/block-ip/', {'ip_address': '2001:db8::/32'}, REMOTE_ADDR='192.168.1.1')
+        self.assertFalse(BlockedIP.objects.exists())
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/security/block-ip/', {'ip_address': '10.0.0.0/24'}, REMOTE_ADDR='192.168.1.1')
+        self.assertEqual(BlockedIP.objects.get().cidr, '10.0.0.0/24')
+    
+    def test_forwarded_for_cannot_get_a_client_blocked_or_unblocked(self):
+        from django.test import override_settings
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            BlockedIP.objects.create(ip_address='10.0.0.0', prefix_length=24, reason='Scan', blocked_by=self.user)
+        
+        with override_settings(TRUSTED_PROXY_COUNT=0):
+            # Forged header naming a blocked address does not lock out the real client
+            self.assertEqual(
+                self.client.get('/', REMOTE_ADDR='192.168.1.1', HTTP_X_FORWARDED_FOR='10.0.0.5').status_code, 200
+            )
+        with override_settings(TRUSTED_PROXY_COUNT=1):
+            # Behind the proxy, a blocked client cannot hide behind a forged first entry
+            response = self.client.get('/', REMOTE_ADDR='172.30.0.2', HTTP_X_FORWARDED_FOR='8.8.8.8, 10.0.0.5')
+            self.assertEqual(response.status_code, 403)
+
+
+class AnomalyDetectionTest(TestCase):
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f"voter{i}") for i in range(5)]
+    
+    def test_failed_login_burst_raises_one_alert_and_runs_incrementally(self):
+        from E_Botar.services.anomaly_detection import run_detector
+        
+        for _ in range(10):
+            AccessAttempt.objects.create(username='victim', ip_address='203.0.113.9', success=False)
+        result = run_detector()
+        self.assertEqual(result.processed['access_attempts'], 10)
+        titles = sorted(alert.title for alert in result.alerts)
+        self.assertEqual(titles, ['Failed login burst from 203.0.113.9', 'Repeated failed logins for "victim"'])
+        
+        # Nothing new: nothing re-read, nothing re-raised
+        result = run_detector()
+        self.assertEqual(result.processed['access_attempts'], 0)
+        self.assertEqual(result.alerts, [])
+        # Still inside the window: the cooldown suppresses a duplicate alert
+        AccessAttempt.objects.create(username='victim', ip_address='203.0.113.9', success=False)
+        self.assertEqual(run_detector().alerts, [])
+        self.assertEqual(SecurityAlert.objects.count(), 2)
+    
+    def test_rows_committed_late_with_lower_ids_are_not_skipped(self):
+        from datetime import timedelta
+        from unittest import mock
+        from E_Botar.services.anomaly_detection import run_detector
+        from security_module.models import AnomalyDetectorState
+        
+        AccessAttempt.objects.create(id=10, username='a', ip_address='203.0.113.1', success=False)
+        AccessAttempt.objects.create(id=11, username='b', ip_address='203.0.113.2', success=False)
+        self.assertEqual(run_detector().processed['access_attempts'], 2)
+        # Another writer's transaction commits a lower id after the run read 11
+        AccessAttempt.objects.create(id=7, username='c', ip_address='203.0.113.3', success=False)
+        self.assertEqual(run_detector().processed['access_attempts'], 1)
+        self.assertEqual(run_detector().processed['access_attempts'], 0)
+        
+        # Once the rows have settled the mark moves past them and stops tracking their ids
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(minutes=5)):
+            self.assertEqual(run_detector().processed['access_attempts'], 0)
+        marks = AnomalyDetectorState.objects.get().high_water_marks['access_attempts']
+        self.assertEqual(marks, {'settled': 11, 'seen': []})
+    
+    def test_threat_summary_only_reads_alerts(self):
+        from E_Botar.services.security import check_security_threats
+        from security_module.models import AnomalyDetectorState
+        
+        for _ in range(10):
+            AccessAttempt.objects.create(username='victim', ip_address='203.0.113.9', success=False)
+        SecurityAlert.objects.create(alert_type='threat_detected', severity='high', title='Raised earlier', description='x')
+        with self.assertNumQueries(1):
+            threats = check_security_threats()
+        self.assertEqual([t['title'] for t in threats], ['Raised earlier'])
+        self.assertFalse(AnomalyDetectorState.objects.exists())
+    
+    def test_many_accounts_voting_from_one_ip(self):
+        from auth_module.models import ActivityLog
+        from E_Botar.services.anomaly_detection import run_detector
+        
+        for user in self.users[:4]:
+            ActivityLog.objects.create(user=user, action='vote', description='Voted', ip_address='198.51.100.4')
+        self.assertEqual(run_detector().alerts, [])
+        ActivityLog.objects.create(user=self.users[4], action='vote', description='Voted', ip_address='198.51.100.4')
+        alerts = run_detector().alerts
+        self.assertEqual([a.title for a in alerts], ['Multiple accounts voting from 198.51.100.4'])
+        self.assertEqual(alerts[0].alert_type, 'anomaly_detected')
+    
+    def test_vote_velocity_against_moving_baseline(self):
+        from E_Botar.services.anomaly_detection import AnomalyDetector
+        
+        detector = AnomalyDetector()
+        start = 1_700_000_000 // 60 * 60
+        for minute in range(20):
+            for second in (5, 35):
+                detector.observe_receipt(start + minute * 60 + second)
+        self.assertEqual(detector.alerts, [])
+        
+        for second in range(40):
+            detector.observe_receipt(start + 20 * 60 + second)
+        self.assertEqual([a['title'] for a in detector.alerts], ['Abnormal vote velocity'])
+        # State survives a JSON round trip
+        import json
+        restored = AnomalyDetector(json.loads(json.dumps(detector.state())))
+        self.assertEqual(restored.velocity, detector.velocity)
+
+
+class SecurityReportTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user = User.objects.create_user(username="reported")
+    
+    def test_report_aggregates_with_one_query_per_table(self):
+        from E_Botar.services.security import generate_security_report
+        
+        SecurityEvent.objects.create(user=self.user, event_type='failed_login', severity='high', description='x', ip_address='10.0.0.1')
+        SecurityEvent.objects.create(event_type='ip_blocked', severity='critical', description='x', ip_address='10.0.0.1')
+        SecurityEvent.objects.create(event_type='failed_login', severity='low', description='x', ip_address='10.0.0.2')
+        for _ in range(3):
+            AccessAttempt.objects.create(username='reported', ip_address='10.0.0.1', success=False)
+        AccessAttempt.objects.create(username='reported', user=self.user, ip_address='10.0.0.3', success=True)
+        
+        with self.assertNumQueries(2):
+            report = generate_security_report(SecurityEvent.objects.all(), AccessAttempt.objects.all())
+        self.assertEqual(report['summary']['total_events'], 3)
+        self.assertEqual(report['summary']['failed_attempts'], 3)
+        self.assertEqual(report['by_severity'], {'low': 1, 'medium': 0, 'high': 1, 'critical': 1})
+        self.assertEqual(report['by_event_type'], {'failed_login': 2, 'ip_blocked': 1})
+        self.assertEqual(report['top_ip_addresses'][0]['ip_address'], '10.0.0.1')
+        self.assertEqual(report['top_ip_addresses'][0]['failed_attempts'], 3)
+        self.assertEqual(sum(h['failed'] for h in report['hourly_failures']), 3)
+        self.assertEqual(report['users'][0]['username'], 'reported')
+        self.assertEqual(report['users'][0]['high_severity_events'], 1)
+    
+    def test_closed_ranges_are_cached(self):
+        from datetime import timedelta
+        from E_Botar.services.security import security_report_for_range
+        
+        today = timezone.localdate()
+        last_week = (today - timedelta(days=7)).isoformat()
+        yesterday = (today - timedelta(days=1)).isoformat()
+        with self.assertNumQueries(2):
+            security_report_for_range(last_week, yesterday)
+        with self.assertNumQueries(0):
+            security_report_for_range(last_week, yesterday)
+        # A range that includes today is still open
+        with self.assertNumQueries(2):
+            security_report_for_range(last_week, today.isoformat())
+        with self.assertNumQueries(2):
+            security_report_for_range(last_week, today.isoformat())
+    
+    def test_range_that_just_ended_is_not_cached(self):
+        from datetime import timedelta
+        from unittest import mock
+        from E_Botar.services.security import security_report_for_range
+        from E_Botar.utils.helpers import local_date_bounds
+        
+        yesterday = (timezone.localdate() - timedelta(days=1)).isoformat()
+        _, end = local_date_bounds(yesterday, yesterday)
+        # Buffered access attempts from just before midnight may not be written yet
+        with mock.patch('django.utils.timezone.now', return_value=end + timedelta(seconds=1)):
+            with self.assertNumQueries(2):
+                security_report_for_range(yesterday, yesterday)
+            with self.assertNumQueries(2):
+                security_report_for_range(yesterday, yesterday)
+        with self.assertNumQueries(2):
+            security_report_for_range(yesterday, yesterday)
+        with self.assertNumQueries(0):
+            security_report_for_range(yesterday, yesterday)
+
+
+class SecuritySettingsRegistryTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from E_Botar.services.security_settings import security_settings
+        cache.clear()
+        security_settings.invalidate()
+    
+    def test_typed_reads_are_cached_until_a_save(self):
+        from E_Botar.services.security_settings import save_security_settings, security_settings
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            save_security_settings({'max_login_attempts': 7, 'enable_two_factor': True})
+        SecuritySettings.objects.create(name='session_timeout', value='not-a-number')
+        security_settings.invalidate()
+        
+        with self.assertNumQueries(1):
+            self.assertEqual(security_settings.get_int('max_login_attempts', 5), 7)
+        with self.assertNumQueries(0):
+            self.assertTrue(security_settings.get_bool('enable_two_factor'))
+            self.assertTrue(security_settings.get_bool('log_failed_attempts'))
+            # Unparsable values fall back to the default
+            self.assertEqual(security_settings.get_int('session_timeout', 30), 30)
+        with self.assertRaises(TypeError):
+            security_settings.snapshot()['max_login_attempts'] = 1
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            save_security_settings({'max_login_attempts': 4})
+        self.assertEqual(security_settings.get_int('max_login_attempts', 5), 4)
+    
+    def test_max_login_attempts_drives_login_throttle(self):
+        from E_Botar.services.login_throttle import username_window
+        from E_Botar.services.security_settings import save_security_settings
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            save_security_settings({'max_login_attempts': 3})
+        self.assertEqual(username_window().limit, 3)
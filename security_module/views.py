@@ -1,32 +1,38 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render, redirect, get_object_or_404
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
 from django.http import JsonResponse
 from django.utils import timezone
 from django.db.models import Count, Q
-from django.core.paginator import Paginator
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+import ipaddress
+from datetime import timedelta
 import json
 
 from auth_module.models import UserProfile, ActivityLog
-from .models import SecurityEvent, SecurityLog, AccessAttempt
+from .models import SecurityEvent, SecurityLog, AccessAttempt, BlockedIP
 from .forms import SecuritySettingsForm, SecurityEventForm
-from E_Botar.utils.logging_utils import log_activity
-from E_Botar.services.security import check_security_threats, generate_security_report
+from E_Botar.utils.logging_utils import log_activity, get_client_ip
+from E_Botar.utils.pagination import paginate_keyset
+from E_Botar.services.security import check_security_threats, security_report_for_range
+from E_Botar.services.counters import get_counters
+from E_Botar.services.security_settings import save_security_settings, security_settings as settings_registry
 
 
 @staff_member_required
 def security_dashboard(request):
     """Security dashboard for monitoring system security"""
-    # Get security statistics
-    total_events = SecurityEvent.objects.count()
-    critical_events = SecurityEvent.objects.filter(severity='critical').count()
-    failed_logins = AccessAttempt.objects.filter(success=False).count()
-    suspicious_activities = SecurityEvent.objects.filter(
-        severity__in=['high', 'critical']
-    ).count()
+    # Get security statistics from the counter cache
+    counters = get_counters(
+        'security.events', 'security.events.critical', 'security.failed_logins', 'security.events.high_or_critical'
+    )
+    total_events = counters['security.events']
+    critical_events = counters['security.events.critical']
+    failed_logins = counters['security.failed_logins']
+    suspicious_activities = counters['security.events.high_or_critical']
     
     # Get recent security events
     recent_events = SecurityEvent.objects.select_related('user').order_by('-created_at')[:10]
@@ -70,10 +76,8 @@ def security_events(request):
             Q(ip_address__icontains=search_query)
         )
     
-    # Paginate results
-    paginator = Paginator(events, 50)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Paginate results by cursor so deep pages cost the same as the first
+    page_obj = paginate_keyset(request, events, 50, ordering=('-created_at', '-id'), estimate_count=True)
     
     context = {
         'page_obj': page_obj,
@@ -106,10 +110,8 @@ def access_attempts(request):
             Q(user_agent__icontains=search_query)
         )
     
-    # Paginate results
-    paginator = Paginator(attempts, 50)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Paginate results by cursor so deep pages cost the same as the first
+    page_obj = paginate_keyset(request, attempts, 50, ordering=('-timestamp', '-id'), estimate_count=True)
     
     context = {
         'page_obj': page_obj,
@@ -139,10 +141,8 @@ def security_logs(request):
             Q(ip_address__icontains=search_query)
         )
     
-    # Paginate results
-    paginator = Paginator(logs, 50)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Paginate results by cursor so deep pages cost the same as the first
+    page_obj = paginate_keyset(request, logs, 50, ordering=('-timestamp', '-id'), estimate_count=True)
     
     context = {
         'page_obj': page_obj,
@@ -160,19 +160,26 @@ def security_settings(request):
         form = SecuritySettingsForm(request.POST)
         if form.is_valid():
             # Update security settings
-            settings = form.cleaned_data
+            save_security_settings(form.cleaned_data)
             
             log_activity(
                 user=request.user,
-                action_type='security_settings_updated',
+                action='admin_action',
                 description='Security settings updated',
-                ip_address=request.META.get('REMOTE_ADDR')
+                request=request
             )
             
             messages.success(request, 'Security settings updated successfully!')
             return redirect('security_module:security_settings')
     else:
-        form = SecuritySettingsForm()
+        form = SecuritySettingsForm(initial={
+            'max_login_attempts': settings_registry.get_int('max_login_attempts', settings.LOGIN_RATE_LIMIT_PER_USERNAME),
+            'session_timeout': settings_registry.get_int('session_timeout', min(settings.SESSION_COOKIE_AGE // 60, 480)),
+            'require_strong_password': settings_registry.get_bool('require_strong_password'),
+            'enable_two_factor': settings_registry.get_bool('enable_two_factor'),
+            'log_failed_attempts': settings_registry.get_bool('log_failed_attempts'),
+            'block_suspicious_ips': settings_registry.get_bool('block_suspicious_ips'),
+        })
     
     context = {
         'form': form,
@@ -188,19 +195,11 @@ def security_report(request):
     date_from = request.GET.get('date_from')
     date_to = request.GET.get('date_to')
     
+    # Generate report data (closed date ranges are served from the cache)
     if date_from and date_to:
-        events = SecurityEvent.objects.filter(
-            created_at__date__range=[date_from, date_to]
-        )
-        attempts = AccessAttempt.objects.filter(
-            timestamp__date__range=[date_from, date_to]
-        )
+        report_data = security_report_for_range(date_from, date_to)
     else:
-        events = SecurityEvent.objects.all()
-        attempts = AccessAttempt.objects.all()
-    
-    # Generate report data
-    report_data = generate_security_report(events, attempts)
+        report_data = security_report_for_range()
     
     context = {
         'report_data': report_data,
@@ -222,8 +221,10 @@ def threat_detection(request):
         severity__in=['high', 'critical']
     ).order_by('-created_at')[:20]
     
-    # Get failed login patterns
-    failed_logins = AccessAttempt.objects.filter(success=False).values(
+    # Get failed login patterns (recent window only; older bursts are in the alerts)
+    failed_logins = AccessAttempt.objects.filter(
+        success=False, timestamp__gte=timezone.now() - timedelta(hours=24)
+    ).values(
         'ip_address'
     ).annotate(
         count=Count('id')
@@ -238,30 +239,73 @@ def threat_detection(request):
     return render(request, 'security_module/threat_detection.html', context)
 
 
+def _parse_network(value):
+    """``ipaddress`` network for an address or CIDR string, or None if invalid"""
+    try:
+        return ipaddress.ip_network((value or '').strip(), strict=False)
+    except ValueError:
+        return None
+
+
+def _block_refusal(network, request):
+    """Why ``network`` may not be blocked by this request, or None"""
+    if network.version == 4:
+        min_prefix = getattr(settings, 'BLOCKED_IP_MIN_PREFIX_V4', 16)
+    else:
+        min_prefix = getattr(settings, 'BLOCKED_IP_MIN_PREFIX_V6', 48)
+    if network.prefixlen < min_prefix:
+        return f'Networks wider than /{min_prefix} cannot be blocked.'
+    try:
+        admin_address = ipaddress.ip_address(get_client_ip(request) or '')
+    except ValueError:
+        return None
+    if getattr(admin_address, 'ipv4_mapped', None):
+        admin_address = admin_address.ipv4_mapped
+    if admin_address.version == network.version and admin_address in network:
+        return f'{network} contains your own address ({admin_address}).'
+    return None
+
+
 @staff_member_required
 @require_http_methods(["POST"])
 def block_ip(request):
-    """Block IP address"""
-    ip_address = request.POST.get('ip_address')
+    """Block IP address or CIDR network (e.g. 10.0.0.0/24)"""
+    network = _parse_network(request.POST.get('ip_address'))
+    refusal = _block_refusal(network, request) if network is not None else None
     
-    if ip_address:
+    if refusal is not None:
+        messages.error(request, refusal)
+    elif network is not None:
+        ip_address = str(network.network_address)
+        prefix_length = None if network.prefixlen == network.max_prefixlen else network.prefixlen
+        blocked, _ = BlockedIP.objects.update_or_create(
+            ip_address=ip_address,
+            defaults={
+                'prefix_length': prefix_length,
+                'reason': request.POST.get('reason') or 'Blocked by admin',
+                'blocked_by': request.user,
+                'blocked_at': timezone.now(),
+                'is_active': True,
+            },
+        )
+        
         # Create security event for IP blocking
         SecurityEvent.objects.create(
             event_type='ip_blocked',
             severity='high',
-            description=f'IP address {ip_address} blocked by admin',
+            description=f'IP address {blocked.cidr} blocked by admin',
             ip_address=ip_address,
             user=request.user
         )
         
         log_activity(
             user=request.user,
-            action_type='ip_blocked',
-            description=f'Blocked IP address: {ip_address}',
-            ip_address=request.META.get('REMOTE_ADDR')
+            action='admin_action',
+            description=f'Blocked IP address: {blocked.cidr}',
+            request=request
         )
         
-        messages.success(request, f'IP address {ip_address} blocked successfully!')
+        messages.success(request, f'IP address {blocked.cidr} blocked successfully!')
     else:
         messages.error(request, 'Invalid IP address.')
     
@@ -271,10 +315,16 @@ def block_ip(request):
 @staff_member_required
 @require_http_methods(["POST"])
 def unblock_ip(request):
-    """Unblock IP address"""
-    ip_address = request.POST.get('ip_address')
+    """Unblock IP address or CIDR network"""
+    network = _parse_network(request.POST.get('ip_address'))
     
-    if ip_address:
+    if network is not None:
+        ip_address = str(network.network_address)
+        # Saved one by one so the post_save signal refreshes the blocklist
+        for blocked in BlockedIP.objects.filter(ip_address=ip_address, is_active=True):
+            blocked.is_active = False
+            blocked.save(update_fields=['is_active'])
+        
         # Create security event for IP unblocking
         SecurityEvent.objects.create(
             event_type='ip_unblocked',
@@ -286,9 +336,9 @@ def unblock_ip(request):
         
         log_activity(
             user=request.user,
-            action_type='ip_unblocked',
+            action='admin_action',
             description=f'Unblocked IP address: {ip_address}',
-            ip_address=request.META.get('REMOTE_ADDR')
+            request=request
         )
         
         messages.success(request, f'IP address {ip_address} unblocked successfully!')
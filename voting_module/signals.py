@@ -2,10 +2,11 @@ from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 from .models import SchoolVote, VoteReceipt, AnonVote, EncryptedBallot
-from E_Botar.utils.logging_utils import log_activity
+from E_Botar.utils.logging_utils import audit_signal, log_activity
 
 
 @receiver(post_save, sender=SchoolVote)
+@audit_signal
 def log_vote_created(sender, instance, created, **kwargs):
     """Log when a vote is created"""
     if created:
@@ -17,6 +18,7 @@ def log_vote_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=VoteReceipt)
+@audit_signal
 def log_receipt_created(sender, instance, created, **kwargs):
     """Log when a vote receipt is created"""
     if created:
@@ -28,6 +30,7 @@ def log_receipt_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=AnonVote)
+@audit_signal
 def log_anon_vote_created(sender, instance, created, **kwargs):
     """Log when an anonymous vote is created"""
     if created:
@@ -39,6 +42,7 @@ def log_anon_vote_created(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=EncryptedBallot)
+@audit_signal
 def log_encrypted_ballot_created(sender, instance, created, **kwargs):
     """Log when an encrypted ballot is created"""
     if created:
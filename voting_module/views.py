@@ -18,32 +18,24 @@ from candidate_module.models import Candidate, CandidateApplication
 from election_module.models import SchoolElection, SchoolPosition
 from auth_module.models import UserProfile, ActivityLog
 from E_Botar.utils.logging_utils import log_activity
+from E_Botar.services.counters import get_counters
+from E_Botar.services.election_calendar import get_election_calendar
 from E_Botar.services.security import encrypt_string as encrypt_data, decrypt_string as decrypt_data
 
-def check_profile_completion(user):
-    """Check if user has completed their profile"""
-    try:
-        profile = UserProfile.objects.get(user=user)
-        if not profile.course or not profile.department:
-            return False, "Please complete your profile by selecting your course and department."
-        return True, None
-    except UserProfile.DoesNotExist:
-        return False, "Please complete your profile first."
+def check_profile_completion(request):
+    """Check if the requesting user has completed their profile"""
+    error = request.voter.profile_error
+    return error is None, error
         
 def home_view(request):
     """Public home page showing current administration and election info"""
     now_ts = timezone.now()
+    calendar = get_election_calendar(now_ts)
 
     # Get current active election (on-going voting)
-    current_election = SchoolElection.objects.filter(
-        is_active=True,
-        start_date__lte=now_ts,
-        end_date__gte=now_ts,
-    ).first()
+    current_election = calendar.current_election
     
-    completed_election = SchoolElection.objects.filter(
-        end_date__lt=now_ts,
-    ).order_by('-end_date').first()
+    completed_election = calendar.last_completed
     
     # Extract year range from current election title
     administration_year = "2024-2025"  # Default fallback
@@ -128,15 +120,13 @@ def home_view(request):
                 })
 
     # Get upcoming election
-    upcoming_election = SchoolElection.objects.filter(
-        start_date__gt=now_ts, 
-        is_active=True
-    ).order_by('start_date').first()
+    upcoming_election = calendar.next_upcoming
 
-    # Get basic statistics
-    total_users = UserProfile.objects.count()
-    total_elections = SchoolElection.objects.count()
-    total_votes = SchoolVote.objects.count()
+    # Get basic statistics from the counter cache
+    counters = get_counters('users.total', 'elections.total', 'votes.total')
+    total_users = counters['users.total']
+    total_elections = counters['elections.total']
+    total_votes = counters['votes.total']
 
     context = {
         'current_election': current_election,
@@ -159,23 +149,19 @@ def home_view(request):
 
 def voting_dashboard(request):
     """Display voting dashboard. Anonymous users see public info only."""
-    user_profile = None
-    if request.user.is_authenticated:
-        try:
-            user_profile = UserProfile.objects.get(user=request.user)
-            if not user_profile.is_verified:
-                messages.warning(request, 'Your account must be verified before you can vote.')
-                return redirect('auth_module:profile')
-        except UserProfile.DoesNotExist:
+    voter = request.voter
+    user_profile = voter.profile
+    if voter.is_authenticated:
+        if not voter.has_profile:
             messages.warning(request, 'Please complete your profile before voting.')
             return redirect('candidate_module:candidate_profile')
+        if not voter.is_verified:
+            messages.warning(request, 'Your account must be verified before you can vote.')
+            return redirect('auth_module:profile')
     
-    # Get active elections
-    active_elections = SchoolElection.objects.filter(
-        is_active=True,
-        start_date__lte=timezone.now(),
-        end_date__gte=timezone.now()
-    ).order_by('-created_at')
+    # Get active elections, annotated with their vote totals
+    current = get_election_calendar().current
+    active_elections = SchoolElection.objects.with_turnout().filter(pk__in=[e.pk for e in current])
     
     # Get user's voting history (authenticated users only)
     user_votes = SchoolVote.objects.none()
@@ -200,18 +186,14 @@ def election_voting(request, election_id):
     election = get_object_or_404(SchoolElection, id=election_id)
     
     # Check profile completion
-    profile_complete, error_message = check_profile_completion(request.user)
+    profile_complete, error_message = check_profile_completion(request)
     if not profile_complete:
         messages.warning(request, error_message)
         return redirect('auth_module:profile')
     
-    try:
-        user_profile = UserProfile.objects.get(user=request.user)
-        if not user_profile.is_verified:
-            messages.error(request, 'Your account must be verified before you can vote.')
-            return redirect('auth_module:profile')
-    except UserProfile.DoesNotExist:
-        messages.error(request, 'Please complete your profile before voting.')
+    user_profile = request.voter.profile
+    if not request.voter.is_verified:
+        messages.error(request, 'Your account must be verified before you can vote.')
         return redirect('auth_module:profile')
     
     # Check if election is active
@@ -262,12 +244,10 @@ def submit_vote(request, election_id):
     """Submit votes for an election"""
     election = get_object_or_404(SchoolElection, id=election_id)
     
-    try:
-        user_profile = UserProfile.objects.get(user=request.user)
-        if not user_profile.is_verified:
-            return JsonResponse({'success': False, 'error': 'Account not verified'})
-    except UserProfile.DoesNotExist:
+    if not request.voter.has_profile:
         return JsonResponse({'success': False, 'error': 'Profile not found'})
+    if not request.voter.is_verified:
+        return JsonResponse({'success': False, 'error': 'Account not verified'})
     
     # Check if election is active
     if not election.is_active_now():
@@ -344,12 +324,13 @@ def submit_vote(request, election_id):
                 encrypted_receipt_code=encrypt_data(receipt_code)
             )
             
-            # Log activity
+            # Audit entry commits or rolls back together with the ballot
             log_activity(
                 user=request.user,
                 action='vote',
                 description=f'Voted in election: {election.title}',
-                request=request
+                request=request,
+                sync=True
             )
         
         # Transaction committed successfully
@@ -478,30 +459,27 @@ def election_results(request, election_id):
     election = get_object_or_404(SchoolElection, id=election_id)
     
     # Get results for each position
-    election_positions = election.positions.all().order_by('order')
-    results = {}
+    election_positions = election.positions.select_related('position').order_by('order')
+    
+    # All candidates and vote counts of the election, one query each
+    candidates_by_position = {}
+    for candidate in Candidate.objects.filter(election=election, is_active=True).select_related('user', 'party'):
+        candidates_by_position.setdefault(candidate.position_id, []).append(candidate)
+    vote_map = {}
+    position_totals = {}
+    vote_counts = (
+        SchoolVote.objects.filter(election=election)
+        .values('position', 'candidate').annotate(vote_count=Count('id')).order_by()
+    )
+    for vc in vote_counts:
+        vote_map[vc['candidate']] = vc['vote_count']
+        position_totals[vc['position']] = position_totals.get(vc['position'], 0) + vc['vote_count']
     
+    results = {}
     for election_position in election_positions:
         position = election_position.position  # Get the actual SchoolPosition
-        
-        # First, get all candidates for this position in this election
-        all_candidates = Candidate.objects.filter(
-            election=election,
-            position=position,
-            is_active=True
-        ).select_related('user', 'party')
-        
-        # Get vote counts for each candidate
-        vote_counts = SchoolVote.objects.filter(
-            election=election,
-            position=position
-        ).values('candidate').annotate(
-            vote_count=Count('id')
-        ).order_by('-vote_count')
-        
-        # Create a map of vote counts
-        vote_map = {vc['candidate']: vc['vote_count'] for vc in vote_counts}
-        total_position_votes = sum(vc['vote_count'] for vc in vote_counts)
+        all_candidates = candidates_by_position.get(position.id, [])
+        total_position_votes = position_totals.get(position.id, 0)
         
         # Get candidate details with percentages
         candidates_with_votes = []